@@ -0,0 +1,4 @@
+"""
+Benchmarks for the Nion Orchestration Engine
+Run from the repository root, e.g. `python -m benchmarks.bench_batch`
+"""
@@ -0,0 +1,61 @@
+"""
+Throughput of NionOrchestrator.process_batch against a per-message loop
+
+    python -m benchmarks.bench_batch [--messages N] [--repeat R]
+"""
+
+import argparse
+import gc
+import time
+from typing import Callable, Dict, List
+
+from main import NionOrchestrator
+from benchmarks.messages import SAMPLE_MESSAGES
+
+
+def _best_of(repeat: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def per_message_loop(messages: List[Dict]) -> List[str]:
+    """The pre-batch integration pattern: one orchestrator call per message"""
+    results = []
+    for message in messages:
+        results.append(NionOrchestrator().process_message(message))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    messages = [SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)] for i in range(args.messages)]
+    shared = NionOrchestrator()
+
+    cases = [
+        ("per-message loop (new orchestrator each)", lambda: per_message_loop(messages)),
+        ("per-message loop (shared orchestrator)", lambda: [shared.process_message(m) for m in messages]),
+        ("process_batch (rendered)", lambda: NionOrchestrator().process_batch(messages)),
+        ("process_batch (structured)", lambda: NionOrchestrator().process_batch(messages, structured=True)),
+        ("process_stream (structured, consumed)",
+         lambda: sum(1 for _ in NionOrchestrator().process_stream(messages, structured=True))),
+    ]
+
+    baseline = None
+    print(f"{args.messages} messages, best of {args.repeat}")
+    for name, run in cases:
+        elapsed = _best_of(args.repeat, run)
+        baseline = baseline or elapsed
+        print(f"{name:<45} {args.messages / elapsed:>10,.0f} msg/s  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
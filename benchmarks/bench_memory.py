@@ -0,0 +1,101 @@
+"""
+Per-message memory footprint of orchestration results
+
+    python -m benchmarks.bench_memory [--messages N]
+
+Compares the slotted Task (shared empty-tuple defaults) with the previous
+dict-backed dataclass that allocated four empty lists per task.
+"""
+
+import argparse
+import gc
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import main as nion
+from benchmarks.messages import SAMPLE_MESSAGES
+
+
+@dataclass
+class LegacyTask:
+    """Task as it was before slots: a __dict__ plus eagerly allocated lists"""
+    task_id: str
+    target: str
+    purpose: str
+    depends_on: List[str] = field(default_factory=list)
+    subtasks: List['LegacyTask'] = field(default_factory=list)
+    status: str = "COMPLETED"
+    output: List[str] = field(default_factory=list)
+    is_cross_cutting: bool = False
+    records: List = field(default_factory=list)
+
+    def add_subtasks(self, *subtasks: 'LegacyTask'):
+        self.subtasks.extend(subtasks)
+
+
+@contextmanager
+def task_class(cls):
+    original = nion.Task
+    nion.Task = cls
+    try:
+        yield
+    finally:
+        nion.Task = original
+
+
+def measure(messages: List[Dict]) -> Dict[str, float]:
+    orchestrator = nion.NionOrchestrator()
+    gc_time = 0.0
+    gc_start = 0.0
+
+    def on_gc(phase, info):
+        nonlocal gc_time, gc_start
+        if phase == "start":
+            gc_start = time.perf_counter()
+        else:
+            gc_time += time.perf_counter() - gc_start
+
+    gc.collect()
+    tracemalloc.start()
+    gc.callbacks.append(on_gc)
+    start = time.perf_counter()
+    try:
+        results = [orchestrator.orchestrate(message) for message in messages]
+        elapsed = time.perf_counter() - start
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        gc.callbacks.remove(on_gc)
+        tracemalloc.stop()
+
+    tasks = sum(len(r.plan) + sum(len(t.subtasks) for t in r.executed_tasks) for r in results)
+    return {
+        "bytes_per_message": retained / len(messages),
+        "peak_bytes": peak,
+        "tasks_per_message": tasks / len(messages),
+        "gc_seconds": gc_time,
+        "elapsed_seconds": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    args = parser.parse_args()
+
+    messages = [SAMPLE_MESSAGES[i % len(SAMPLE_MESSAGES)] for i in range(args.messages)]
+    with task_class(LegacyTask):
+        before = measure(messages)
+    after = measure(messages)
+
+    print(f"{args.messages} retained OrchestrationResults ({after['tasks_per_message']:.1f} tasks/message)")
+    print(f"{'':<20}{'before':>16}{'after':>16}")
+    for key, label, fmt in (("bytes_per_message", "bytes/message", ",.0f"), ("peak_bytes", "peak bytes", ",.0f"),
+                            ("gc_seconds", "gc seconds", ".3f"), ("elapsed_seconds", "elapsed seconds", ".3f")):
+        print(f"{label:<20}{before[key]:>16{fmt}}{after[key]:>16{fmt}}")
+
+
+if __name__ == "__main__":
+    main()
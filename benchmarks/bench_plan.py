@@ -0,0 +1,102 @@
+"""
+L1 planning cost with plan templates against re-running the rule chain
+
+    python -m benchmarks.bench_plan [--messages N] [--repeat R] [--seed S]
+"""
+
+import argparse
+import gc
+import random
+import time
+from typing import Callable, Dict, List
+
+from main import IntentSignature, KeywordHits, L1Orchestrator, PlanTemplateCache
+from benchmarks.messages import SAMPLE_MESSAGES
+
+# Share of traffic per README case: status questions and requests dominate,
+# meetings and escalations are a steady minority
+MIX_WEIGHTS = (0.35, 0.2, 0.1, 0.1, 0.1, 0.15)
+
+FILLER = (
+    "Thanks in advance.",
+    "Looping in the team.",
+    "See the ticket for details.",
+    "Happy to jump on a call.",
+    "Following up from yesterday.",
+    "The client asked about this again.",
+)
+
+
+def realistic_mix(count: int, seed: int = 0) -> List[Dict]:
+    """Messages drawn from the README cases by MIX_WEIGHTS, with varied filler text"""
+    rng = random.Random(seed)
+    messages = []
+    for index in range(count):
+        base = rng.choices(SAMPLE_MESSAGES, weights=MIX_WEIGHTS)[0]
+        extra = " ".join(rng.sample(FILLER, rng.randint(0, 2)))
+        messages.append({**base, "message_id": f"MSG-{index:06d}", "content": f"{base['content']} {extra}".rstrip()})
+    return messages
+
+
+def _best_of(repeat: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def signatures_only(messages: List[Dict]):
+    """Keyword scanning shared by both planners, for reference"""
+    for message in messages:
+        IntentSignature.of(message, KeywordHits(message["content"]))
+
+
+def rule_chain(messages: List[Dict]):
+    """Signature extraction plus the full rule chain for every message"""
+    for message in messages:
+        L1Orchestrator.build_plan(IntentSignature.of(message, KeywordHits(message["content"])))
+
+
+def templated(messages: List[Dict]):
+    l1 = L1Orchestrator(templates=PlanTemplateCache())
+    for message in messages:
+        l1.analyze_and_plan(message, KeywordHits(message["content"]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    messages = realistic_mix(args.messages, args.seed)
+
+    print(f"{args.messages} messages, best of {args.repeat}")
+    baseline = None
+    cases = [
+        ("rule chain", lambda: rule_chain(messages)),
+        ("plan templates", lambda: templated(messages)),
+        ("signature only", lambda: signatures_only(messages)),
+    ]
+    for name, run in cases:
+        elapsed = _best_of(args.repeat, run)
+        baseline = baseline or elapsed
+        print(f"{name:<20} {elapsed / args.messages * 1e6:8.2f} us/plan  {baseline / elapsed:5.2f}x")
+
+    templates = PlanTemplateCache()
+    l1 = L1Orchestrator(templates=templates)
+    for message in messages:
+        l1.analyze_and_plan(message)
+    stats = templates.stats()
+    print(f"\ntemplate hit rate {stats.hit_rate:.2%} ({stats.size} signatures)")
+    for signature, uses in templates.signature_counts().items():
+        flags = ", ".join(name for name, value in signature._asdict().items() if value) or "none"
+        print(f"{uses / args.messages:7.2%}  {flags}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Orchestration map rendering cost on large batch outputs
+
+    python -m benchmarks.bench_render [--messages N] [--repeat R] [--seed S]
+
+Messages are orchestrated once up front; only rendering and writing are
+timed. "line by line" is the layout built one line at a time, as before the
+map template, kept here as the reference.
+"""
+
+import argparse
+import gc
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, List
+
+from main import NionOrchestrator, OrchestrationResult, render_orchestration_map
+from benchmarks.bench_plan import realistic_mix
+
+
+def line_by_line(message: Dict, plan, executed_tasks) -> Iterator[str]:
+    """Reference layout: one yield per output line"""
+    yield "=" * 80
+    yield "NION ORCHESTRATION MAP"
+    yield "=" * 80
+    yield f"Message: {message.get('message_id', 'N/A')}"
+    yield f"From: {message.get('sender', {}).get('name', 'Unknown')} ({message.get('sender', {}).get('role', 'Unknown')})"
+    yield f"Project: {message.get('project', 'N/A')}"
+    yield ""
+    yield "=" * 80
+    yield "L1 PLAN"
+    yield "=" * 80
+    for task in plan:
+        cross_cutting_label = " (Cross-Cutting)" if task.is_cross_cutting else ""
+        yield f"[{task.task_id}] → {task.target}{cross_cutting_label}"
+        yield f"Purpose: {task.purpose}"
+        if task.depends_on:
+            yield f"Depends On: {', '.join(task.depends_on)}"
+        yield ""
+    yield "=" * 80
+    yield "L2/L3 EXECUTION"
+    yield "=" * 80
+    yield ""
+    for task in executed_tasks:
+        if task.subtasks:
+            yield f"[{task.task_id}] {task.target}"
+            for subtask in task.subtasks:
+                yield f"└─▶ [{subtask.task_id}] {subtask.target}"
+                yield f"    Status: {subtask.status}"
+                yield "    Output:"
+                for line in subtask.output:
+                    yield f"    • {line}"
+            yield ""
+        else:
+            cross_cutting_label = " (Cross-Cutting)" if task.is_cross_cutting else ""
+            yield f"[{task.task_id}] {task.target}{cross_cutting_label}"
+            yield f"Status: {task.status}"
+            yield "Output:"
+            for line in task.output:
+                yield f"• {line}"
+            yield ""
+    yield "=" * 80
+
+
+def _best_of(repeat: int, run: Callable[[], object]) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def join_lines(results: List[OrchestrationResult]):
+    for result in results:
+        "\n".join(line_by_line(result.message, result.plan, result.executed_tasks))
+
+
+def templated(results: List[OrchestrationResult]):
+    for result in results:
+        render_orchestration_map(result.message, result.plan, result.executed_tasks)
+
+
+def stream_lines(results: List[OrchestrationResult], path: str):
+    with open(path, "w", encoding="utf-8") as stream:
+        write = stream.write
+        for result in results:
+            for line in line_by_line(result.message, result.plan, result.executed_tasks):
+                write(line)
+                write("\n")
+            write("\n")
+
+
+def stream_templated(results: List[OrchestrationResult], path: str):
+    orchestrator = NionOrchestrator()
+    with open(path, "w", encoding="utf-8") as stream:
+        for result in results:
+            orchestrator.write_orchestration_map(result, stream)
+            stream.write("\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    orchestrator = NionOrchestrator()
+    results = [orchestrator.orchestrate(message) for message in realistic_mix(args.messages, args.seed)]
+    for result in results:
+        expected = "\n".join(line_by_line(result.message, result.plan, result.executed_tasks))
+        assert render_orchestration_map(result.message, result.plan, result.executed_tasks) == expected
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "maps.txt")
+        stream_templated(results, path)
+        size = os.path.getsize(path)
+
+        print(f"{args.messages} maps ({size / 1e6:.1f} MB), best of {args.repeat}")
+        for group in (
+            (("line by line", lambda: join_lines(results)), ("map template", lambda: templated(results))),
+            (("stream lines", lambda: stream_lines(results, path)), ("stream template", lambda: stream_templated(results, path))),
+        ):
+            baseline = None
+            for name, run in group:
+                elapsed = _best_of(args.repeat, run)
+                baseline = baseline or elapsed
+                print(f"{name:<20} {elapsed / args.messages * 1e6:8.2f} us/map  {size / elapsed / 1e6:7.1f} MB/s"
+                      f"  {baseline / elapsed:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
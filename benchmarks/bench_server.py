@@ -0,0 +1,94 @@
+"""
+Server intake throughput and urgent latency under the default priority lanes
+
+    python -m benchmarks.bench_server [--messages N] [--workers W] [--batch-size B]
+
+A burst of normal messages is submitted at once; the run checks that it is
+spread over the workers the normal lane may use (all but one), then
+measures how long an escalation waits behind a fresh burst. Exits 1 if a
+large burst was served by fewer workers than the normal lane allows.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from collections import Counter
+from typing import Dict
+
+from main import NionOrchestrator, OrchestrationResult, OrchestrationServer
+from benchmarks.generators import generate
+
+
+class _CountingOrchestrator(NionOrchestrator):
+    """Counts the messages each server worker (one orchestrator per worker) ran"""
+
+    def __init__(self, served: Counter):
+        super().__init__()
+        self.served = served
+        self.name = f"worker {len(served)}"
+        served[self.name] = 0
+
+    def orchestrate(self, message: Dict) -> OrchestrationResult:
+        self.served[self.name] += 1
+        return super().orchestrate(message)
+
+
+async def burst(server: OrchestrationServer, count: int) -> float:
+    """Seconds to answer count normal messages submitted at once"""
+    messages = generate("status_query", "medium", count)
+    start = time.perf_counter()
+    await asyncio.gather(*(server.submit(message) for message in messages))
+    return time.perf_counter() - start
+
+
+async def urgent_behind(server: OrchestrationServer, count: int) -> float:
+    """Seconds an escalation takes when it arrives behind count queued normal messages"""
+    backlog = [asyncio.ensure_future(server.submit(message))
+               for message in generate("status_query", "medium", count)]
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await server.submit(generate("escalation", "short", 1)[0])
+    latency = time.perf_counter() - start
+    await asyncio.gather(*backlog)
+    return latency
+
+
+async def run(messages: int, workers: int, batch_size: int) -> int:
+    served: Counter = Counter()
+    server = OrchestrationServer(port=0, workers=workers, batch_size=batch_size, queue_size=messages * 2,
+                                 orchestrator_factory=lambda: _CountingOrchestrator(served))
+    await server.start()
+    try:
+        elapsed = await burst(server, messages)
+        burst_served = {name: count for name, count in served.items() if count}
+        latency = await urgent_behind(server, messages)
+    finally:
+        await server.shutdown()
+
+    allowed = server.lanes[1].concurrency
+    print(f"{messages} normal messages, {workers} workers, batch size {batch_size}")
+    print(f"burst     {elapsed:8.3f} s  {messages / elapsed:9,.0f} msg/s  on {len(burst_served)} worker(s)"
+          f" (normal lane allows {allowed})")
+    for name, count in sorted(burst_served.items()):
+        print(f"  {name:<20} {count:6d} messages")
+    print(f"urgent    {latency * 1e3:8.2f} ms behind {messages} queued normal messages")
+    # Small bursts may be drained by fewer workers before the others wake up
+    expected = max(1, min(allowed, messages // (2 * batch_size)))
+    if len(burst_served) < expected:
+        print(f"FAIL normal traffic used {len(burst_served)} worker(s), expected {expected}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+    return asyncio.run(run(args.messages, args.workers, args.batch_size))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Synthetic messages for each branch of L1Orchestrator.analyze_and_plan,
+at several content lengths
+"""
+
+import random
+from typing import Callable, Dict, Iterator, List, Tuple
+
+# Approximate content length in characters
+CONTENT_LENGTHS = {"short": 80, "medium": 600, "long": 5000}
+
+PROJECTS = ("PRJ-ALPHA", "PRJ-BETA", "PRJ-GAMMA", "PRJ-DELTA")
+
+# Neutral sentences used to pad content; none of them contains a planner keyword
+FILLER = (
+    "Looping in the rest of the team for visibility.",
+    "The customer call went fine overall.",
+    "Notes from the last sync are in the shared folder.",
+    "Thanks for the quick turnaround on this.",
+    "Design review moved to Thursday afternoon.",
+    "The dashboard numbers look stable this week.",
+)
+
+
+def _pad(rng: random.Random, text: str, length: int, separator: str = " ") -> str:
+    parts = [text]
+    size = len(text)
+    while size < length:
+        sentence = rng.choice(FILLER)
+        parts.append(sentence)
+        size += len(sentence) + len(separator)
+    return separator.join(parts)
+
+
+def status_query(rng: random.Random, length: int) -> Dict:
+    feature = rng.choice(("authentication", "billing export", "search", "SSO"))
+    return {
+        "source": "slack",
+        "sender": {"name": "John Doe", "role": "Engineering Manager"},
+        "content": _pad(rng, f"What's the status of the {feature} feature?", length),
+        "project": rng.choice(PROJECTS)
+    }
+
+
+def feature_request(rng: random.Random, length: int) -> Dict:
+    return {
+        "source": "email",
+        "sender": {"name": "Sarah Chen", "role": "Product Manager"},
+        "content": _pad(rng, "The client wants to add real-time notifications and dashboard export. "
+                             "Can we add these features and keep the same timeline?", length),
+        "project": rng.choice(PROJECTS)
+    }
+
+
+def decision_request(rng: random.Random, length: int) -> Dict:
+    return {
+        "source": "slack",
+        "sender": {"name": "Mike Ross", "role": "VP Engineering"},
+        "content": _pad(rng, "Should we prioritize the security fixes or the SSO integration? "
+                             "I need a recommendation by Friday.", length),
+        "project": rng.choice(PROJECTS)
+    }
+
+
+def escalation(rng: random.Random, length: int) -> Dict:
+    return {
+        "source": "email",
+        "sender": {"name": "Client Director", "role": "Customer"},
+        "content": _pad(rng, "This is URGENT. The Q3 feature we were promised has not delivered. "
+                             "We are considering legal options unless this is escalated today.", length),
+        "project": rng.choice(PROJECTS)
+    }
+
+
+def meeting_transcript(rng: random.Random, length: int) -> Dict:
+    speakers = ("Design", "PM", "Support", "Data")
+    transcript = ("Dev: API integration is blocked, the staging environment is down.\n"
+                  "QA: Found 3 critical bugs in the payment flow.")
+    lines = [transcript]
+    size = len(transcript)
+    while size < length:
+        line = f"{rng.choice(speakers)}: {rng.choice(FILLER)}"
+        lines.append(line)
+        size += len(line) + 1
+    return {
+        "source": "meeting",
+        "sender": {"name": "Meeting Bot", "role": "System"},
+        "content": "\n".join(lines),
+        "project": rng.choice(PROJECTS)
+    }
+
+
+def ambiguous(rng: random.Random, length: int) -> Dict:
+    # Ambiguity comes from the missing project; long variants stay keyword-free
+    return {
+        "source": "slack",
+        "sender": {"name": "Unknown User", "role": "Unknown"},
+        "content": _pad(rng, "Any updates?", length),
+        "project": None
+    }
+
+
+GENERATORS: Dict[str, Callable[[random.Random, int], Dict]] = {
+    "status_query": status_query,
+    "feature_request": feature_request,
+    "decision_request": decision_request,
+    "escalation": escalation,
+    "meeting_transcript": meeting_transcript,
+    "ambiguous": ambiguous,
+}
+
+
+def generate(kind: str, length: str, count: int, seed: int = 0) -> List[Dict]:
+    """count messages of one planner branch at one content length"""
+    rng = random.Random(f"{kind}/{length}/{seed}")
+    build = GENERATORS[kind]
+    return [
+        {"message_id": f"{kind.upper()}-{length.upper()}-{index:05d}", **build(rng, CONTENT_LENGTHS[length])}
+        for index in range(count)
+    ]
+
+
+def scenarios() -> Iterator[Tuple[str, str]]:
+    """Every (branch, content length) pair"""
+    for kind in GENERATORS:
+        for length in CONTENT_LENGTHS:
+            yield kind, length
@@ -0,0 +1,56 @@
+"""
+Sample messages covering the six README test cases
+"""
+
+from typing import Dict, List
+
+SAMPLE_MESSAGES: List[Dict] = [
+    {
+        "message_id": "MSG-001",
+        "source": "slack",
+        "sender": {"name": "John Doe", "role": "Engineering Manager"},
+        "content": "What's the status of the authentication feature?",
+        "project": "PRJ-BETA"
+    },
+    {
+        "message_id": "MSG-002",
+        "source": "email",
+        "sender": {"name": "Sarah Chen", "role": "Product Manager"},
+        "content": "The client wants to add real-time notifications and dashboard export. "
+                   "Can we add these features and keep the same timeline?",
+        "project": "PRJ-ALPHA"
+    },
+    {
+        "message_id": "MSG-003",
+        "source": "slack",
+        "sender": {"name": "Mike Ross", "role": "VP Engineering"},
+        "content": "Should we prioritize the security fixes or the SSO integration? "
+                   "I need a recommendation by Friday.",
+        "project": "PRJ-GAMMA"
+    },
+    {
+        "message_id": "MSG-004",
+        "source": "meeting",
+        "sender": {"name": "Meeting Bot", "role": "System"},
+        "content": "Dev: API integration is blocked, the staging environment is down.\n"
+                   "QA: Found 3 critical bugs in the payment flow.\n"
+                   "Design: New mockups are ready for review.\n"
+                   "PM: Let's have the fixes done before the demo.",
+        "project": "PRJ-ALPHA"
+    },
+    {
+        "message_id": "MSG-005",
+        "source": "email",
+        "sender": {"name": "Client Director", "role": "Customer"},
+        "content": "This is URGENT. The Q3 feature we were promised has not delivered. "
+                   "We are considering legal options unless this is escalated today.",
+        "project": "PRJ-DELTA"
+    },
+    {
+        "message_id": "MSG-006",
+        "source": "slack",
+        "sender": {"name": "Unknown User", "role": "Unknown"},
+        "content": "Any updates?",
+        "project": None
+    },
+]
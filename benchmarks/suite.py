@@ -0,0 +1,163 @@
+"""
+Per-stage benchmark suite with a baseline regression check
+
+    python -m benchmarks.suite [--messages N] [--repeat R] [--output FILE]
+                               [--baseline FILE] [--threshold FRACTION]
+
+For every planner branch and content length (see benchmarks.generators) it
+measures plan, execute and format latency per message, end-to-end
+throughput, and allocations per message. Results are written as JSON; with
+--baseline, any scenario whose stage latency grew by more than --threshold
+(or whose peak memory per message did) is reported and the exit status is 1.
+"""
+
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional
+
+from main import NionOrchestrator
+from benchmarks.generators import generate, scenarios
+
+STAGES = ("plan", "execute", "format")
+
+
+def _best_of(repeat: int, run: Callable[..., object], setup: Optional[Callable[[], object]] = None) -> float:
+    """Best wall time of repeat runs; setup() runs untimed and its result is passed to run"""
+    best = float("inf")
+    for _ in range(repeat):
+        args = (setup(),) if setup else ()
+        gc.collect()
+        start = time.perf_counter()
+        run(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure_stages(messages: List[Dict], repeat: int) -> Dict[str, float]:
+    """Best-of-repeat microseconds per message for each stage, run in isolation"""
+    orchestrator = NionOrchestrator()
+    planned = [orchestrator.plan(message) for message in messages]
+    results = [orchestrator.execute_plan(message, plan, hits) for message, (hits, plan) in zip(messages, planned)]
+
+    def plan():
+        for message in messages:
+            orchestrator.plan(message)
+
+    def execute(planned):
+        for message, (hits, plan) in zip(messages, planned):
+            orchestrator.execute_plan(message, plan, hits)
+
+    def render():
+        for result in results:
+            result._text = None
+            orchestrator.render(result)
+
+    count = len(messages)
+    return {
+        "plan": _best_of(repeat, plan) / count * 1e6,
+        # Agents mutate tasks, so every pass executes freshly planned copies
+        "execute": _best_of(repeat, execute, lambda: [orchestrator.plan(message) for message in messages]) / count * 1e6,
+        "format": _best_of(repeat, render) / count * 1e6,
+    }
+
+
+def measure_throughput(messages: List[Dict], repeat: int) -> float:
+    """End-to-end messages per second through process_batch"""
+    return len(messages) / _best_of(repeat, lambda: NionOrchestrator().process_batch(messages))
+
+
+def measure_allocations(messages: List[Dict]) -> Dict[str, float]:
+    """
+    Memory per full process_message: the mean peak of live allocations while
+    a message is processed, and the bytes still held afterwards
+    """
+    orchestrator = NionOrchestrator()
+    orchestrator.process_message(messages[0])  # warm caches outside the measurement
+    gc.collect()
+    tracemalloc.start()
+    peak_total = 0
+    start, _ = tracemalloc.get_traced_memory()
+    for message in messages:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        orchestrator.process_message(message)
+        peak_total += tracemalloc.get_traced_memory()[1] - current
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"peak_bytes": peak_total / len(messages), "retained_bytes": (end - start) / len(messages)}
+
+
+def run_suite(messages: int, repeat: int) -> Dict:
+    results = {}
+    for kind, length in scenarios():
+        batch = generate(kind, length, messages)
+        name = f"{kind}/{length}"
+        results[name] = {
+            "stages_us": measure_stages(batch, repeat),
+            "throughput_msg_s": measure_throughput(batch, repeat),
+            "allocations": measure_allocations(batch[:min(len(batch), 200)]),
+        }
+        stages = results[name]["stages_us"]
+        print(f"{name:<32} " + "  ".join(f"{stage} {stages[stage]:8.1f}us" for stage in STAGES)
+              + f"  {results[name]['throughput_msg_s']:>9,.0f} msg/s", file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "messages": messages,
+        "repeat": repeat,
+        "scenarios": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Descriptions of every metric that regressed by more than threshold"""
+    regressions = []
+    for name, result in current["scenarios"].items():
+        base = baseline.get("scenarios", {}).get(name)
+        if base is None:
+            continue
+        metrics = [(f"{stage} latency", result["stages_us"][stage], base["stages_us"][stage]) for stage in STAGES]
+        metrics.append(("peak bytes", result["allocations"]["peak_bytes"], base["allocations"]["peak_bytes"]))
+        # Lower throughput is a regression, so compare inverted
+        metrics.append(("time per message", 1 / result["throughput_msg_s"], 1 / base["throughput_msg_s"]))
+        for metric, value, reference in metrics:
+            if reference > 0 and value > reference * (1 + threshold):
+                regressions.append(f"{name}: {metric} {value / reference - 1:+.1%}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500, help="Messages per scenario")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="Write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="Results JSON from an earlier run to compare against")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Allowed slowdown before a metric counts as a regression (default: 0.15)")
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.messages, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as stream:
+            json.dump(results, stream, indent=2)
+    else:
+        json.dump(results, sys.stdout, indent=2)
+        print()
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as stream:
+            regressions = compare(results, json.load(stream), args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
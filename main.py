@@ -3,10 +3,50 @@ Nion Orchestration Engine - Simplified Implementation
 A three-tier AI orchestration system for project management
 """
 
+import argparse
+import asyncio
+import bisect
+import email.utils
+import functools
+import hashlib
+import heapq
+import http.client
+import inspect
+import itertools
 import json
-from typing import Dict, List, Optional, Set
-from dataclasses import dataclass, field
-from enum import Enum
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import re
+import signal
+import sqlite3
+import string
+import sys
+import threading
+import time
+from array import array
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from concurrent.futures import (ALL_COMPLETED, FIRST_COMPLETED, Future, ProcessPoolExecutor,
+                                ThreadPoolExecutor, wait)
+from urllib.parse import urlsplit
+from typing import (Any, Awaitable, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set,
+                    TextIO, Tuple, Union)
+from dataclasses import MISSING, dataclass, field, replace
+from enum import Enum, StrEnum
+
+try:
+    import orjson
+except ImportError:  # optional: faster JSON bytes for OrchestrationResult.to_json_bytes
+    orjson = None
+
+try:
+    import yaml
+except ImportError:  # optional: YAML extraction rule files
+    yaml = None
 
 
 class L2Domain(Enum):
@@ -15,17 +55,473 @@ class L2Domain(Enum):
     LEARNING_IMPROVEMENT = "LEARNING_IMPROVEMENT"
 
 
-@dataclass
+@dataclass(slots=True)
 class Task:
-    """Represents a task in the orchestration"""
+    """
+    Represents a task in the orchestration.
+    Slotted, and the sequence fields default to a shared empty tuple; agents
+    assign a list only when they have something to put in it.
+    """
     task_id: str
-    target: str  # L2:DOMAIN or L3:agent
+    target: str  # L2:DOMAIN or L3:agent, one of the shared L2_TARGETS/L3_TARGETS strings
     purpose: str
-    depends_on: List[str] = field(default_factory=list)
-    subtasks: List['Task'] = field(default_factory=list)
+    depends_on: Sequence[str] = ()
+    subtasks: Sequence['Task'] = ()
     status: str = "COMPLETED"
-    output: List[str] = field(default_factory=list)
+    output: Sequence[str] = ()
     is_cross_cutting: bool = False
+    records: Sequence['ExtractionRecord'] = ()  # typed extraction results
+
+    def add_subtasks(self, *subtasks: 'Task'):
+        self.subtasks = [*self.subtasks, *subtasks] if self.subtasks else list(subtasks)
+
+
+@dataclass(slots=True)
+class ActionItem:
+    """Action item extracted from a message"""
+    item_id: str
+    title: str
+    owner: Optional[str] = None
+    due: Optional[str] = None
+    flags: Tuple[str, ...] = ()
+
+    def render(self) -> str:
+        return (f"{self.item_id}: \"{self.title}\"\n"
+                f"  Owner: {self.owner or '?'} | Due: {self.due or '?'} | Flags: [{', '.join(self.flags)}]")
+
+    def to_dict(self) -> Dict:
+        return {"id": self.item_id, "title": self.title, "owner": self.owner, "due": self.due,
+                "flags": list(self.flags)}
+
+
+@dataclass(slots=True)
+class Risk:
+    """Risk extracted from a message"""
+    item_id: str
+    title: str
+    likelihood: str
+    impact: str
+
+    def render(self) -> str:
+        return f"{self.item_id}: \"{self.title}\"\n  Likelihood: {self.likelihood} | Impact: {self.impact}"
+
+    def to_dict(self) -> Dict:
+        return {"id": self.item_id, "title": self.title, "likelihood": self.likelihood, "impact": self.impact}
+
+
+@dataclass(slots=True)
+class Issue:
+    """Issue extracted from a message"""
+    item_id: str
+    title: str
+    severity: str
+    status: str = "OPEN"
+
+    def render(self) -> str:
+        return f"{self.item_id}: \"{self.title}\"\n  Severity: {self.severity} | Status: {self.status}"
+
+    def to_dict(self) -> Dict:
+        return {"id": self.item_id, "title": self.title, "severity": self.severity, "status": self.status}
+
+
+@dataclass(slots=True)
+class Decision:
+    """Decision extracted from a message"""
+    item_id: str
+    title: str
+    decision_maker: Optional[str] = None
+    status: str = "PENDING"
+
+    def render(self) -> str:
+        return (f"{self.item_id}: \"{self.title}\"\n"
+                f"  Decision Maker: {self.decision_maker or '?'} | Status: {self.status}")
+
+    def to_dict(self) -> Dict:
+        return {"id": self.item_id, "title": self.title, "decision_maker": self.decision_maker,
+                "status": self.status}
+
+
+ExtractionRecord = Union[ActionItem, Risk, Issue, Decision]
+
+# Tracking kind and ID prefix per record type
+TRACKED_KINDS = {
+    ActionItem: ("action_item", "AI"),
+    Risk: ("risk", "RISK"),
+    Issue: ("issue", "ISSUE"),
+    Decision: ("decision", "DEC")
+}
+
+
+def _tracking_fields(record: ExtractionRecord) -> Tuple[str, Optional[str], Optional[str]]:
+    """(status, owner, priority) columns for a record"""
+    if isinstance(record, ActionItem):
+        return "OPEN", record.owner, record.due
+    if isinstance(record, Risk):
+        return "OPEN", None, record.impact
+    if isinstance(record, Issue):
+        return record.status, None, record.severity
+    return record.status, record.decision_maker, None
+
+
+# Words ignored when fingerprinting item titles
+DEDUP_STOPWORDS = frozenset(("a", "an", "and", "are", "for", "in", "is", "of", "on", "the", "to", "with"))
+_DEDUP_TRANSLATION = str.maketrans({c: " " for c in "!\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"})
+
+
+class DedupIndex:
+    """
+    Duplicate detection for item titles within one scope (a project's risks,
+    say). Titles are fingerprinted as their normalized word set: exact
+    fingerprint matches are a dictionary lookup, and near duplicates are found
+    with MinHash signatures bucketed by LSH bands, then checked against the
+    estimated Jaccard similarity. A lookup touches only the few items sharing a
+    band with the query, whatever the index size.
+    """
+
+    def __init__(self, threshold: Optional[float] = 0.6, num_perm: int = 32, bands: int = 8):
+        if threshold is not None and num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.threshold = threshold
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.num_perm = num_perm
+        self._exact: Dict[str, str] = {}
+        self._signatures: Dict[str, array] = {}
+        self._buckets: Dict[int, List[str]] = {}
+
+    @staticmethod
+    def tokens(text: str) -> List[str]:
+        words = text.lower().translate(_DEDUP_TRANSLATION).split()
+        return sorted({word for word in words if word not in DEDUP_STOPWORDS})
+
+    def _signature(self, tokens: List[str]) -> array:
+        # One SHAKE-128 digest per token supplies an independent 32-bit hash for
+        # every permutation; deterministic, so signatures are stable across processes
+        size = 4 * self.num_perm
+        hashes = [array("I", hashlib.shake_128(token.encode()).digest(size)) for token in tokens]
+        return array("I", map(min, zip(*hashes)))
+
+    def _band_keys(self, signature: array) -> List[int]:
+        rows = self.rows
+        return [hash((band, *signature[band * rows:(band + 1) * rows])) for band in range(self.bands)]
+
+    def find(self, text: str) -> Optional[str]:
+        """ID of an indexed item that duplicates text, or None"""
+        tokens = self.tokens(text)
+        item_id = self._exact.get(" ".join(tokens))
+        if item_id is not None or self.threshold is None or not tokens:
+            return item_id
+        return self._find_similar(self._signature(tokens))
+
+    def _find_similar(self, signature: array) -> Optional[str]:
+        best_id, best_score = None, self.threshold
+        seen: Set[str] = set()
+        for key in self._band_keys(signature):
+            for candidate in self._buckets.get(key, ()):
+                if candidate in seen:
+                    continue
+                seen.add(candidate)
+                other = self._signatures[candidate]
+                score = sum(1 for x, y in zip(signature, other) if x == y) / len(signature)
+                if score >= best_score:
+                    best_id, best_score = candidate, score
+        return best_id
+
+    def add(self, item_id: str, text: str):
+        """Index text under item_id; an item may be added under several wordings"""
+        tokens = self.tokens(text)
+        self._exact.setdefault(" ".join(tokens), item_id)
+        if self.threshold is None or not tokens or item_id in self._signatures:
+            return
+        signature = self._signatures[item_id] = self._signature(tokens)
+        for key in self._band_keys(signature):
+            self._buckets.setdefault(key, []).append(item_id)
+
+    def __len__(self) -> int:
+        return len(self._exact)
+
+
+class _TrackedIndex:
+    """In-memory view of one (project, kind): title dedup index, ID -> (status, priority), next sequence"""
+
+    __slots__ = ("sequence", "titles", "rows")
+
+    def __init__(self, sequence: int, titles: DedupIndex):
+        self.sequence = sequence
+        self.titles = titles
+        self.rows: Dict[str, Tuple[str, Optional[str]]] = {}
+
+
+class TrackingStore:
+    """
+    Embedded SQLite store for tracked action items, risks, issues and decisions.
+    Records are matched by (project, kind) and title, including near-duplicate
+    wordings (see DedupIndex): a record seen again updates the tracked item
+    instead of creating a new one, and new items get the next ID
+    from a per-project sequence (RISK-001, RISK-002, ...).
+
+    IDs and snapshots are served from an in-memory index loaded per project on
+    first use; row writes are buffered and committed in one transaction per
+    batch_size records, on flush() and before queries. One process owns a
+    database file at a time.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sequences (
+            project TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            value INTEGER NOT NULL,
+            PRIMARY KEY (project, kind)
+        );
+        CREATE TABLE IF NOT EXISTS items (
+            project TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            item_id TEXT NOT NULL,
+            title TEXT NOT NULL,
+            status TEXT NOT NULL,
+            owner TEXT,
+            priority TEXT,
+            data TEXT NOT NULL,
+            first_message TEXT,
+            last_message TEXT,
+            mentions INTEGER NOT NULL DEFAULT 1,
+            updated REAL NOT NULL,
+            PRIMARY KEY (project, kind, item_id),
+            UNIQUE (project, kind, title)
+        );
+        CREATE INDEX IF NOT EXISTS items_status ON items (project, kind, status);
+        CREATE INDEX IF NOT EXISTS items_owner ON items (owner);
+    """
+
+    UPSERT_ITEM = """
+        INSERT INTO items (project, kind, item_id, title, status, owner, priority, data,
+                           first_message, last_message, updated)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (project, kind, item_id) DO UPDATE SET
+            status = excluded.status,
+            owner = COALESCE(excluded.owner, items.owner),
+            priority = COALESCE(excluded.priority, items.priority),
+            data = excluded.data,
+            last_message = excluded.last_message,
+            mentions = items.mentions + 1,
+            updated = excluded.updated
+    """
+
+    UPSERT_SEQUENCE = """
+        INSERT INTO sequences (project, kind, value) VALUES (?, ?, ?)
+        ON CONFLICT (project, kind) DO UPDATE SET value = excluded.value
+    """
+
+    def __init__(self, path: str = ":memory:", batch_size: int = 500, similarity: Optional[float] = 0.6):
+        self.path = path
+        self.batch_size = batch_size
+        # Near-duplicate titles at or above this MinHash similarity merge into one
+        # item; None merges only titles that normalize identically
+        self.similarity = similarity
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._lock = threading.RLock()
+        self._indexes: Dict[Tuple[str, str], _TrackedIndex] = {}
+        self._pending_items: List[Tuple] = []
+        self._pending_sequences: Dict[Tuple[str, str], int] = {}
+        self._listeners: List[Callable[[str], None]] = []
+
+    def _index(self, project: str, kind: str) -> _TrackedIndex:
+        key = (project, kind)
+        index = self._indexes.get(key)
+        if index is None:
+            row = self._conn.execute(
+                "SELECT value FROM sequences WHERE project = ? AND kind = ?", key).fetchone()
+            index = self._indexes[key] = _TrackedIndex(row[0] if row else 0, DedupIndex(self.similarity))
+            for item_id, title, status, priority in self._conn.execute(
+                    "SELECT item_id, title, status, priority FROM items WHERE project = ? AND kind = ?", key):
+                index.titles.add(item_id, title)
+                index.rows[item_id] = (status, priority)
+        return index
+
+    def track(self, project: str, records: Iterable[ExtractionRecord], message_id: Optional[str] = None) -> int:
+        """
+        Upsert records for a project, rewriting each record's item_id to its
+        tracked ID. Returns how many records were new.
+        """
+        new = 0
+        changed = False
+        now = time.time()
+        with self._lock:
+            for record in records:
+                kind, prefix = TRACKED_KINDS[type(record)]
+                index = self._index(project, kind)
+                item_id = index.titles.find(record.title)
+                if item_id is None:
+                    index.sequence += 1
+                    item_id = f"{prefix}-{index.sequence:03d}"
+                    index.titles.add(item_id, record.title)
+                    self._pending_sequences[(project, kind)] = index.sequence
+                    new += 1
+                record.item_id = item_id
+                status, owner, priority = _tracking_fields(record)
+                if index.rows.get(item_id) != (status, priority):
+                    changed = True
+                index.rows[item_id] = (status, priority)
+                self._pending_items.append((
+                    project, kind, item_id, record.title, status, owner, priority,
+                    json.dumps(record.to_dict()), message_id, message_id, now
+                ))
+            if len(self._pending_items) >= self.batch_size:
+                self.flush()
+            listeners = list(self._listeners) if changed else ()
+        for listener in listeners:
+            listener(project)
+        return new
+
+    def add_change_listener(self, listener: Callable[[str], None]):
+        """Call listener(project) whenever a project's snapshot changes (new items, status or priority)"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def flush(self):
+        """Commit buffered writes in a single transaction"""
+        with self._lock:
+            if not self._pending_items and not self._pending_sequences:
+                return
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.executemany(self.UPSERT_ITEM, self._pending_items)
+                conn.executemany(self.UPSERT_SEQUENCE,
+                                 [(project, kind, value) for (project, kind), value in self._pending_sequences.items()])
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._pending_items.clear()
+            self._pending_sequences.clear()
+
+    def snapshot(self, project: str, kind: str) -> Dict[str, Any]:
+        """Counts for a project's tracked items of one kind, by status and by priority"""
+        with self._lock:
+            rows = list(self._index(project, kind).rows.values())
+        by_status: Dict[str, int] = {}
+        by_priority: Dict[str, int] = {}
+        open_count = 0
+        for status, priority in rows:
+            by_status[status] = by_status.get(status, 0) + 1
+            if status in ("OPEN", "PENDING"):
+                open_count += 1
+                if priority:
+                    by_priority[priority] = by_priority.get(priority, 0) + 1
+        return {"total": len(rows), "open": open_count, "by_status": by_status, "by_priority": by_priority}
+
+    def items(self, project: Optional[str] = None, kind: Optional[str] = None,
+              status: Optional[str] = None, owner: Optional[str] = None) -> List[Dict]:
+        """Tracked items matching every given filter, oldest first"""
+        clauses, params = [], []
+        for column, value in (("project", project), ("kind", kind), ("status", status), ("owner", owner)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        query = ("SELECT project, kind, title, data, first_message, last_message, mentions FROM items"
+                 + (" WHERE " + " AND ".join(clauses) if clauses else "") + " ORDER BY rowid")
+        with self._lock:
+            self.flush()
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            # title is the first wording seen; data holds the latest extraction
+            {"project": project, "kind": kind, **json.loads(data), "title": title, "first_message": first_message,
+             "last_message": last_message, "mentions": mentions}
+            for project, kind, title, data, first_message, last_message, mentions in rows
+        ]
+
+    def export_project(self, project: str, remove: bool = False) -> Dict[str, List[Tuple]]:
+        """A project's sequence and item rows, for import_project() on another store"""
+        with self._lock:
+            self.flush()
+            conn = self._conn
+            rows = {
+                "sequences": conn.execute("SELECT * FROM sequences WHERE project = ?", (project,)).fetchall(),
+                "items": conn.execute("SELECT * FROM items WHERE project = ? ORDER BY rowid", (project,)).fetchall()
+            }
+            if remove:
+                conn.execute("BEGIN")
+                conn.execute("DELETE FROM sequences WHERE project = ?", (project,))
+                conn.execute("DELETE FROM items WHERE project = ?", (project,))
+                conn.execute("COMMIT")
+                self._forget(project)
+        return rows
+
+    def import_project(self, project: str, rows: Dict[str, List[Tuple]]):
+        """Replace a project's state with rows from export_project()"""
+        with self._lock:
+            self.flush()
+            conn = self._conn
+            conn.execute("BEGIN")
+            try:
+                conn.execute("DELETE FROM sequences WHERE project = ?", (project,))
+                conn.execute("DELETE FROM items WHERE project = ?", (project,))
+                conn.executemany("INSERT INTO sequences VALUES (?, ?, ?)", rows["sequences"])
+                conn.executemany("INSERT INTO items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows["items"])
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+            self._forget(project)
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(project)
+
+    def _forget(self, project: str):
+        for key in [key for key in self._indexes if key[0] == project]:
+            del self._indexes[key]
+
+    def close(self):
+        """Flush pending writes and close the database"""
+        with self._lock:
+            self.flush()
+            self._conn.close()
+
+    def __enter__(self) -> "TrackingStore":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class AgentId(StrEnum):
+    """Identifiers of the built-in cross-cutting and L3 agents"""
+    KNOWLEDGE_RETRIEVAL = "knowledge_retrieval"
+    EVALUATION = "evaluation"
+    ACTION_ITEM_EXTRACTION = "action_item_extraction"
+    ACTION_ITEM_VALIDATION = "action_item_validation"
+    ACTION_ITEM_TRACKING = "action_item_tracking"
+    RISK_EXTRACTION = "risk_extraction"
+    RISK_TRACKING = "risk_tracking"
+    ISSUE_EXTRACTION = "issue_extraction"
+    ISSUE_TRACKING = "issue_tracking"
+    DECISION_EXTRACTION = "decision_extraction"
+    DECISION_TRACKING = "decision_tracking"
+    QNA = "qna"
+    REPORT_GENERATION = "report_generation"
+    MESSAGE_DELIVERY = "message_delivery"
+    MEETING_ATTENDANCE = "meeting_attendance"
+    INSTRUCTION_LED_LEARNING = "instruction_led_learning"
+
+
+class Intent(StrEnum):
+    """Purposes of the tasks the L1 planner emits"""
+    EXTRACT_ACTION_ITEMS = "Extract action items from message"
+    EXTRACT_RISKS = "Extract and assess risks"
+    EXTRACT_ISSUES = "Extract issues from message"
+    EXTRACT_DECISIONS = "Extract decision needed"
+    RETRIEVE_CONTEXT = "Retrieve project context and relevant information"
+    PROCESS_MEETING = "Process meeting content and generate minutes"
+    FORMULATE_RESPONSE = "Formulate response to query"
+    HANDLE_AMBIGUOUS = "Handle ambiguous request"
+    EVALUATE_RESPONSE = "Evaluate response before delivery"
+    SEND_RESPONSE = "Send response to sender"
+    GENERATE_REPORT = "Generate meeting summary report"
 
 
 class AgentRegistry:
@@ -33,115 +529,327 @@ class AgentRegistry:
 
     # Cross-cutting agents visible to L1 and all L2 domains
     CROSS_CUTTING = {
-        "knowledge_retrieval": "Retrieves context from database",
-        "evaluation": "Validates outputs before delivery"
+        AgentId.KNOWLEDGE_RETRIEVAL: "Retrieves context from database",
+        AgentId.EVALUATION: "Validates outputs before delivery"
     }
 
     # L3 agents by L2 domain
     L3_AGENTS = {
         L2Domain.TRACKING_EXECUTION: {
-            "action_item_extraction": "Extracts action items from message content",
-            "action_item_validation": "Validates action items have required fields",
-            "action_item_tracking": "Tracks action items to completion",
-            "risk_extraction": "Extracts risks from message content",
-            "risk_tracking": "Tracks risks, provides risk snapshots",
-            "issue_extraction": "Extracts issues/problems from message content",
-            "issue_tracking": "Tracks issues to resolution",
-            "decision_extraction": "Extracts decisions from message content",
-            "decision_tracking": "Tracks decisions to implementation"
+            AgentId.ACTION_ITEM_EXTRACTION: "Extracts action items from message content",
+            AgentId.ACTION_ITEM_VALIDATION: "Validates action items have required fields",
+            AgentId.ACTION_ITEM_TRACKING: "Tracks action items to completion",
+            AgentId.RISK_EXTRACTION: "Extracts risks from message content",
+            AgentId.RISK_TRACKING: "Tracks risks, provides risk snapshots",
+            AgentId.ISSUE_EXTRACTION: "Extracts issues/problems from message content",
+            AgentId.ISSUE_TRACKING: "Tracks issues to resolution",
+            AgentId.DECISION_EXTRACTION: "Extracts decisions from message content",
+            AgentId.DECISION_TRACKING: "Tracks decisions to implementation"
         },
         L2Domain.COMMUNICATION_COLLABORATION: {
-            "qna": "Formulates responses to questions",
-            "report_generation": "Creates formatted reports",
-            "message_delivery": "Sends messages via appropriate channels",
-            "meeting_attendance": "Captures meeting transcripts"
+            AgentId.QNA: "Formulates responses to questions",
+            AgentId.REPORT_GENERATION: "Creates formatted reports",
+            AgentId.MESSAGE_DELIVERY: "Sends messages via appropriate channels",
+            AgentId.MEETING_ATTENDANCE: "Captures meeting transcripts"
         },
         L2Domain.LEARNING_IMPROVEMENT: {
-            "instruction_led_learning": "Learns from explicit instructions"
+            AgentId.INSTRUCTION_LED_LEARNING: "Learns from explicit instructions"
         }
     }
 
+    # L3 agents each L2 domain runs for an L1 task purpose, in execution order
+    INTENT_AGENTS = {
+        (L2Domain.TRACKING_EXECUTION, Intent.EXTRACT_ACTION_ITEMS): (
+            AgentId.ACTION_ITEM_EXTRACTION,
+            AgentId.ACTION_ITEM_VALIDATION,
+            AgentId.ACTION_ITEM_TRACKING
+        ),
+        (L2Domain.TRACKING_EXECUTION, Intent.EXTRACT_RISKS): (AgentId.RISK_EXTRACTION, AgentId.RISK_TRACKING),
+        (L2Domain.TRACKING_EXECUTION, Intent.EXTRACT_ISSUES): (AgentId.ISSUE_EXTRACTION, AgentId.ISSUE_TRACKING),
+        (L2Domain.TRACKING_EXECUTION, Intent.EXTRACT_DECISIONS): (AgentId.DECISION_EXTRACTION,),
+        (L2Domain.COMMUNICATION_COLLABORATION, Intent.SEND_RESPONSE): (AgentId.MESSAGE_DELIVERY,),
+        (L2Domain.COMMUNICATION_COLLABORATION, Intent.FORMULATE_RESPONSE): (AgentId.QNA,),
+        (L2Domain.COMMUNICATION_COLLABORATION, Intent.GENERATE_REPORT): (AgentId.REPORT_GENERATION,),
+        (L2Domain.COMMUNICATION_COLLABORATION, Intent.PROCESS_MEETING): (AgentId.MEETING_ATTENDANCE,),
+        (L2Domain.COMMUNICATION_COLLABORATION, Intent.HANDLE_AMBIGUOUS): (AgentId.QNA,)
+    }
+
 
-class L1Orchestrator:
-    """L1 Orchestrator - Analyzes intent and creates execution plan"""
+# Task.target strings, built once and shared by every task
+L2_TARGETS = {domain: f"L2:{domain.value}" for domain in L2Domain}
+L3_TARGETS = {agent: f"L3:{agent.value}" for agent in AgentId}
+L2_DOMAINS = {target: domain for domain, target in L2_TARGETS.items()}
+
+
+# Keyword groups shared by L1 planning and L2/L3 extraction
+REQUEST_KEYWORDS = ("add", "can we", "could", "should we")
+QUESTION_KEYWORDS = ("?", "what", "why", "how", "when", "where")
+DECISION_KEYWORDS = ("should", "prioritize", "recommend")
+ESCALATION_KEYWORDS = ("urgent", "critical", "escalate", "legal", "threatening")
+MEETING_KEYWORDS = ("dev:", "qa:")
+COMPLETION_KEYWORDS = ("ready", "complete", "done")
+
+# Keywords each IntentSignature flag tests for, in field order
+SIGNATURE_KEYWORDS = (
+    REQUEST_KEYWORDS, QUESTION_KEYWORDS, ("status",), DECISION_KEYWORDS, ESCALATION_KEYWORDS,
+    MEETING_KEYWORDS, (), ("blocked",), ("bug",), ("bug", "blocked", "issue", "problem")
+)
+# Keywords the L3 extractors check
+AGENT_KEYWORDS = (
+    "add", "feature", "blocked", *COMPLETION_KEYWORDS, "timeline", "same timeline", "scope", "bug", "critical",
+    "legal", "escalate", "not delivered", "promised", "can we", "should we", "prioritize", "status", "can we add",
+    "should", "notification", "dashboard", "export", "sso", "integration"
+)
+# Every keyword the planner and the built-in agents check; live meetings record them as lines arrive
+KEYWORD_VOCABULARY = tuple(dict.fromkeys(
+    [keyword for group in SIGNATURE_KEYWORDS for keyword in group] + list(AGENT_KEYWORDS)
+))
+
+MISSING_OWNER_AND_DUE = ("MISSING_OWNER", "MISSING_DUE_DATE")
+
+
+class KeywordHits:
+    """
+    Keyword lookups for one message, shared by the planner and all L2/L3 agents.
+    The content is lowercased once and each keyword is searched for at most once;
+    later checks of the same keyword by other agents are dictionary hits.
+    """
+
+    __slots__ = ("text", "_seen")
+
+    def __init__(self, content: str):
+        self.text = content.lower()
+        self._seen: Dict[str, bool] = {}
+
+    def __contains__(self, keyword: str) -> bool:
+        seen = self._seen.get(keyword)
+        if seen is None:
+            seen = self._seen[keyword] = keyword in self.text
+        return seen
+
+    def record(self, keywords: Iterable[str], found: Iterable[bool]):
+        """Store results of a scan done elsewhere (found[i] for keywords[i]) so later checks are lookups"""
+        self._seen.update(zip(keywords, found))
+
+    @classmethod
+    def of(cls, message: Dict) -> "KeywordHits":
+        """The hits a live meeting recorded while it streamed in, else a fresh scan of the content"""
+        minutes = message.get("minutes")
+        hits = minutes.hits if minutes is not None else None
+        return hits if hits is not None else cls(message.get("content", ""))
+
+    def has_any(self, keywords: Iterable[str]) -> bool:
+        for keyword in keywords:
+            if keyword in self:
+                return True
+        return False
+
+    @property
+    def is_brief(self) -> bool:
+        """Fewer than five words, without splitting the whole message"""
+        return len(self.text.split(None, 4)) < 5
+
+
+@dataclass(slots=True)
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses + self.coalesced
+        return (self.hits + self.coalesced) / lookups if lookups else 0.0
+
+
+class IntentSignature(NamedTuple):
+    """The message features L1 planning depends on; equal signatures get identical plans"""
+    has_request: bool
+    has_question: bool
+    has_status_query: bool
+    has_decision_request: bool
+    has_escalation: bool
+    has_meeting_content: bool
+    is_ambiguous: bool
+    is_blocked: bool
+    mentions_bug: bool
+    mentions_issue: bool
+
+    @classmethod
+    def of(cls, message: Dict, hits: KeywordHits) -> "IntentSignature":
+        return cls(
+            has_request=hits.has_any(REQUEST_KEYWORDS),
+            has_question=hits.has_any(QUESTION_KEYWORDS),
+            has_status_query="status" in hits,
+            has_decision_request=hits.has_any(DECISION_KEYWORDS),
+            has_escalation=hits.has_any(ESCALATION_KEYWORDS),
+            has_meeting_content=message.get("source", "") == "meeting" or hits.has_any(MEETING_KEYWORDS),
+            is_ambiguous=message.get("project") is None or hits.is_brief,
+            is_blocked="blocked" in hits,
+            mentions_bug="bug" in hits,
+            mentions_issue=hits.has_any(("bug", "blocked", "issue", "problem"))
+        )
+
+
+class PlanTemplate:
+    """
+    A plan with task IDs replaced by positions. instantiate() clones it with
+    IDs numbered from TASK-001.
+    """
+
+    __slots__ = ("steps",)
+
+    def __init__(self, plan: List[Task]):
+        position = {task.task_id: index for index, task in enumerate(plan)}
+        self.steps = tuple(
+            (task.target, task.purpose, tuple(position[dep] for dep in task.depends_on), task.is_cross_cutting)
+            for task in plan
+        )
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def instantiate(self) -> List[Task]:
+        ids = [f"TASK-{number:03d}" for number in range(1, len(self.steps) + 1)]
+        plan = []
+        for task_id, (target, purpose, deps, is_cross_cutting) in zip(ids, self.steps):
+            plan.append(Task(task_id, target, purpose, [ids[dep] for dep in deps] if deps else (),
+                             is_cross_cutting=is_cross_cutting))
+        return plan
+
+
+class PlanTemplateCache:
+    """
+    Plan templates by IntentSignature. There are at most 2**10 signatures, so
+    the cache is unbounded; each template is built once by the L1 rule chain.
+    """
 
     def __init__(self):
-        self.task_counter = 0
+        self._templates: Dict[IntentSignature, PlanTemplate] = {}
+        self._uses: Dict[IntentSignature, int] = {}
+        self._lock = threading.Lock()
+        self._misses = 0
+
+    def get(self, signature: IntentSignature, build: Callable[[IntentSignature], List[Task]]) -> PlanTemplate:
+        """The template for signature, built on first use"""
+        template = self._templates.get(signature)
+        with self._lock:
+            if template is None:
+                template = self._templates.get(signature)
+                if template is None:
+                    template = self._templates[signature] = PlanTemplate(build(signature))
+                    self._misses += 1
+            self._uses[signature] = self._uses.get(signature, 0) + 1
+        return template
+
+    def clear(self):
+        with self._lock:
+            self._templates.clear()
+            self._uses.clear()
+            self._misses = 0
+
+    def stats(self) -> CacheStats:
+        """Template hits/misses; size is the number of distinct signatures seen"""
+        with self._lock:
+            lookups = sum(self._uses.values())
+            return CacheStats(hits=lookups - self._misses, misses=self._misses, size=len(self._templates))
+
+    def signature_counts(self) -> Dict[IntentSignature, int]:
+        """Plans served per signature, most used first"""
+        with self._lock:
+            return dict(sorted(self._uses.items(), key=lambda item: item[1], reverse=True))
+
+
+class L1Orchestrator:
+    """L1 Orchestrator - Analyzes intent and creates execution plan"""
 
-    def _next_task_id(self) -> str:
-        self.task_counter += 1
-        return f"TASK-{self.task_counter:03d}"
+    def __init__(self, templates: Optional["PlanTemplateCache"] = None):
+        # Shared across orchestrators by default; plans depend only on the signature
+        self.templates = templates if templates is not None else PLAN_TEMPLATES
 
-    def analyze_and_plan(self, message: Dict) -> List[Task]:
+    def analyze_and_plan(self, message: Dict, hits: Optional[KeywordHits] = None) -> List[Task]:
         """
         Analyzes the message and creates an orchestration plan.
-        This is where the L1 reasoning happens.
+        The plan is cloned from the template for the message's intent signature.
+        Task IDs are scoped to the message (TASK-001 onwards), so the L1 keeps
+        no counter and can be shared by any number of threads.
         """
-        content = message.get("content", "").lower()
-        source = message.get("source", "")
+        if hits is None:
+            hits = KeywordHits.of(message)
+        return self.templates.get(IntentSignature.of(message, hits), self.build_plan).instantiate()
 
+    @staticmethod
+    def build_plan(signature: IntentSignature) -> List[Task]:
+        """
+        Runs the L1 rule chain for an intent signature, numbering tasks from TASK-001.
+        This is where the L1 reasoning happens.
+        """
+        task_ids = (f"TASK-{number:03d}" for number in range(1, 100))
         tasks = []
 
-        # Analyze intent and determine required operations
-        has_request = any(word in content for word in ["add", "can we", "could", "should we"])
-        has_question = "?" in content or any(word in content for word in ["what", "why", "how", "when", "where"])
-        has_status_query = "status" in content
-        has_decision_request = any(word in content for word in ["should", "prioritize", "recommend"])
-        has_escalation = any(word in content for word in ["urgent", "critical", "escalate", "legal", "threatening"])
-        has_meeting_content = source == "meeting" or "dev:" in content.lower() or "qa:" in content.lower()
-        is_ambiguous = message.get("project") is None or len(content.split()) < 5
+        has_request = signature.has_request
+        has_question = signature.has_question
+        has_status_query = signature.has_status_query
+        has_decision_request = signature.has_decision_request
+        has_escalation = signature.has_escalation
+        has_meeting_content = signature.has_meeting_content
+        is_ambiguous = signature.is_ambiguous
 
         # Extract tracking items (action items, risks, issues, decisions)
         needs_tracking = has_request or has_meeting_content or has_escalation or has_decision_request
 
         if needs_tracking:
             # Action items
-            if has_request or "blocked" in content or has_meeting_content:
+            if has_request or signature.is_blocked or has_meeting_content:
                 tasks.append(Task(
-                    task_id=self._next_task_id(),
-                    target="L2:TRACKING_EXECUTION",
-                    purpose="Extract action items from message"
+                    task_id=next(task_ids),
+                    target=L2_TARGETS[L2Domain.TRACKING_EXECUTION],
+                    purpose=Intent.EXTRACT_ACTION_ITEMS
                 ))
 
             # Risks
-            if has_request or "blocked" in content or has_escalation or "bug" in content:
+            if has_request or signature.is_blocked or has_escalation or signature.mentions_bug:
                 tasks.append(Task(
-                    task_id=self._next_task_id(),
-                    target="L2:TRACKING_EXECUTION",
-                    purpose="Extract and assess risks"
+                    task_id=next(task_ids),
+                    target=L2_TARGETS[L2Domain.TRACKING_EXECUTION],
+                    purpose=Intent.EXTRACT_RISKS
                 ))
 
             # Issues
-            if "bug" in content or "blocked" in content or "issue" in content or "problem" in content:
+            if signature.mentions_issue:
                 tasks.append(Task(
-                    task_id=self._next_task_id(),
-                    target="L2:TRACKING_EXECUTION",
-                    purpose="Extract issues from message"
+                    task_id=next(task_ids),
+                    target=L2_TARGETS[L2Domain.TRACKING_EXECUTION],
+                    purpose=Intent.EXTRACT_ISSUES
                 ))
 
             # Decisions
             if has_decision_request or has_request:
                 tasks.append(Task(
-                    task_id=self._next_task_id(),
-                    target="L2:TRACKING_EXECUTION",
-                    purpose="Extract decision needed"
+                    task_id=next(task_ids),
+                    target=L2_TARGETS[L2Domain.TRACKING_EXECUTION],
+                    purpose=Intent.EXTRACT_DECISIONS
                 ))
 
         # Knowledge retrieval for context
         if has_question or has_request or has_status_query or not is_ambiguous:
             tasks.append(Task(
-                task_id=self._next_task_id(),
-                target="L3:knowledge_retrieval",
-                purpose="Retrieve project context and relevant information",
+                task_id=next(task_ids),
+                target=L3_TARGETS[AgentId.KNOWLEDGE_RETRIEVAL],
+                purpose=Intent.RETRIEVE_CONTEXT,
                 is_cross_cutting=True
             ))
 
         # Handle meeting transcripts specially
         if has_meeting_content:
             tasks.append(Task(
-                task_id=self._next_task_id(),
-                target="L2:COMMUNICATION_COLLABORATION",
-                purpose="Process meeting content and generate minutes"
+                task_id=next(task_ids),
+                target=L2_TARGETS[L2Domain.COMMUNICATION_COLLABORATION],
+                purpose=Intent.PROCESS_MEETING
             ))
 
         # Response formulation
@@ -153,18 +861,18 @@ class L1Orchestrator:
 
         if has_question or has_request or has_decision_request or has_status_query or is_ambiguous:
             response_task = Task(
-                task_id=self._next_task_id(),
-                target="L2:COMMUNICATION_COLLABORATION",
-                purpose="Formulate response to query" if not is_ambiguous else "Handle ambiguous request",
-                depends_on=factual_tasks if factual_tasks else []
+                task_id=next(task_ids),
+                target=L2_TARGETS[L2Domain.COMMUNICATION_COLLABORATION],
+                purpose=Intent.FORMULATE_RESPONSE if not is_ambiguous else Intent.HANDLE_AMBIGUOUS,
+                depends_on=factual_tasks if factual_tasks else ()
             )
             tasks.append(response_task)
 
             # Evaluation before sending
             eval_task = Task(
-                task_id=self._next_task_id(),
-                target="L3:evaluation",
-                purpose="Evaluate response before delivery",
+                task_id=next(task_ids),
+                target=L3_TARGETS[AgentId.EVALUATION],
+                purpose=Intent.EVALUATE_RESPONSE,
                 depends_on=[response_task.task_id],
                 is_cross_cutting=True
             )
@@ -172,18 +880,18 @@ class L1Orchestrator:
 
             # Message delivery
             delivery_task = Task(
-                task_id=self._next_task_id(),
-                target="L2:COMMUNICATION_COLLABORATION",
-                purpose="Send response to sender",
+                task_id=next(task_ids),
+                target=L2_TARGETS[L2Domain.COMMUNICATION_COLLABORATION],
+                purpose=Intent.SEND_RESPONSE,
                 depends_on=[eval_task.task_id]
             )
             tasks.append(delivery_task)
         elif has_meeting_content:
             # For meetings, generate report
             report_task = Task(
-                task_id=self._next_task_id(),
-                target="L2:COMMUNICATION_COLLABORATION",
-                purpose="Generate meeting summary report",
+                task_id=next(task_ids),
+                target=L2_TARGETS[L2Domain.COMMUNICATION_COLLABORATION],
+                purpose=Intent.GENERATE_REPORT,
                 depends_on=factual_tasks
             )
             tasks.append(report_task)
@@ -191,104 +899,470 @@ class L1Orchestrator:
         return tasks
 
 
+# Plan templates shared by every L1Orchestrator in the process
+PLAN_TEMPLATES = PlanTemplateCache()
+
+
+# Extraction rules: keyword -> record rules for the L3 extractors, loaded from JSON/YAML
+class RuleError(ValueError):
+    """An extraction rule file that cannot be compiled"""
+
+
+class ExtractionRule:
+    """
+    One compiled rule. It matches when any of `any` (if given), all of `all`
+    and none of `none` are in the content; `otherwise` rules only apply when
+    no earlier rule of the domain matched.
+    """
+
+    __slots__ = ("any", "all", "none", "otherwise", "for_each", "fields")
+
+    def __init__(self, spec: Dict, field_names: Set[str], required: Set[str], domain: str):
+        if not isinstance(spec, dict):
+            raise RuleError(f"{domain}: expected a rule object, got {spec!r}")
+        self.any = tuple(spec.get("any", ()))
+        self.all = tuple(spec.get("all", ()))
+        self.none = tuple(spec.get("none", ()))
+        self.otherwise = bool(spec.get("otherwise", False))
+        self.for_each = spec.get("for_each")
+        self.fields = {key: tuple(value) if isinstance(value, list) else value for key, value in spec.items()
+                       if key not in ("any", "all", "none", "otherwise", "for_each")}
+        unknown = set(self.fields) - field_names
+        if unknown:
+            raise RuleError(f"{domain}: unknown field(s) {', '.join(sorted(unknown))}; "
+                            f"expected {', '.join(sorted(field_names))}")
+        missing = required - set(self.fields)
+        if missing:
+            raise RuleError(f"{domain}: rule without required field(s) {', '.join(sorted(missing))}: {spec}")
+        for key, value in self.fields.items():
+            if isinstance(value, str):
+                self._check_placeholders(domain, key, value)
+        for group in (self.any, self.all, self.none):
+            if not all(isinstance(keyword, str) and keyword == keyword.lower() and keyword for keyword in group):
+                raise RuleError(f"{domain}: keywords must be non-empty lowercase strings: {group}")
+
+    def _check_placeholders(self, domain: str, key: str, text: str):
+        """{value} is filled in from for_each; a rule without for_each would emit it verbatim"""
+        if self.for_each is not None:
+            try:
+                text.format(value="")
+            except (KeyError, IndexError, ValueError) as exc:
+                raise RuleError(f"{domain}: {key} {text!r} may only use {{value}}: {exc}") from None
+            return
+        try:
+            names = {name for _, name, _, _ in string.Formatter().parse(text) if name is not None}
+        except ValueError:
+            return  # Unbalanced braces: plain text, since it is never formatted
+        if "value" in names:
+            raise RuleError(f"{domain}: {key} {text!r} uses {{value}} without for_each")
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        return self.any + self.all + self.none
+
+    def matches(self, found: Set[str]) -> bool:
+        return ((not self.any or not found.isdisjoint(self.any))
+                and found.issuperset(self.all) and found.isdisjoint(self.none))
+
+    def matches_hits(self, hits: KeywordHits) -> bool:
+        """matches() against KeywordHits, testing only as many keywords as needed"""
+        if self.any and not hits.has_any(self.any):
+            return False
+        for keyword in self.all:
+            if keyword not in hits:
+                return False
+        return not self.none or not hits.has_any(self.none)
+
+    def expand(self, value: Optional[str]) -> Dict:
+        if value is None:
+            return self.fields
+        return {key: field.format(value=value) if isinstance(field, str) else field
+                for key, field in self.fields.items()}
+
+
+class DomainMatcher:
+    """
+    Every rule of one domain behind one keyword matcher. Up to SCAN_THRESHOLD
+    keywords, rules are tested in order through KeywordHits, which is shared
+    with the planner and the other agents and stops at the first keyword that
+    decides a rule. Past that, one regex over a trie of the vocabulary finds
+    every keyword in a single pass over the content, at a cost bounded by the
+    longest keyword rather than the number of rules, and only rules indexed
+    under a keyword that is present are tested.
+    """
+
+    SCAN_THRESHOLD = 48
+
+    def __init__(self, domain: str, rules: List[ExtractionRule], record_type: Optional[type]):
+        self.domain = domain
+        self.rules = rules
+        self.record_type = record_type
+        self.prefix = TRACKED_KINDS[record_type][1] if record_type is not None else None
+        self.keywords = tuple(dict.fromkeys(keyword for rule in rules for keyword in rule.keywords))
+        self._always = [index for index, rule in enumerate(rules) if not (rule.any or rule.all)]
+        self._by_keyword: Dict[str, List[int]] = {}
+        for index, rule in enumerate(rules):
+            for keyword in set(rule.any + rule.all):
+                self._by_keyword.setdefault(keyword, []).append(index)
+        self._pattern = None
+        if len(self.keywords) > self.SCAN_THRESHOLD:
+            # A match at a position is the longest keyword starting there; every
+            # keyword inside it is present too
+            self._pattern = re.compile(f"(?=({_trie_pattern(self.keywords)}))")
+            self._implied = {keyword: [other for other in self.keywords if other in keyword]
+                             for keyword in self.keywords}
+
+    def candidates(self, hits: KeywordHits) -> Tuple[Sequence[ExtractionRule], Optional[Set[str]]]:
+        """
+        Rules that may match, in file order, and the keywords found; found is
+        None when rules are to be tested with matches_hits instead
+        """
+        if self._pattern is None:
+            return self.rules, None
+        found = set()
+        for match in set(self._pattern.findall(hits.text)):
+            found.update(self._implied[match])
+        hits.record(self.keywords, [keyword in found for keyword in self.keywords])
+        indexes = set(self._always)
+        for keyword in found:
+            indexes.update(self._by_keyword.get(keyword, ()))
+        return [self.rules[index] for index in sorted(indexes)], found
+
+    def matching(self, hits: KeywordHits) -> List[ExtractionRule]:
+        """
+        Rules that match, in file order. An otherwise rule is only included
+        (and only tested) when no rule before it matched.
+        """
+        rules, found = self.candidates(hits)
+        matched = []
+        for rule in rules:
+            if rule.otherwise and matched:
+                continue
+            if rule.matches(found) if found is not None else rule.matches_hits(hits):
+                matched.append(rule)
+        return matched
+
+
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """A regex alternation factored as a trie, preferring the longest keyword"""
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class ExtractionRules:
+    """
+    A compiled, immutable rule set. Each top-level key of the spec is a domain:
+    a tracking kind (action_item, risk, issue, decision) whose rules produce
+    typed records numbered in order, or any other name whose rules produce
+    `value` strings for `for_each` in other domains. Every rule must give the
+    record type's required fields (or `value`), and record fields may use
+    {value} only when the rule has for_each. Anything else raises RuleError.
+    """
+
+    def __init__(self, spec: Dict, source: Optional[str] = None):
+        self.source = source
+        # Identifies the rule set's output, e.g. in ResultCache keys
+        self.fingerprint = hashlib.sha256(json.dumps(spec, sort_keys=True, default=str).encode()).hexdigest()
+        record_types = {kind: record_type for record_type, (kind, _) in TRACKED_KINDS.items()}
+        if not isinstance(spec, dict):
+            raise RuleError("expected an object mapping each domain to its rules")
+        self.domains: Dict[str, DomainMatcher] = {}
+        for domain, specs in spec.items():
+            record_type = record_types.get(domain)
+            if record_type is not None:
+                record_fields = [spec_field for name, spec_field in record_type.__dataclass_fields__.items()
+                                 if name != "item_id"]
+                field_names = {spec_field.name for spec_field in record_fields}
+                required = {spec_field.name for spec_field in record_fields
+                            if spec_field.default is MISSING and spec_field.default_factory is MISSING}
+            else:
+                field_names = required = {"value"}
+            if not isinstance(specs, list):
+                raise RuleError(f"{domain}: expected a list of rules")
+            rules = [ExtractionRule(rule, field_names, required, domain) for rule in specs]
+            self.domains[domain] = DomainMatcher(domain, rules, record_type)
+        for matcher in self.domains.values():
+            for rule in matcher.rules:
+                if rule.for_each is not None and (not isinstance(rule.for_each, str)
+                                                  or rule.for_each not in self.domains
+                                                  or self.domains[rule.for_each].record_type is not None):
+                    raise RuleError(f"{matcher.domain}: for_each names no value domain: {rule.for_each}")
+
+    @classmethod
+    def load(cls, path: str) -> "ExtractionRules":
+        """Compile a .json, or with PyYAML installed a .yaml/.yml, rule file"""
+        with open(path, encoding="utf-8") as stream:
+            if path.endswith((".yaml", ".yml")):
+                if yaml is None:
+                    raise RuleError("YAML rule files need PyYAML installed")
+                spec = yaml.safe_load(stream)
+            else:
+                spec = json.load(stream)
+        return cls(spec, path)
+
+    @property
+    def keywords(self) -> Tuple[str, ...]:
+        """Every keyword any rule tests, in file order"""
+        return tuple(dict.fromkeys(keyword for matcher in self.domains.values() for keyword in matcher.keywords))
+
+    def values(self, domain: str, hits: KeywordHits) -> List[str]:
+        return [rule.fields["value"] for rule in self.domains[domain].matching(hits)]
+
+    def extract(self, domain: str, hits: KeywordHits) -> List["ExtractionRecord"]:
+        """Typed records for a tracking-kind domain, with IDs from PREFIX-001"""
+        matcher = self.domains.get(domain)
+        if matcher is None:
+            return []
+        record_type, prefix = matcher.record_type, matcher.prefix
+        records = []
+        for rule in matcher.matching(hits):
+            for value in self.values(rule.for_each, hits) if rule.for_each else (None,):
+                records.append(record_type(f"{prefix}-{len(records) + 1:03d}", **rule.expand(value)))
+        return records
+
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "extraction_rules.json")
+
+# Read once per extraction call; replacing the module global is the atomic swap
+EXTRACTION_RULES = ExtractionRules.load(DEFAULT_RULES_PATH)
+
+
+def load_extraction_rules(path: Optional[str] = None) -> ExtractionRules:
+    """
+    Compile a rule file (default: the current rules' file) and swap it in.
+    Extractions already running finish with the rules they started with; a
+    file that fails to compile raises and leaves the current rules in place.
+    """
+    global EXTRACTION_RULES
+    rules = ExtractionRules.load(path or EXTRACTION_RULES.source or DEFAULT_RULES_PATH)
+    EXTRACTION_RULES = rules
+    return rules
+
+
+def subtask_suffix(number: int) -> str:
+    """Spreadsheet-style letters for the nth subtask: A..Z, AA..AZ, BA..."""
+    letters = ""
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+
+class ResponseTemplate:
+    """
+    Canned response text split once around its {field} placeholder, so a
+    response is a single concatenation with the message's value
+    """
+
+    __slots__ = ("head", "tail")
+
+    def __init__(self, text: str, field: str = "project"):
+        self.head, placeholder, self.tail = text.partition("{" + field + "}")
+        # Responses without the placeholder are returned as the same string
+        if not placeholder:
+            self.tail = None
+
+    def render(self, value: Any = None) -> str:
+        if self.tail is None:
+            return self.head
+        return f"{self.head}{value}{self.tail}"
+
+
+# QnA and ambiguous-request responses: WHAT I KNOW / WHAT I'VE LOGGED / WHAT I NEED
+RESPONSE_TEMPLATES = {
+    "status": ResponseTemplate("""Response: "Current status of authentication feature:
+
+WHAT I KNOW:
+• Project: {project}
+• Last update: Feature in testing phase
+• Completion: 80%
+
+WHAT I'VE LOGGED:
+• No blocking issues
+• On track for current milestone
+
+WHAT I NEED:
+• Latest test results from QA team
+• Final deployment timeline confirmation
+
+I'll follow up with the engineering team for the latest details.\""""),
+    "feature_request": ResponseTemplate("""Response: "For the feature request:
+
+WHAT I KNOW:
+• Current timeline: Dec 15 (code freeze Dec 10)
+• Team capacity: 85% utilized
+• Progress: 70% complete
+
+WHAT I'VE LOGGED:
+• Action items for feature evaluation
+• Risks flagged (timeline + scope)
+• Decision pending
+
+WHAT I NEED:
+• Complexity estimates from Engineering
+• Capacity analysis
+• Go/no-go decision from leadership
+
+I cannot assess feasibility without Engineering input on implementation timeline.\""""),
+    "prioritization": ResponseTemplate("""Response: "Regarding prioritization decision:
+
+WHAT I KNOW:
+• Two competing priorities identified
+• Both have business impact
+
+WHAT I'VE LOGGED:
+• Decision point created
+• Risk assessment for both options
+
+WHAT I NEED:
+• Business impact analysis
+• Technical debt assessment
+• Leadership decision on priority
+
+I recommend scheduling a quick sync with stakeholders to align on priorities.\""""),
+    "general": ResponseTemplate("""Response: "I've received your message regarding {project}.
+
+WHAT I'VE LOGGED:
+• Your request has been tracked
+• Initial context gathered
+
+WHAT I NEED:
+• More specific information to provide accurate response
+• Clarification on priority and timeline
+
+Please provide additional details so I can assist effectively.\""""),
+    "ambiguous": ResponseTemplate("""Response: "I received your message, but need clarification:
+
+MISSING INFORMATION:
+• Specific project context (no project specified)
+• Clear action or question
+• Timeline or priority
+
+WHAT I CAN DO:
+• Track this as a general inquiry
+• Route to appropriate team once clarified
+
+Please provide:
+1. Which project this relates to
+2. Specific action needed or question
+3. Any relevant timeline
+
+This will help me assist you effectively.\""""),
+}
+
+# Static meeting output when no live minutes are attached
+MEETING_SUMMARY_LINES = (
+    "Meeting summary generated:",
+    "• 4 speakers identified",
+    "• 3 action items extracted",
+    "• 2 blockers identified",
+    "• 1 deliverable committed"
+)
+MEETING_REPORT_LINES = (
+    "Meeting Report Generated:",
+    "• Attendees: 4",
+    "• Key Discussion Points: Integration blockers, QA findings, design updates",
+    "• Action Items: 3 assigned",
+    "• Next Steps: Unblock staging, fix critical bugs, review mockups"
+)
+
+
 class L2Coordinator:
     """L2 Coordinator - Coordinates L3 agents within its domain"""
 
-    def __init__(self, domain: L2Domain):
+    def __init__(self, domain: L2Domain, tracking: Optional["TrackingStore"] = None,
+                 instrumentation: Optional["Instrumentation"] = None, delivery: Optional["DeliveryService"] = None):
         self.domain = domain
         self.subtask_counter = 0
+        # Tracking agents persist extracted records here when set
+        self.tracking = tracking
+        self.instrumentation = instrumentation
+        # Responses are sent by the orchestrator once the plan has run
+        self.delivery = delivery
 
     def _next_subtask_id(self, parent_id: str) -> str:
         self.subtask_counter += 1
-        return f"{parent_id}-{chr(64 + self.subtask_counter)}"
+        return f"{parent_id}-{subtask_suffix(self.subtask_counter)}"
 
-    def execute(self, task: Task, message: Dict) -> Task:
+    def execute(self, task: Task, message: Dict, hits: Optional[KeywordHits] = None,
+                span: Optional["Span"] = None) -> Task:
         """Execute L2 task by coordinating appropriate L3 agents"""
-        content = message.get("content", "")
-        source = message.get("source", "")
-        sender = message.get("sender", {})
-        project = message.get("project", "N/A")
+        if hits is None:
+            hits = KeywordHits.of(message)
 
-        purpose = task.purpose.lower()
-
-        # --- TRACKING_EXECUTION domain orchestration ---
-        if "action item" in purpose or "action items" in purpose:
-            # extraction + validation + tracking
-            task.subtasks.append(self._execute_action_item_extraction(task.task_id, content))
-            task.subtasks.append(self._execute_action_item_validation(task.task_id))
-            task.subtasks.append(self._execute_action_item_tracking(task.task_id))
-
-        elif "risk" in purpose:
-            # extraction + tracking
-            task.subtasks.append(self._execute_risk_extraction(task.task_id, content))
-            task.subtasks.append(self._execute_risk_tracking(task.task_id))
-
-        elif "issue" in purpose:
-            # extraction + tracking
-            task.subtasks.append(self._execute_issue_extraction(task.task_id, content))
-            task.subtasks.append(self._execute_issue_tracking(task.task_id, content))
+        # Subtask IDs are scoped to the parent task, so a coordinator reused
+        # across tasks starts each one at -A
+        self.subtask_counter = 0
 
-        elif "decision" in purpose:
-            task.subtasks.append(self._execute_decision_extraction(task.task_id, content))
+        if self.instrumentation is not None:
+            return self._execute_traced(task, message, hits, span)
 
-        # --- COMMUNICATION_COLLABORATION domain orchestration ---
-        elif "send" in purpose or "delivery" in purpose:
-            task.subtasks.append(self._execute_message_delivery(task.task_id, source, sender))
+        # Handlers run in route order; each sees the subtasks before it
+        for handler in self.route(task.purpose):
+            task.add_subtasks(handler(self, task, message, hits))
 
-        elif "response" in purpose or "formulate" in purpose:
-            task.subtasks.append(self._execute_qna(task.task_id, content, message))
+        return task
 
-        # IMPORTANT: check for report/summary BEFORE generic "meeting"
-        elif "report" in purpose or "summary" in purpose:
-            task.subtasks.append(self._execute_report_generation(task.task_id, content))
+    def _execute_traced(self, task: Task, message: Dict, hits: KeywordHits, span: Optional["Span"]) -> Task:
+        for handler in self.route(task.purpose):
+            task.add_subtasks(self.run_traced(handler, task, message, hits, span))
+        return task
 
-        elif "meeting" in purpose:
-            task.subtasks.append(self._execute_meeting_attendance(task.task_id, content))
+    def run_traced(self, handler: "AgentHandler", task: Task, message: Dict, hits: KeywordHits,
+                   span: Optional["Span"]) -> Task:
+        """Run one L3 handler for task under a subtask span"""
+        instrumentation = self.instrumentation
+        subtask_span = instrumentation.start("subtask", span, task_id=task.task_id)
+        try:
+            subtask = handler(self, task, message, hits)
+        except BaseException as exc:
+            instrumentation.end(subtask_span, exc)
+            raise
+        subtask_span.attributes["task_id"] = subtask.task_id
+        subtask_span.attributes["agent"] = subtask.target
+        instrumentation.end(subtask_span)
+        return subtask
 
-        # --- Ambiguous handling ---
-        elif "ambiguous" in purpose:
-            task.subtasks.append(self._execute_ambiguous_handling(task.task_id, content, project))
+    def route(self, purpose: str) -> Tuple["AgentHandler", ...]:
+        """L3 handlers for a task purpose in this domain"""
+        return ROUTING_TABLE.get(self.domain, purpose)
 
-        return task
+    def new_subtask(self, parent: Task, agent: str, purpose: str) -> Task:
+        """Create the next L3 subtask of parent, for handlers registered via register_agent"""
+        return Task(task_id=self._next_subtask_id(parent.task_id), target=L3_TARGETS[agent], purpose=purpose)
 
-    def _execute_action_item_extraction(self, parent_id: str, content: str) -> Task:
+    def _execute_action_item_extraction(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Extract action items from content"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:action_item_extraction",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.ACTION_ITEM_EXTRACTION],
             purpose="Extract action items"
         )
 
-        # Simulate extraction logic
-        action_items = []
-        if "add" in content.lower() or "feature" in content.lower():
-            features = self._extract_features(content)
-            for i, feature in enumerate(features, 1):
-                action_items.append(
-                    f"AI-{i:03d}: \"Evaluate {feature}\"\n"
-                    f"  Owner: ? | Due: ? | Flags: [MISSING_OWNER, MISSING_DUE_DATE]"
-                )
-
-        if "blocked" in content.lower():
-            action_items.append(
-                "AI-001: \"Unblock API integration issue\"\n"
-                "  Owner: ? | Due: URGENT | Flags: [MISSING_OWNER]"
-            )
-
-        if not action_items and any(word in content.lower() for word in ["ready", "complete", "done"]):
-            action_items.append(
-                "AI-001: \"Review completed deliverable\"\n"
-                "  Owner: ? | Due: ? | Flags: [MISSING_OWNER, MISSING_DUE_DATE]"
-            )
+        action_items = EXTRACTION_RULES.extract("action_item", hits)
 
-        subtask.output = action_items if action_items else ["No action items detected"]
+        subtask.records = action_items
+        subtask.output = [item.render() for item in action_items] if action_items else ["No action items detected"]
         return subtask
 
-    def _execute_action_item_validation(self, parent_id: str) -> Task:
+    def _execute_action_item_validation(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Validate extracted action items"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:action_item_validation",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.ACTION_ITEM_VALIDATION],
             purpose="Validate action items"
         )
 
@@ -299,323 +1373,369 @@ class L2Coordinator:
         ]
         return subtask
 
-    def _execute_action_item_tracking(self, parent_id: str) -> Task:
+    def _execute_action_item_tracking(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Track action items"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:action_item_tracking",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.ACTION_ITEM_TRACKING],
             purpose="Track action items"
         )
 
+        if self.tracking is None:
+            subtask.output = [
+                "Action Item Tracking:",
+                "• New action items logged into tracking system",
+                "• Initial status set to OPEN"
+            ]
+            return subtask
+
+        project, new, seen = self._track(task, message, ActionItem)
+        snapshot = self.tracking.snapshot(project, "action_item")
         subtask.output = [
             "Action Item Tracking:",
-            "• New action items logged into tracking system",
-            "• Initial status set to OPEN"
+            f"• Tracked: {new} new, {seen - new} updated",
+            f"• Open action items for {project}: {snapshot['open']}"
         ]
         return subtask
 
 
-    def _execute_risk_extraction(self, parent_id: str, content: str) -> Task:
+    def _execute_risk_extraction(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Extract risks from content"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:risk_extraction",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.RISK_EXTRACTION],
             purpose="Extract and assess risks"
         )
 
-        risks = []
-        if "timeline" in content.lower() or "same timeline" in content.lower():
-            risks.append("RISK-001: \"Timeline compression with scope increase\"\n  Likelihood: HIGH | Impact: HIGH")
-
-        if "scope" in content.lower() or "add" in content.lower():
-            risks.append("RISK-002: \"Scope creep without resource adjustment\"\n  Likelihood: MEDIUM | Impact: MEDIUM")
-
-        if "blocked" in content.lower():
-            risks.append("RISK-001: \"Development blockers affecting delivery\"\n  Likelihood: HIGH | Impact: CRITICAL")
+        risks = EXTRACTION_RULES.extract("risk", hits)
 
-        if "bug" in content.lower() or "critical" in content.lower():
-            risks.append("RISK-002: \"Quality issues in production path\"\n  Likelihood: HIGH | Impact: HIGH")
-
-        if "legal" in content.lower() or "escalate" in content.lower():
-            risks.append("RISK-001: \"Client escalation and contract risk\"\n  Likelihood: HIGH | Impact: CRITICAL")
-
-        subtask.output = risks if risks else ["No significant risks identified"]
+        subtask.records = risks
+        subtask.output = [risk.render() for risk in risks] if risks else ["No significant risks identified"]
         return subtask
 
-    def _execute_risk_tracking(self, parent_id: str) -> Task:
+    def _execute_risk_tracking(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:risk_tracking",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.RISK_TRACKING],
             purpose="Track risks"
         )
+        if self.tracking is None:
+            subtask.output = [
+                "Risk Tracking:",
+                "• Identified risks logged with likelihood and impact",
+                "• Risk snapshot updated for project"
+            ]
+            return subtask
+
+        project, new, seen = self._track(task, message, Risk)
         subtask.output = [
             "Risk Tracking:",
-            "• Identified risks logged with likelihood and impact",
-            "• Risk snapshot updated for project"
+            f"• Tracked: {new} new, {seen - new} updated",
+            f"• Risk snapshot for {project}: {self._format_snapshot(project, 'risk')}"
         ]
         return subtask
 
-    def _execute_issue_extraction(self, parent_id: str, content: str) -> Task:
+    def _execute_issue_extraction(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Extract issues from content"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:issue_extraction",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.ISSUE_EXTRACTION],
             purpose="Extract issues"
         )
 
-        issues = []
-        issue_id = 1  # ensure unique IDs per message
-
-        if "blocked" in content.lower():
-            issues.append(
-                f"ISSUE-{issue_id:03d}: \"API integration blocked - staging environment down\"\n"
-                f"  Severity: HIGH | Status: OPEN"
-            )
-            issue_id += 1
-
-        if "bug" in content.lower():
-            issues.append(
-                f"ISSUE-{issue_id:03d}: \"3 critical bugs in payment flow\"\n"
-                f"  Severity: CRITICAL | Status: OPEN"
-            )
-            issue_id += 1
-
-        if "not delivered" in content.lower() or "promised" in content.lower():
-            issues.append(
-                f"ISSUE-{issue_id:03d}: \"Delivery commitment missed for Q3 feature\"\n"
-                f"  Severity: CRITICAL | Status: OPEN"
-            )
+        issues = EXTRACTION_RULES.extract("issue", hits)
 
-        subtask.output = issues if issues else ["No issues detected"]
+        subtask.records = issues
+        subtask.output = [issue.render() for issue in issues] if issues else ["No issues detected"]
         return subtask
 
-    def _execute_issue_tracking(self, parent_id: str, content: str) -> Task:
+    def _execute_issue_tracking(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:issue_tracking",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.ISSUE_TRACKING],
             purpose="Track issues"
         )
+        if self.tracking is None:
+            subtask.output = [
+                "Issue Tracking:",
+                "• Detected issues logged with severity and status",
+                "• Issue snapshot updated for project"
+            ]
+            return subtask
+
+        project, new, seen = self._track(task, message, Issue)
         subtask.output = [
             "Issue Tracking:",
-            "• Detected issues logged with severity and status",
-            "• Issue snapshot updated for project"
+            f"• Tracked: {new} new, {seen - new} updated",
+            f"• Issue snapshot for {project}: {self._format_snapshot(project, 'issue')}"
         ]
         return subtask
 
-    def _execute_decision_extraction(self, parent_id: str, content: str) -> Task:
+    def _track(self, task: Task, message: Dict, record_type: type) -> Tuple[str, int, int]:
+        """
+        Persist the records of the sibling extraction subtask and re-render it
+        with the tracked IDs. Returns (project, new records, records tracked).
+        """
+        project = message.get("project") or "N/A"
+        for extraction in task.subtasks:
+            records = [record for record in extraction.records if isinstance(record, record_type)]
+            if records:
+                new = self.tracking.track(project, records, message.get("message_id"))
+                extraction.output = [record.render() for record in extraction.records]
+                return project, new, len(records)
+        return project, 0, 0
+
+    def _format_snapshot(self, project: str, kind: str) -> str:
+        snapshot = self.tracking.snapshot(project, kind)
+        by_priority = ", ".join(f"{priority}: {count}" for priority, count in sorted(snapshot["by_priority"].items()))
+        return f"{snapshot['open']} open" + (f" ({by_priority})" if by_priority else "")
+
+    def _execute_decision_extraction(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Extract decisions from content"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:decision_extraction",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.DECISION_EXTRACTION],
             purpose="Extract decisions"
         )
 
-        decisions = []
-        if "can we" in content.lower() or "should we" in content.lower():
-            if "add" in content.lower():
-                decisions.append("DEC-001: \"Accept or reject feature request\"\n  Decision Maker: ? | Status: PENDING")
-            elif "prioritize" in content.lower():
-                decisions.append(
-                    "DEC-001: \"Prioritization decision: security fixes vs new features\"\n  Decision Maker: ? | Status: PENDING")
+        decisions = EXTRACTION_RULES.extract("decision", hits)
+
+        # Decisions have no tracking step in the plan, so they are persisted here
+        if self.tracking is not None:
+            self.tracking.track(message.get("project") or "N/A", decisions, message.get("message_id"))
 
-        subtask.output = decisions if decisions else [
-            "DEC-001: \"Decision required on request\"\n  Decision Maker: ? | Status: PENDING"]
+        subtask.records = decisions
+        subtask.output = [decision.render() for decision in decisions]
         return subtask
 
-    def _execute_qna(self, parent_id: str, content: str, message: Dict) -> Task:
+    def _execute_qna(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Formulate response to questions"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:qna",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.QNA],
             purpose="Formulate response"
         )
 
-        project = message.get("project", "N/A")
-
-        if "status" in content.lower():
-            response = f"""Response: "Current status of authentication feature:
-
-WHAT I KNOW:
-• Project: {project}
-• Last update: Feature in testing phase
-• Completion: 80%
-
-WHAT I'VE LOGGED:
-• No blocking issues
-• On track for current milestone
-
-WHAT I NEED:
-• Latest test results from QA team
-• Final deployment timeline confirmation
-
-I'll follow up with the engineering team for the latest details.\""""
-
-        elif "can we add" in content.lower() or "can we" in content.lower():
-            response = """Response: "For the feature request:
-
-WHAT I KNOW:
-• Current timeline: Dec 15 (code freeze Dec 10)
-• Team capacity: 85% utilized
-• Progress: 70% complete
-
-WHAT I'VE LOGGED:
-• Action items for feature evaluation
-• Risks flagged (timeline + scope)
-• Decision pending
-
-WHAT I NEED:
-• Complexity estimates from Engineering
-• Capacity analysis
-• Go/no-go decision from leadership
-
-I cannot assess feasibility without Engineering input on implementation timeline.\""""
-
-        elif "prioritize" in content.lower() or "should" in content.lower():
-            response = """Response: "Regarding prioritization decision:
-
-WHAT I KNOW:
-• Two competing priorities identified
-• Both have business impact
-
-WHAT I'VE LOGGED:
-• Decision point created
-• Risk assessment for both options
-
-WHAT I NEED:
-• Business impact analysis
-• Technical debt assessment
-• Leadership decision on priority
-
-I recommend scheduling a quick sync with stakeholders to align on priorities.\""""
-
+        if "status" in hits:
+            response = RESPONSE_TEMPLATES["status"].render(message.get("project", "N/A"))
+        elif hits.has_any(("can we add", "can we")):
+            response = RESPONSE_TEMPLATES["feature_request"].render()
+        elif hits.has_any(("prioritize", "should")):
+            response = RESPONSE_TEMPLATES["prioritization"].render()
         else:
-            response = f"""Response: "I've received your message regarding {project}.
-
-WHAT I'VE LOGGED:
-• Your request has been tracked
-• Initial context gathered
-
-WHAT I NEED:
-• More specific information to provide accurate response
-• Clarification on priority and timeline
-
-Please provide additional details so I can assist effectively.\""""
+            response = RESPONSE_TEMPLATES["general"].render(message.get("project", "N/A"))
 
         subtask.output = [response]
         return subtask
 
-    def _execute_meeting_attendance(self, parent_id: str, content: str) -> Task:
+    def _execute_meeting_attendance(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Process meeting content"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:meeting_attendance",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.MEETING_ATTENDANCE],
             purpose="Process meeting transcript"
         )
 
-        subtask.output = [
-            "Meeting summary generated:",
-            "• 4 speakers identified",
-            "• 3 action items extracted",
-            "• 2 blockers identified",
-            "• 1 deliverable committed"
-        ]
+        minutes = message.get("minutes")
+        if minutes is not None:
+            # Live meeting: counts were kept as the transcript streamed in
+            subtask.output = minutes.summary_lines()
+            return subtask
+
+        subtask.output = list(MEETING_SUMMARY_LINES)
         return subtask
 
-    def _execute_report_generation(self, parent_id: str, content: str) -> Task:
+    def _execute_report_generation(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Generate report"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:report_generation",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.REPORT_GENERATION],
             purpose="Generate meeting report"
         )
 
-        subtask.output = [
-            "Meeting Report Generated:",
-            "• Attendees: 4",
-            "• Key Discussion Points: Integration blockers, QA findings, design updates",
-            "• Action Items: 3 assigned",
-            "• Next Steps: Unblock staging, fix critical bugs, review mockups"
-        ]
+        minutes = message.get("minutes")
+        if minutes is not None:
+            subtask.output = minutes.report_lines()
+            return subtask
+
+        subtask.output = list(MEETING_REPORT_LINES)
         return subtask
 
-    def _execute_message_delivery(self, parent_id: str, source: str, sender: Dict) -> Task:
+    def _execute_message_delivery(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Deliver message"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:message_delivery",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.MESSAGE_DELIVERY],
             purpose="Send response"
         )
+        source = message.get("source", "")
+        sender = message.get("sender", {})
+
+        if self.delivery is None:
+            status = "SENT"
+        elif self.delivery.supports(source):
+            status = "QUEUED"
+        else:
+            status = "NO CHANNEL"
 
         subtask.output = [
             f"Channel: {source}",
             f"Recipient: {sender.get('name', 'Unknown')}",
-            "Delivery Status: SENT"
+            f"Delivery Status: {status}"
         ]
         return subtask
 
-    def _execute_ambiguous_handling(self, parent_id: str, content: str, project: str) -> Task:
+    def _execute_ambiguous_handling(self, task: Task, message: Dict, hits: KeywordHits) -> Task:
         """Handle ambiguous requests"""
         subtask = Task(
-            task_id=self._next_subtask_id(parent_id),
-            target="L3:qna",
+            task_id=self._next_subtask_id(task.task_id),
+            target=L3_TARGETS[AgentId.QNA],
             purpose="Handle ambiguous request"
         )
 
-        response = """Response: "I received your message, but need clarification:
-
-MISSING INFORMATION:
-• Specific project context (no project specified)
-• Clear action or question
-• Timeline or priority
-
-WHAT I CAN DO:
-• Track this as a general inquiry
-• Route to appropriate team once clarified
-
-Please provide:
-1. Which project this relates to
-2. Specific action needed or question
-3. Any relevant timeline
+        subtask.output = [RESPONSE_TEMPLATES["ambiguous"].render()]
+        return subtask
 
-This will help me assist you effectively.\""""
 
-        subtask.output = [response]
-        return subtask
+AgentHandler = Callable[[L2Coordinator, Task, Dict, KeywordHits], Task]
+
+
+class RoutingTable:
+    """
+    Compiled L2 dispatch: (domain, task purpose) -> tuple of L3 handlers.
+    Built once from AgentRegistry.INTENT_AGENTS and rebuilt only when an agent
+    is registered, so routing a task is a single dictionary lookup.
+    """
+
+    # Purpose keywords for tasks whose purpose is not an Intent, checked in order
+    # (report/summary before the generic "meeting")
+    PURPOSE_KEYWORDS = (
+        (("action item",), Intent.EXTRACT_ACTION_ITEMS),
+        (("risk",), Intent.EXTRACT_RISKS),
+        (("issue",), Intent.EXTRACT_ISSUES),
+        (("decision",), Intent.EXTRACT_DECISIONS),
+        (("send", "delivery"), Intent.SEND_RESPONSE),
+        (("response", "formulate"), Intent.FORMULATE_RESPONSE),
+        (("report", "summary"), Intent.GENERATE_REPORT),
+        (("meeting",), Intent.PROCESS_MEETING),
+        (("ambiguous",), Intent.HANDLE_AMBIGUOUS)
+    )
+
+    def __init__(self, handlers: Dict[str, AgentHandler],
+                 intent_handlers: Optional[Dict[Tuple[str, str], AgentHandler]] = None):
+        self.handlers = dict(handlers)
+        # Per-intent overrides, e.g. the QnA agent answering an ambiguous request
+        self.intent_handlers = dict(intent_handlers or {})
+        self.intent_agents = {key: tuple(agents) for key, agents in AgentRegistry.INTENT_AGENTS.items()}
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[L2Domain, str], Tuple[AgentHandler, ...]] = {}
+        self.compile()
+
+    def compile(self):
+        """Rebuild the route dictionary from the registry; swapped in whole so readers never see it half-built"""
+        routes = {}
+        for (domain, intent), agents in self.intent_agents.items():
+            handlers = []
+            for agent in agents:
+                if agent not in AgentRegistry.L3_AGENTS[domain]:
+                    raise ValueError(f"Agent {agent} is not registered under {domain.value}")
+                handler = self.intent_handlers.get((agent, intent)) or self.handlers.get(agent)
+                if handler is None:
+                    raise ValueError(f"No handler registered for agent {agent}")
+                handlers.append(handler)
+            routes[(domain, intent)] = tuple(handlers)
+        self._agents = {handler: agent for agent, handler in self.handlers.items()}
+        self._agents.update((handler, agent) for (agent, _), handler in self.intent_handlers.items())
+        self._routes = routes
+
+    def agent_of(self, handler: AgentHandler) -> Optional[str]:
+        """The agent a routed handler runs for"""
+        return self._agents.get(handler)
+
+    def get(self, domain: L2Domain, purpose: str) -> Tuple[AgentHandler, ...]:
+        """Handlers for a purpose in a domain; falls back to keyword matching for free-form purposes"""
+        handlers = self._routes.get((domain, purpose))
+        if handlers is None:
+            handlers = self._resolve(domain, purpose)
+        return handlers
+
+    def _resolve(self, domain: L2Domain, purpose: str) -> Tuple[AgentHandler, ...]:
+        routes = self._routes
+        lowered = purpose.lower()
+        handlers: Tuple[AgentHandler, ...] = ()
+        for keywords, intent in self.PURPOSE_KEYWORDS:
+            if any(keyword in lowered for keyword in keywords):
+                handlers = routes.get((domain, intent), ())
+                if not handlers:
+                    # Purpose belongs to another domain's agents
+                    handlers = next((h for (_, i), h in routes.items() if i == intent), ())
+                break
+        # Remember the answer so the next task with this purpose is a plain lookup
+        routes[(domain, purpose)] = handlers
+        return handlers
+
+    def register_agent(self, domain: L2Domain, agent: str, description: str, handler: AgentHandler,
+                       intents: Iterable[str] = ()):
+        """
+        Add an L3 agent to a domain and append it to the routes of the given
+        intents (any purpose string; new purposes get a route of their own).
+        The handler is called as handler(coordinator, task, message, hits) and
+        returns the subtask it ran; coordinator.new_subtask() numbers it.
+        """
+        with self._lock:
+            AgentRegistry.L3_AGENTS[domain][agent] = description
+            L3_TARGETS.setdefault(agent, f"L3:{agent}")
+            self.handlers[agent] = handler
+            for intent in intents:
+                key = (domain, intent)
+                self.intent_agents[key] = self.intent_agents.get(key, ()) + (agent,)
+            self.compile()
+
+
+ROUTING_TABLE = RoutingTable(
+    handlers={
+        AgentId.ACTION_ITEM_EXTRACTION: L2Coordinator._execute_action_item_extraction,
+        AgentId.ACTION_ITEM_VALIDATION: L2Coordinator._execute_action_item_validation,
+        AgentId.ACTION_ITEM_TRACKING: L2Coordinator._execute_action_item_tracking,
+        AgentId.RISK_EXTRACTION: L2Coordinator._execute_risk_extraction,
+        AgentId.RISK_TRACKING: L2Coordinator._execute_risk_tracking,
+        AgentId.ISSUE_EXTRACTION: L2Coordinator._execute_issue_extraction,
+        AgentId.ISSUE_TRACKING: L2Coordinator._execute_issue_tracking,
+        AgentId.DECISION_EXTRACTION: L2Coordinator._execute_decision_extraction,
+        AgentId.QNA: L2Coordinator._execute_qna,
+        AgentId.REPORT_GENERATION: L2Coordinator._execute_report_generation,
+        AgentId.MESSAGE_DELIVERY: L2Coordinator._execute_message_delivery,
+        AgentId.MEETING_ATTENDANCE: L2Coordinator._execute_meeting_attendance
+    },
+    intent_handlers={
+        (AgentId.QNA, Intent.HANDLE_AMBIGUOUS): L2Coordinator._execute_ambiguous_handling
+    }
+)
 
-    def _extract_features(self, content: str) -> List[str]:
-        """Extract feature mentions from content"""
-        features = []
-        content_lower = content.lower()
 
-        if "notification" in content_lower:
-            features.append("real-time notifications feature")
-        if "dashboard" in content_lower and "export" in content_lower:
-            features.append("dashboard export feature")
-        if "sso" in content_lower or "integration" in content_lower:
-            features.append("SSO integration feature")
+def register_l3_agent(domain: L2Domain, agent: str, description: str, handler: AgentHandler,
+                      intents: Iterable[str] = ()):
+    """Register a new L3 agent and route the given task purposes to it"""
+    ROUTING_TABLE.register_agent(domain, agent, description, handler, intents)
 
-        return features if features else ["requested feature"]
 
+class KnowledgeBackend:
+    """
+    Source of project context for the knowledge_retrieval agent. Subclasses
+    override fetch(); it may block (database, HTTP) and is called only on a
+    cache miss.
+    """
 
-class L3Agent:
-    """L3 Agent - Executes specific tasks"""
+    def fetch(self, project: Any) -> Sequence[str]:
+        raise NotImplementedError
 
-    @staticmethod
-    def execute_cross_cutting(task: Task, message: Dict) -> Task:
-        """Execute cross-cutting agent tasks"""
-        if "knowledge_retrieval" in task.target:
-            return L3Agent._execute_knowledge_retrieval(task, message)
-        elif "evaluation" in task.target:
-            return L3Agent._execute_evaluation(task)
-        return task
 
-    @staticmethod
-    def _execute_knowledge_retrieval(task: Task, message: Dict) -> Task:
-        """Retrieve knowledge from database"""
-        project = message.get("project", "N/A")
+class StaticKnowledgeBackend(KnowledgeBackend):
+    """Built-in project context used until a real project database is wired in"""
 
+    def fetch(self, project: Any) -> Sequence[str]:
         if project != "N/A":
-            task.output = [
+            return (
                 f"Project: {project}",
                 "Current Release Date: Dec 15",
                 "Days Remaining: 20",
@@ -624,18 +1744,161 @@ class L3Agent:
                 "Team Capacity: 85% utilized",
                 "Engineering Manager: Alex Kim",
                 "Tech Lead: David Park"
-            ]
-        else:
-            task.output = [
-                "Project: Not specified",
-                "Unable to retrieve specific project context",
-                "General organizational context available"
-            ]
+            )
+        return (
+            "Project: Not specified",
+            "Unable to retrieve specific project context",
+            "General organizational context available"
+        )
 
+
+class KnowledgeCache:
+    """
+    In-process LRU cache with TTL in front of a KnowledgeBackend, keyed by project.
+    Concurrent misses for the same project wait on a single backend fetch; a
+    failed fetch is raised to every waiter and nothing is cached.
+    """
+
+    def __init__(self, backend: Optional[KnowledgeBackend] = None, max_entries: int = 1024,
+                 ttl: Optional[float] = 300.0, clock: Callable[[], float] = time.monotonic):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.backend = backend or StaticKnowledgeBackend()
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries: "OrderedDict[Any, Tuple[float, Tuple[str, ...]]]" = OrderedDict()
+        self._pending: Dict[Any, Future] = {}
+        self._listeners: List[Callable[[Any], None]] = []
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+
+    def get(self, project: Any) -> Tuple[str, ...]:
+        """Project context lines, from the cache when fresh"""
+        stats = self._stats
+        with self._lock:
+            entry = self._entries.get(project)
+            if entry is not None:
+                if self.ttl is None or self.clock() - entry[0] < self.ttl:
+                    self._entries.move_to_end(project)
+                    stats.hits += 1
+                    return entry[1]
+                del self._entries[project]
+                stats.expirations += 1
+            pending = self._pending.get(project)
+            if pending is None:
+                stats.misses += 1
+                pending = self._pending[project] = Future()
+                return_pending = False
+            else:
+                stats.coalesced += 1
+                return_pending = True
+        if return_pending:
+            # Another thread is already fetching this project
+            return pending.result()
+        return self._load(project, pending)
+
+    def _load(self, project: Any, pending: Future) -> Tuple[str, ...]:
+        try:
+            lines = tuple(self.backend.fetch(project))
+        except BaseException as exc:
+            try:
+                with self._lock:
+                    # Leave a newer fetch started after an invalidation in place
+                    if self._pending.get(project) is pending:
+                        del self._pending[project]
+            finally:
+                pending.set_exception(exc)
+            raise
+        with self._lock:
+            # An invalidation during the fetch drops the pending entry; do not
+            # cache a value that may already be stale
+            if self._pending.get(project) is pending:
+                del self._pending[project]
+                self._entries[project] = (self.clock(), lines)
+                self._entries.move_to_end(project)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self._stats.evictions += 1
+        pending.set_result(lines)
+        return lines
+
+    def invalidate(self, project: Any):
+        """Drop a project's cached context and notify invalidation listeners"""
+        with self._lock:
+            dropped = self._entries.pop(project, None) is not None
+            dropped = self._pending.pop(project, None) is not None or dropped
+            if dropped:
+                self._stats.invalidations += 1
+            listeners = list(self._listeners)
+        for listener in listeners:
+            listener(project)
+
+    def clear(self):
+        """Drop every cached project"""
+        with self._lock:
+            projects = list(self._entries)
+            self._entries.clear()
+            self._pending.clear()
+            self._stats.invalidations += len(projects)
+            listeners = list(self._listeners)
+        for project in projects:
+            for listener in listeners:
+                listener(project)
+
+    def add_invalidation_listener(self, listener: Callable[[Any], None]):
+        """Call listener(project) whenever a project's context is invalidated"""
+        with self._lock:
+            self._listeners.append(listener)
+
+    def stats(self) -> CacheStats:
+        """Snapshot of hit/miss counters"""
+        with self._lock:
+            snapshot = CacheStats(**{name: getattr(self._stats, name) for name in CacheStats.__slots__})
+            snapshot.size = len(self._entries)
+        return snapshot
+
+
+# Shared by every orchestrator in the process
+KNOWLEDGE_CACHE = KnowledgeCache()
+
+
+def set_knowledge_backend(backend: KnowledgeBackend, max_entries: int = 1024,
+                          ttl: Optional[float] = 300.0) -> KnowledgeCache:
+    """
+    Replace the project knowledge source; returns the new (empty) cache.
+    Invalidation listeners move to the new cache, and every project the old
+    one held is invalidated, since its context came from the old backend.
+    """
+    global KNOWLEDGE_CACHE
+    previous = KNOWLEDGE_CACHE
+    cache = KnowledgeCache(backend, max_entries=max_entries, ttl=ttl)
+    with previous._lock:
+        cache._listeners = list(previous._listeners)
+    KNOWLEDGE_CACHE = cache
+    previous.clear()
+    return cache
+
+
+class L3Agent:
+    """L3 Agent - Executes specific tasks"""
+
+    @staticmethod
+    def execute_cross_cutting(task: Task, message: Dict) -> Task:
+        """Execute cross-cutting agent tasks"""
+        handler = CROSS_CUTTING_HANDLERS.get(task.target)
+        if handler is None:
+            return task
+        return handler(task, message)
+
+    @staticmethod
+    def _execute_knowledge_retrieval(task: Task, message: Dict) -> Task:
+        """Retrieve knowledge from database"""
+        task.output = KNOWLEDGE_CACHE.get(message.get("project", "N/A"))
         return task
 
     @staticmethod
-    def _execute_evaluation(task: Task) -> Task:
+    def _execute_evaluation(task: Task, message: Dict) -> Task:
         """Evaluate output quality"""
         task.output = [
             "Relevance: PASS",
@@ -647,97 +1910,2593 @@ class L3Agent:
         return task
 
 
+CROSS_CUTTING_HANDLERS = {
+    L3_TARGETS[AgentId.KNOWLEDGE_RETRIEVAL]: L3Agent._execute_knowledge_retrieval,
+    L3_TARGETS[AgentId.EVALUATION]: L3Agent._execute_evaluation
+}
+
+
+# Live meetings: transcripts processed incrementally as they stream in
+MEETING_BLOCKER_KEYWORDS = ("blocked", "blocker", "stuck", "down", "bug")
+MEETING_ACTION_KEYWORDS = ("let's", "need to", "will ", "todo", "action:", "please", "follow up")
+
+
+def _counted(count: int, noun: str) -> str:
+    """'1 blocker', '2 blockers'"""
+    return f"{count} {noun}" if count == 1 else f"{count} {noun}s"
+
+
+@dataclass(slots=True)
+class MeetingMinutes:
+    """Running extraction state of a meeting; read at meeting end without touching the transcript"""
+    meeting_id: str
+    speakers: Dict[str, int] = field(default_factory=dict)  # speaker -> turns, in order of first turn
+    action_items: List[Tuple[str, str]] = field(default_factory=list)  # (speaker, line)
+    blockers: List[Tuple[str, str]] = field(default_factory=list)
+    deliverables: List[Tuple[str, str]] = field(default_factory=list)
+    flagged: List[str] = field(default_factory=list)  # "Speaker: line" for every extracted line
+    turns: int = 0
+    hits: Optional[KeywordHits] = None  # planner and extractor keywords of the transcript, set by end()
+
+    def summary_lines(self) -> List[str]:
+        return [
+            "Meeting summary generated:",
+            f"• {_counted(len(self.speakers), 'speaker')} identified",
+            f"• {_counted(len(self.action_items), 'action item')} extracted",
+            f"• {_counted(len(self.blockers), 'blocker')} identified",
+            f"• {_counted(len(self.deliverables), 'deliverable')} committed"
+        ]
+
+    def report_lines(self) -> List[str]:
+        return [
+            "Meeting Report Generated:",
+            f"• Attendees: {len(self.speakers)}",
+            f"• Key Discussion Points: {'; '.join(line.rstrip('.') for _, line in self.blockers[:3]) or 'None recorded'}",
+            f"• Action Items: {len(self.action_items)} assigned",
+            f"• Next Steps: {'; '.join(line.rstrip('.') for _, line in self.action_items[:3]) or 'None recorded'}"
+        ]
+
+
+class MeetingSession:
+    """
+    Incremental processing of one live meeting transcript. feed() takes raw
+    transcript chunks, split anywhere (a line cut at a chunk boundary is held
+    until its end arrives); add_turn() takes one speaker turn. Only the new
+    text is scanned, and the rolling MeetingMinutes are always current.
+    Each complete line is also checked for the planner and extraction rule
+    keywords not yet seen, so end() hands over the transcript with its
+    keyword hits already recorded.
+    """
+
+    def __init__(self, meeting_id: str, project: Optional[str] = None, sender: Optional[Dict] = None):
+        self.minutes = MeetingMinutes(meeting_id)
+        self.project = project
+        self.sender = sender or {"name": "Meeting Bot", "role": "System"}
+        self._partial = ""
+        self._speaker = "Unknown"
+        self._lines: List[str] = []
+        # Keywords never span lines, so a complete line is all a check needs
+        self._vocabulary = tuple(keyword for keyword in dict.fromkeys(KEYWORD_VOCABULARY + EXTRACTION_RULES.keywords)
+                                 if "\n" not in keyword)
+        self._unseen = set(self._vocabulary)
+
+    def feed(self, chunk: str):
+        """Process a transcript chunk of "Speaker: text" lines"""
+        lines = (self._partial + chunk).split("\n")
+        self._partial = lines.pop()
+        for line in lines:
+            self._add_line(line)
+
+    def add_turn(self, speaker: str, text: str):
+        """Process one already-separated speaker turn"""
+        speaker = speaker.strip() or self._speaker
+        self._scan(f"{speaker}: {text}")
+        self._record(speaker, text.strip())
+
+    def _scan(self, line: str):
+        self._lines.append(line)
+        if self._unseen:
+            lowered = line.lower()
+            self._unseen.difference_update([keyword for keyword in self._unseen if keyword in lowered])
+
+    def _add_line(self, line: str):
+        self._scan(line)
+        speaker, sep, text = line.partition(":")
+        if sep and speaker and len(speaker) <= 40 and len(speaker.split()) <= 3:
+            self._record(speaker.strip(), text.strip())
+        elif line.strip():
+            # Continuation of the previous speaker's turn
+            self._record(self._speaker, line.strip())
+
+    def _record(self, speaker: str, text: str):
+        minutes = self.minutes
+        self._speaker = speaker
+        minutes.turns += 1
+        minutes.speakers[speaker] = minutes.speakers.get(speaker, 0) + 1
+        lowered = text.lower()
+        flagged = False
+        if any(keyword in lowered for keyword in MEETING_BLOCKER_KEYWORDS):
+            minutes.blockers.append((speaker, text))
+            flagged = True
+        if any(keyword in lowered for keyword in MEETING_ACTION_KEYWORDS):
+            minutes.action_items.append((speaker, text))
+            flagged = True
+        if any(keyword in lowered for keyword in COMPLETION_KEYWORDS):
+            minutes.deliverables.append((speaker, text))
+            flagged = True
+        if flagged:
+            minutes.flagged.append(f"{speaker}: {text}")
+
+    def end(self) -> Dict:
+        """
+        Flush any unterminated last line and return the meeting as a message
+        whose content is the whole transcript. The minutes ride along with
+        the keyword hits recorded while it streamed in, so planning and
+        extraction see the full text without scanning it again.
+        """
+        if self._partial:
+            line, self._partial = self._partial, ""
+            self._add_line(line)
+        minutes = self.minutes
+        content = "\n".join(self._lines)
+        minutes.hits = KeywordHits(content)
+        minutes.hits.record(self._vocabulary, [keyword not in self._unseen for keyword in self._vocabulary])
+        return {
+            "message_id": minutes.meeting_id,
+            "source": "meeting",
+            "sender": self.sender,
+            "content": content,
+            "project": self.project,
+            "minutes": minutes
+        }
+
+
+class LiveMeetings:
+    """Rolling state for every meeting in progress, keyed by meeting ID"""
+
+    def __init__(self):
+        self._sessions: Dict[str, MeetingSession] = {}
+        self._lock = threading.Lock()
+
+    def session(self, meeting_id: str, project: Optional[str] = None) -> MeetingSession:
+        with self._lock:
+            session = self._sessions.get(meeting_id)
+            if session is None:
+                session = self._sessions[meeting_id] = MeetingSession(meeting_id, project)
+            return session
+
+    def feed(self, meeting_id: str, chunk: str, project: Optional[str] = None):
+        self.session(meeting_id, project).feed(chunk)
+
+    def add_turn(self, meeting_id: str, speaker: str, text: str, project: Optional[str] = None):
+        self.session(meeting_id, project).add_turn(speaker, text)
+
+    def end(self, meeting_id: str) -> Dict:
+        """Close a meeting and return its message for NionOrchestrator.process_message"""
+        with self._lock:
+            session = self._sessions.pop(meeting_id)
+        return session.end()
+
+
+# IDs unique across threads and worker processes, without a lock
+class IdGenerator:
+    """
+    Snowflake-layout 64-bit IDs: milliseconds since EPOCH_MS when the ID
+    space started (41 bits), a worker number (10 bits, the pid unless given)
+    and a 12-bit sequence. The sequence is an itertools.count, whose next()
+    is atomic, so threads never contend; past 4096 IDs it carries into the
+    timestamp, which stays ahead of other processes' spaces as long as a
+    process averages fewer than 4096 IDs per millisecond. Forked children
+    start a new space with their own pid.
+    """
+
+    EPOCH_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+    WORKER_BITS = 10
+    SEQUENCE_BITS = 12
+
+    __slots__ = ("_base", "_sequence")
+
+    def __init__(self, worker: Optional[int] = None):
+        self.reset(worker)
+
+    def reset(self, worker: Optional[int] = None):
+        """Start a new ID space now, for worker (default: this process's pid)"""
+        if worker is None:
+            worker = os.getpid()
+        start = time.time_ns() // 1_000_000 - self.EPOCH_MS
+        worker &= (1 << self.WORKER_BITS) - 1
+        self._base = (start << (self.WORKER_BITS + self.SEQUENCE_BITS)) | (worker << self.SEQUENCE_BITS)
+        self._sequence = itertools.count()
+
+    def next_int(self) -> int:
+        sequence = next(self._sequence)
+        # Overflow of the low 12 bits moves on to the next millisecond, above the worker bits
+        return (self._base + ((sequence >> self.SEQUENCE_BITS) << (self.WORKER_BITS + self.SEQUENCE_BITS))
+                + (sequence & ((1 << self.SEQUENCE_BITS) - 1)))
+
+    def next_id(self) -> str:
+        return f"{self.next_int():016x}"
+
+
+ID_GENERATOR = IdGenerator()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=ID_GENERATOR.reset)
+
+
+# Instrumentation: spans around every stage, task and subtask, plus metrics
+class Span:
+    """One timed operation: a message, a stage (plan/execute/format), a task or a subtask"""
+
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(self, name: str, trace_id: int, span_id: int, parent_id: Optional[int], attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = span_id
+        self.parent_id = parent_id
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self.end_ns = 0
+        self.start_ns = time.perf_counter_ns()
+
+    @property
+    def duration(self) -> float:
+        """Seconds, from the monotonic clock"""
+        return (self.end_ns - self.start_ns) / 1e9
+
+
+class SpanExporter:
+    """Receives every finished span; export() is called on the thread that ran it"""
+
+    def export(self, span: Span):
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class LogSpanExporter(SpanExporter):
+    """Logs one line per finished span"""
+
+    def __init__(self, logger: Optional[logging.Logger] = None, level: int = logging.DEBUG):
+        self.logger = logger or logging.getLogger("nion.trace")
+        self.level = level
+
+    def export(self, span: Span):
+        if self.logger.isEnabledFor(self.level):
+            attributes = " ".join(f"{key}={value}" for key, value in span.attributes.items())
+            self.logger.log(self.level, "%s %.3fms %s%s", span.name, span.duration * 1e3, attributes,
+                            f" error={span.error}" if span.error else "")
+
+
+class FileSpanExporter(SpanExporter):
+    """
+    Writes spans as OpenTelemetry-style JSON lines (traceId, spanId,
+    parentSpanId, start/end unix nanoseconds, attributes) to a local file
+    """
+
+    def __init__(self, path: str):
+        self.stream = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        # Spans are timed on the monotonic clock; anchor it to wall time once
+        self._offset_ns = time.time_ns() - time.perf_counter_ns()
+
+    def export(self, span: Span):
+        record = {
+            "traceId": f"{span.trace_id:032x}",
+            "spanId": f"{span.span_id:016x}",
+            "parentSpanId": f"{span.parent_id:016x}" if span.parent_id else "",
+            "name": span.name,
+            "startTimeUnixNano": span.start_ns + self._offset_ns,
+            "endTimeUnixNano": span.end_ns + self._offset_ns,
+            "attributes": span.attributes,
+            "status": {"code": "ERROR", "message": span.error} if span.error else {"code": "OK"}
+        }
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self.stream.write(line)
+
+    def close(self):
+        with self._lock:
+            self.stream.close()
+
+
+class Histogram:
+    """Cumulative latency histogram in seconds, Prometheus style"""
+
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+
+LATENCY_BUCKETS = (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025,
+                   0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+class Instrumentation:
+    """
+    Tracing and metrics for an orchestrator. start()/end() bracket a span;
+    every finished span feeds a per-(span, agent) call counter, error counter
+    and latency histogram, then goes to each exporter. Orchestrators without
+    instrumentation skip all of this behind a single None check.
+    """
+
+    def __init__(self, exporters: Iterable[SpanExporter] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.exporters = list(exporters)
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._calls: Dict[Tuple[str, str], int] = {}
+        self._errors: Dict[Tuple[str, str], int] = {}
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+
+    def start(self, name: str, parent: Optional[Span] = None, **attributes) -> Span:
+        # Unique across processes, so spans from several workers can share a collector
+        span_id = ID_GENERATOR.next_int()
+        trace_id = parent.trace_id if parent is not None else span_id
+        return Span(name, trace_id, span_id, parent.span_id if parent is not None else None, attributes)
+
+    def end(self, span: Span, error: Optional[BaseException] = None):
+        span.end_ns = time.perf_counter_ns()
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        key = (span.name, span.attributes.get("agent", ""))
+        with self._lock:
+            self._calls[key] = self._calls.get(key, 0) + 1
+            if error is not None:
+                self._errors[key] = self._errors.get(key, 0) + 1
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(self.buckets)
+            histogram.observe(span.duration)
+        for exporter in self.exporters:
+            exporter.export(span)
+
+    def counters(self) -> Dict[Tuple[str, str], int]:
+        """Finished spans per (span name, agent)"""
+        with self._lock:
+            return dict(self._calls)
+
+    def prometheus_text(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines = [
+            "# HELP nion_calls_total Finished stages, tasks and subtasks",
+            "# TYPE nion_calls_total counter"
+        ]
+        with self._lock:
+            calls = sorted(self._calls.items())
+            errors = sorted(self._errors.items())
+            histograms = sorted((key, (list(h.counts), h.total, h.count)) for key, h in self._histograms.items())
+        lines.extend(f"nion_calls_total{{{_labels(key)}}} {value}" for key, value in calls)
+        lines += ["# HELP nion_errors_total Stages, tasks and subtasks that raised",
+                  "# TYPE nion_errors_total counter"]
+        lines.extend(f"nion_errors_total{{{_labels(key)}}} {value}" for key, value in errors)
+        lines += ["# HELP nion_duration_seconds Latency of stages, tasks and subtasks",
+                  "# TYPE nion_duration_seconds histogram"]
+        for key, (counts, total, count) in histograms:
+            labels = _labels(key)
+            cumulative = 0
+            for bound, bucket in zip((*self.buckets, "+Inf"), counts):
+                cumulative += bucket
+                lines.append(f'nion_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f"nion_duration_seconds_sum{{{labels}}} {total}")
+            lines.append(f"nion_duration_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        for exporter in self.exporters:
+            exporter.close()
+
+
+def _labels(key: Tuple[str, str]) -> str:
+    span, agent = key
+    return f'span="{span}",agent="{agent}"'
+
+
+class PlanCycleError(ValueError):
+    """Raised when the depends_on edges of a plan form a cycle"""
+
+
+class PlanScheduler:
+    """
+    Dependency-aware ready queue over a plan's Task.depends_on edges.
+    Validates the plan up front (unknown dependencies, cycles); executors then
+    pull ready tasks and report completions to release their dependents.
+    """
+
+    def __init__(self, plan: List[Task]):
+        self.tasks = {task.task_id: task for task in plan}
+        self._position = {task.task_id: i for i, task in enumerate(plan)}
+        self._pending = {task.task_id: len(task.depends_on) for task in plan}
+        self._dependents: Dict[str, List[str]] = {task.task_id: [] for task in plan}
+
+        for task in plan:
+            for dependency in task.depends_on:
+                if dependency not in self.tasks:
+                    raise ValueError(f"{task.task_id} depends on unknown task {dependency}")
+                self._dependents[dependency].append(task.task_id)
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[Task]:
+        """Kahn's algorithm; ties are broken by plan position so serial runs keep plan order"""
+        pending = dict(self._pending)
+        ready = [self._position[task_id] for task_id, count in pending.items() if count == 0]
+        heapq.heapify(ready)
+        plan = list(self.tasks.values())
+        order = []
+
+        while ready:
+            task = plan[heapq.heappop(ready)]
+            order.append(task)
+            for dependent in self._dependents[task.task_id]:
+                pending[dependent] -= 1
+                if pending[dependent] == 0:
+                    heapq.heappush(ready, self._position[dependent])
+
+        if len(order) != len(plan):
+            cyclic = sorted(task_id for task_id, count in pending.items() if count > 0)
+            raise PlanCycleError(f"Dependency cycle among tasks: {', '.join(cyclic)}")
+        return order
+
+    def ready(self) -> List[Task]:
+        """Tasks with no dependencies, in plan order"""
+        return [task for task in self.order if self._pending[task.task_id] == 0]
+
+    def complete(self, task: Task) -> List[Task]:
+        """Mark a task finished and return the dependents it released"""
+        released = []
+        for dependent in self._dependents[task.task_id]:
+            self._pending[dependent] -= 1
+            if self._pending[dependent] == 0:
+                released.append(self.tasks[dependent])
+        return released
+
+
+class SerialExecutor:
+    """Runs plan tasks one at a time in topological order"""
+
+    def run(self, plan: List[Task], run_task: Callable[[Task], Any]) -> Dict[str, Any]:
+        # L1 emits dependencies before dependents, so the usual plan is already
+        # ordered; only build the full scheduler when it is not
+        seen: Set[str] = set()
+        for task in plan:
+            if not seen.issuperset(task.depends_on):
+                return {task.task_id: run_task(task) for task in PlanScheduler(plan).order}
+            seen.add(task.task_id)
+        return {task.task_id: run_task(task) for task in plan}
+
+
+class ThreadPoolPlanExecutor:
+    """Runs independent plan tasks concurrently on a thread pool"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="nion-plan")
+
+    def run(self, plan: List[Task], run_task: Callable[[Task], Any]) -> Dict[str, Any]:
+        scheduler = PlanScheduler(plan)
+        results: Dict[str, Any] = {}
+        running = {self.pool.submit(run_task, task): task for task in scheduler.ready()}
+
+        try:
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    results[task.task_id] = future.result()
+                    for released in scheduler.complete(task):
+                        running[self.pool.submit(run_task, released)] = released
+        finally:
+            for future in running:
+                future.cancel()
+
+        return results
+
+    def shutdown(self, wait_for_tasks: bool = True):
+        self.pool.shutdown(wait=wait_for_tasks)
+
+
+class AsyncioPlanExecutor:
+    """
+    Runs independent plan tasks concurrently on an asyncio event loop.
+    run_task may be a coroutine function; plain callables are moved to a
+    worker thread so they do not block the loop.
+    """
+
+    async def run_async(self, plan: List[Task], run_task: Callable[[Task], Any]) -> Dict[str, Any]:
+        scheduler = PlanScheduler(plan)
+        is_async = inspect.iscoroutinefunction(run_task)
+        results: Dict[str, Any] = {}
+
+        def start(task: Task) -> asyncio.Future:
+            if is_async:
+                return asyncio.ensure_future(run_task(task))
+            return asyncio.ensure_future(asyncio.to_thread(run_task, task))
+
+        running = {start(task): task for task in scheduler.ready()}
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    task = running.pop(future)
+                    results[task.task_id] = future.result()
+                    for released in scheduler.complete(task):
+                        running[start(released)] = released
+        finally:
+            for future in running:
+                future.cancel()
+
+        return results
+
+    def run(self, plan: List[Task], run_task: Callable[[Task], Any]) -> Dict[str, Any]:
+        return asyncio.run(self.run_async(plan, run_task))
+
+
+@dataclass(slots=True)
+class OrchestrationResult:
+    """
+    Plan, executed tasks and typed extraction records for one message.
+    The orchestration map text is only rendered when first asked for.
+    Task IDs are per message; run_id tells runs apart across threads and
+    workers, and f"{run_id}/{task_id}" is globally unique.
+    """
+    message: Dict
+    plan: List[Task]
+    executed_tasks: List[Task]
+    run_id: str = field(default_factory=ID_GENERATOR.next_id, compare=False)
+    _text: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+
+    @property
+    def text(self) -> str:
+        """The orchestration map, rendered lazily and cached"""
+        if self._text is None:
+            self._text = render_orchestration_map(self.message, self.plan, self.executed_tasks)
+        return self._text
+
+    def write(self, stream: TextIO):
+        """Write the orchestration map to stream, straight from the template unless already rendered"""
+        if self._text is not None:
+            stream.write(self._text)
+        else:
+            emit_orchestration_map(stream.write, self.message, self.plan, self.executed_tasks)
+
+    def __str__(self) -> str:
+        return self.text
+
+    @property
+    def records(self) -> List[ExtractionRecord]:
+        return [record for task in self.executed_tasks for subtask in task.subtasks for record in subtask.records]
+
+    @property
+    def action_items(self) -> List[ActionItem]:
+        return [record for record in self.records if isinstance(record, ActionItem)]
+
+    @property
+    def risks(self) -> List[Risk]:
+        return [record for record in self.records if isinstance(record, Risk)]
+
+    @property
+    def issues(self) -> List[Issue]:
+        return [record for record in self.records if isinstance(record, Issue)]
+
+    @property
+    def decisions(self) -> List[Decision]:
+        return [record for record in self.records if isinstance(record, Decision)]
+
+    def to_dict(self) -> Dict:
+        """Plain JSON-compatible structure; does not render the orchestration map"""
+        records: Dict[str, List[Dict]] = {"action_items": [], "risks": [], "issues": [], "decisions": []}
+        for record in self.records:
+            records[_RECORD_KEYS[type(record)]].append(record.to_dict())
+
+        return {
+            "message_id": self.message.get("message_id"),
+            "project": self.message.get("project"),
+            "plan": [
+                {
+                    "task_id": task.task_id,
+                    "target": task.target,
+                    "purpose": task.purpose,
+                    "depends_on": list(task.depends_on),
+                    "is_cross_cutting": task.is_cross_cutting
+                }
+                for task in self.plan
+            ],
+            "executed_tasks": [_executed_task_dict(task) for task in self.executed_tasks],
+            "records": records
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False)
+
+    def to_json_bytes(self) -> bytes:
+        """UTF-8 JSON, using orjson when it is installed"""
+        if orjson is not None:
+            return orjson.dumps(self.to_dict())
+        return self.to_json().encode("utf-8")
+
+
+_RECORD_KEYS = {ActionItem: "action_items", Risk: "risks", Issue: "issues", Decision: "decisions"}
+
+
+def _executed_task_dict(task: Task) -> Dict:
+    executed = {"task_id": task.task_id, "target": task.target, "status": task.status, "output": list(task.output)}
+    if task.subtasks:
+        executed["subtasks"] = [_executed_task_dict(subtask) for subtask in task.subtasks]
+    return executed
+
+
+def _copy_tasks(plan: List[Task], executed_tasks: List[Task]) -> Tuple[List[Task], List[Task]]:
+    """Copy a plan and its executed tasks; task IDs are per message, so they carry over unchanged"""
+    def copy(task: Task) -> Task:
+        return Task(task.task_id, task.target, task.purpose, list(task.depends_on) if task.depends_on else (),
+                    [copy(subtask) for subtask in task.subtasks] or (), task.status, task.output,
+                    task.is_cross_cutting, task.records)
+
+    copies = {task.task_id: copy(task) for task in plan}
+    return list(copies.values()), [copies[task.task_id] for task in executed_tasks]
+
+
+_RECORD_TYPES = {key: record_type for record_type, key in _RECORD_KEYS.items()}
+
+
+def _task_to_json(task: Task) -> Dict:
+    """A task, its subtasks and typed records as plain JSON (records via their to_dict())"""
+    data = {"task_id": task.task_id, "target": task.target, "purpose": task.purpose,
+            "depends_on": list(task.depends_on), "status": task.status, "output": list(task.output),
+            "is_cross_cutting": task.is_cross_cutting}
+    if task.subtasks:
+        data["subtasks"] = [_task_to_json(subtask) for subtask in task.subtasks]
+    if task.records:
+        data["records"] = [[_RECORD_KEYS[type(record)], record.to_dict()] for record in task.records]
+    return data
+
+
+def _task_from_json(data: Dict) -> Task:
+    records = []
+    for kind, fields in data.get("records", ()):
+        fields = dict(fields)
+        item_id = fields.pop("id")
+        if "flags" in fields:
+            fields["flags"] = tuple(fields["flags"])
+        records.append(_RECORD_TYPES[kind](item_id, **fields))
+    return Task(data["task_id"], data["target"], data["purpose"], data["depends_on"] or (),
+                [_task_from_json(subtask) for subtask in data.get("subtasks", ())] or (),
+                data["status"], data["output"] or (), data["is_cross_cutting"], records or ())
+
+
+class ResultCache:
+    """
+    Orchestration results keyed by a stable hash of what they depend on:
+    content, source, project and sender (role, and name, which the delivery
+    agent addresses), plus the extraction rules' fingerprint and
+    FORMAT_VERSION, so a rule reload or a new layout never serves old
+    results. Task IDs are per message, so a cached result reads exactly like
+    a recomputed one, header included; hits return copies.
+
+    Memory holds max_entries results in LRU order. With a path, every result
+    is also written to a SQLite file that survives restarts and refills the
+    memory tier on a miss; rows are JSON, so the file holds data only.
+    Results expire after ttl seconds, capped at the knowledge cache's TTL
+    (and equal to it when ttl is None), so they never outlive the project
+    context they were computed from. invalidate_project() drops a project's
+    results at once; wire it to the KnowledgeCache listener.
+    """
+
+    # Bump when the cached plan/task layout changes
+    FORMAT_VERSION = 1
+
+    def __init__(self, max_entries: int = 10000, path: Optional[str] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.time):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl = ttl
+        # Wall time, since disk rows outlive the process
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[str, float, List[Task], List[Task]]]" = OrderedDict()
+        self._projects: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self._stats = CacheStats()
+        self._conn = None
+        if path is not None:
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, project TEXT, value BLOB)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_project ON results (project)")
+            self._conn.commit()
+
+    @classmethod
+    def key(cls, message: Dict) -> str:
+        sender = message.get("sender") or {}
+        fields = [message.get("content", ""), message.get("source", ""), message.get("project"),
+                  sender.get("role"), sender.get("name"), EXTRACTION_RULES.fingerprint, cls.FORMAT_VERSION]
+        return hashlib.sha256(json.dumps(fields, ensure_ascii=False).encode()).hexdigest()
+
+    def max_age(self) -> Optional[float]:
+        """Seconds a result stays valid: ttl capped at the current knowledge cache's TTL; None never expires"""
+        knowledge_ttl = KNOWLEDGE_CACHE.ttl
+        if self.ttl is None:
+            return knowledge_ttl
+        return self.ttl if knowledge_ttl is None else min(self.ttl, knowledge_ttl)
+
+    def get(self, key: str) -> Optional[Tuple[List[Task], List[Task]]]:
+        """Copies of (plan, executed tasks), or None on a miss"""
+        max_age = self.max_age()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute("SELECT project, value FROM results WHERE key = ?", (key,)).fetchone()
+                if row is not None:
+                    entry = self._load(row[0], row[1])
+                    if entry is not None:
+                        self._remember(key, entry)
+            if entry is not None and max_age is not None and self.clock() - entry[1] >= max_age:
+                self._forget(key, entry[0])
+                self._stats.expirations += 1
+                entry = None
+            if entry is None:
+                self._stats.misses += 1
+                return None
+            self._stats.hits += 1
+        return _copy_tasks(entry[2], entry[3])
+
+    def put(self, key: str, result: "OrchestrationResult"):
+        project = result.message.get("project") or "N/A"
+        plan, executed_tasks = _copy_tasks(result.plan, result.executed_tasks)
+        entry = (project, self.clock(), plan, executed_tasks)
+        with self._lock:
+            self._remember(key, entry)
+            if self._conn is not None:
+                value = json.dumps({"created": entry[1], "plan": [_task_to_json(task) for task in plan],
+                                    "executed": [task.task_id for task in executed_tasks]}, ensure_ascii=False)
+                self._conn.execute("INSERT OR REPLACE INTO results (key, project, value) VALUES (?, ?, ?)",
+                                   (key, project, value))
+                self._conn.commit()
+
+    @staticmethod
+    def _load(project: str, value: Union[str, bytes]) -> Optional[Tuple[str, float, List[Task], List[Task]]]:
+        """A disk row as a memory entry; rows that are not valid JSON results count as misses"""
+        try:
+            data = json.loads(value)
+            plan = [_task_from_json(task) for task in data["plan"]]
+            by_id = {task.task_id: task for task in plan}
+            return project, float(data["created"]), plan, [by_id[task_id] for task_id in data["executed"]]
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def _remember(self, key: str, entry: Tuple[str, float, List[Task], List[Task]]):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        self._projects.setdefault(entry[0], set()).add(key)
+        while len(self._entries) > self.max_entries:
+            evicted, (project, _, _, _) = self._entries.popitem(last=False)
+            self._projects[project].discard(evicted)
+            self._stats.evictions += 1
+
+    def _forget(self, key: str, project: str):
+        del self._entries[key]
+        self._projects[project].discard(key)
+        if self._conn is not None:
+            self._conn.execute("DELETE FROM results WHERE key = ?", (key,))
+            self._conn.commit()
+
+    def invalidate_project(self, project: Optional[str]):
+        """Drop every cached result for a project, in memory and on disk"""
+        project = project or "N/A"
+        with self._lock:
+            keys = self._projects.pop(project, set())
+            for key in keys:
+                self._entries.pop(key, None)
+            self._stats.invalidations += len(keys)
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results WHERE project = ?", (project,))
+                self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._projects.clear()
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM results")
+                self._conn.commit()
+
+    def stats(self) -> CacheStats:
+        with self._lock:
+            snapshot = CacheStats(**{name: getattr(self._stats, name) for name in CacheStats.__slots__})
+            snapshot.size = len(self._entries)
+        return snapshot
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+
+
+# Orchestration map layout: the banners are assembled once and each task is
+# one multi-line fragment, so a map takes a few dozen writes instead of one
+# per line
+MAP_RULE = "=" * 80
+MAP_HEADER = f"{MAP_RULE}\nNION ORCHESTRATION MAP\n{MAP_RULE}\nMessage: "
+MAP_PLAN_BANNER = f"\n\n{MAP_RULE}\nL1 PLAN\n{MAP_RULE}\n"
+MAP_EXECUTION_BANNER = f"{MAP_RULE}\nL2/L3 EXECUTION\n{MAP_RULE}\n\n"
+
+
+def emit_orchestration_map(write: Callable[[str], Any], message: Dict, plan: List[Task], executed_tasks: List[Task]):
+    """Pass the orchestration map to write() in fragments; the text ends without a newline"""
+    sender = message.get("sender", {})
+    write(f"{MAP_HEADER}{message.get('message_id', 'N/A')}\n"
+          f"From: {sender.get('name', 'Unknown')} ({sender.get('role', 'Unknown')})\n"
+          f"Project: {message.get('project', 'N/A')}{MAP_PLAN_BANNER}")
+
+    for task in plan:
+        label = " (Cross-Cutting)" if task.is_cross_cutting else ""
+        if task.depends_on:
+            write(f"[{task.task_id}] → {task.target}{label}\nPurpose: {task.purpose}\n"
+                  f"Depends On: {', '.join(task.depends_on)}\n\n")
+        else:
+            write(f"[{task.task_id}] → {task.target}{label}\nPurpose: {task.purpose}\n\n")
+
+    write(MAP_EXECUTION_BANNER)
+    for task in executed_tasks:
+        if task.subtasks:
+            # L2 task with L3 subtasks
+            write(f"[{task.task_id}] {task.target}\n")
+            for subtask in task.subtasks:
+                write(f"└─▶ [{subtask.task_id}] {subtask.target}\n    Status: {subtask.status}\n    Output:\n")
+                if subtask.output:
+                    write("    • " + "\n    • ".join(subtask.output) + "\n")
+        else:
+            # Cross-cutting L3 task
+            label = " (Cross-Cutting)" if task.is_cross_cutting else ""
+            write(f"[{task.task_id}] {task.target}{label}\nStatus: {task.status}\nOutput:\n")
+            if task.output:
+                write("• " + "\n• ".join(task.output) + "\n")
+        write("\n")
+
+    write(MAP_RULE)
+
+
+def render_orchestration_map(message: Dict, plan: List[Task], executed_tasks: List[Task]) -> str:
+    """The orchestration map as one string"""
+    buffer: List[str] = []
+    emit_orchestration_map(buffer.append, message, plan, executed_tasks)
+    return "".join(buffer)
+
+
 class NionOrchestrator:
     """Main Nion Orchestration Engine"""
 
-    def __init__(self):
+    def __init__(self, executor=None, tracking: Optional[TrackingStore] = None,
+                 instrumentation: Optional[Instrumentation] = None, result_cache: Optional[ResultCache] = None,
+                 delivery: Optional["DeliveryService"] = None):
         self.l1 = L1Orchestrator()
+        # Any object with run(plan, run_task) -> {task_id: result}; see SerialExecutor
+        self.executor = executor or SerialExecutor()
+        # Persistent action item/risk/issue/decision tracking; static tracking text when None
+        self.tracking = tracking
+        # Spans and metrics for every stage, task and subtask; off when None
+        self.instrumentation = instrumentation
+        # Results of previously seen (content, source, project, sender) messages;
+        # bypassed while a tracking store is set
+        self.result_cache = result_cache
+        # Background sender for responses; the delivery agent only reports SENT when None
+        self.delivery = delivery
+        # One coordinator per domain per thread, reused for every task and message
+        self._local = threading.local()
 
     def process_message(self, message: Dict) -> str:
         """Main entry point - processes a message and returns orchestration map"""
+        instrumentation = self.instrumentation
+        if instrumentation is None:
+            return self.render(self.orchestrate(message))
+
+        root = instrumentation.start("message", message_id=message.get("message_id"))
+        try:
+            result = self._cached(message, lambda: self._orchestrate_traced(message, root))
+            if self.delivery is not None:
+                self._deliver(result)
+            with self._stage("format", root):
+                text = self.render(result)
+        except BaseException as exc:
+            instrumentation.end(root, exc)
+            raise
+        instrumentation.end(root)
+        return text
+
+    def render(self, result: OrchestrationResult) -> str:
+        """Format an orchestration result as the orchestration map text"""
+        return result.text
+
+    def process_batch(self, messages: Iterable[Dict], structured: bool = False) -> List[Union[str, OrchestrationResult]]:
+        """Process many messages with shared L1/L2 state; see process_stream"""
+        return list(self.process_stream(messages, structured))
+
+    def process_stream(self, messages: Iterable[Dict], structured: bool = False) -> Iterator[Union[str, OrchestrationResult]]:
+        """
+        Lazily process messages one at a time, yielding orchestration maps,
+        or OrchestrationResult objects when structured=True (no rendering).
+        """
+        orchestrate = self.orchestrate
+        if structured:
+            for message in messages:
+                yield orchestrate(message)
+        else:
+            render = self.render
+            for message in messages:
+                yield render(orchestrate(message))
+
+    def orchestrate(self, message: Dict) -> OrchestrationResult:
+        """Plan and execute a message without formatting the output"""
+        instrumentation = self.instrumentation
+        if instrumentation is not None:
+            root = instrumentation.start("message", message_id=message.get("message_id"))
+            try:
+                result = self._cached(message, lambda: self._orchestrate_traced(message, root))
+            except BaseException as exc:
+                instrumentation.end(root, exc)
+                raise
+            instrumentation.end(root)
+        elif self.result_cache is not None:
+            result = self._cached(message, lambda: self._orchestrate(message))
+        else:
+            result = self._orchestrate(message)
+
+        if self.delivery is not None:
+            self._deliver(result)
+        return result
+
+    def _deliver(self, result: OrchestrationResult) -> Optional[Future]:
+        """Hand the formulated response to the delivery service; never waits for the send"""
+        message = result.message
+        channel = message.get("source", "")
+        if not self.delivery.supports(channel):
+            return None
+        qna = L3_TARGETS[AgentId.QNA]
+        responses = [line for task in result.executed_tasks for subtask in task.subtasks
+                     if subtask.target == qna for line in subtask.output]
+        if not responses:
+            return None
+        text = "\n\n".join(response.removeprefix('Response: "').removesuffix('"') for response in responses)
+        sender = message.get("sender") or {}
+        recipient = message.get("reply_to") or sender.get("email") or sender.get("name", "Unknown")
+        return self.delivery.submit(DeliveryRequest(channel, recipient, text, message.get("message_id") or result.run_id))
+
+    def _orchestrate(self, message: Dict) -> OrchestrationResult:
+        hits, plan = self.plan(message)
+        return self.execute_plan(message, plan, hits)
+
+    def _cache_key(self, message: Dict) -> Optional[str]:
+        """The result cache key for a message, or None when it must be computed"""
+        # Live meeting messages carry their own minutes; never reuse them. With
+        # a tracking store every message must reach the tracking agents (a
+        # repeat is an upsert that changes the output), so nothing is cached.
+        if self.result_cache is None or self.tracking is not None or "minutes" in message:
+            return None
+        return self.result_cache.key(message)
+
+    def _cached(self, message: Dict, compute: Callable[[], OrchestrationResult]) -> OrchestrationResult:
+        """Serve a message from the result cache, or compute and store it"""
+        key = self._cache_key(message)
+        if key is None:
+            return compute()
+        cache = self.result_cache
+        cached = cache.get(key)
+        if cached is None:
+            result = compute()
+            cache.put(key, result)
+            return result
+        plan, executed_tasks = cached
+        return OrchestrationResult(message, plan, executed_tasks)
+
+    def _orchestrate_traced(self, message: Dict, root: Span) -> OrchestrationResult:
+        with self._stage("plan", root):
+            hits, plan = self.plan(message)
+        with self._stage("execute", root) as stage:
+            results = self.executor.run(plan, lambda task: self._execute_task_traced(task, message, hits, stage))
+        executed_tasks = [results[task.task_id] for task in plan if results[task.task_id] is not None]
+        return OrchestrationResult(message, plan, executed_tasks)
+
+    @contextmanager
+    def _stage(self, name: str, root: Span) -> Iterator[Span]:
+        instrumentation = self.instrumentation
+        span = instrumentation.start(name, root)
+        try:
+            yield span
+        except BaseException as exc:
+            instrumentation.end(span, exc)
+            raise
+        instrumentation.end(span)
+
+    def _execute_task_traced(self, task: Task, message: Dict, hits: KeywordHits, parent: Span) -> Optional[Task]:
+        instrumentation = self.instrumentation
+        span = instrumentation.start("task", parent, task_id=task.task_id, agent=task.target)
+        try:
+            result = self._execute_task(task, message, hits, span)
+        except BaseException as exc:
+            instrumentation.end(span, exc)
+            raise
+        instrumentation.end(span)
+        return result
+
+    def plan(self, message: Dict) -> Tuple[KeywordHits, List[Task]]:
+        """L1 stage: scan the message once and build its execution plan"""
+
+        # Scan once; the plan and every agent share the same keyword hits
+        hits = KeywordHits.of(message)
 
         # L1: Analyze and plan
-        plan = self.l1.analyze_and_plan(message)
-
-        # L2/L3: Execute plan
-        executed_tasks = []
-        for task in plan:
-            if task.target.startswith("L2:"):
-                # L2 coordination
-                domain_str = task.target.split(":")[1]
-                domain = L2Domain[domain_str]
-                coordinator = L2Coordinator(domain)
-                executed_task = coordinator.execute(task, message)
-                executed_tasks.append(executed_task)
-            elif task.target.startswith("L3:") and task.is_cross_cutting:
-                # Cross-cutting L3 agent
-                executed_task = L3Agent.execute_cross_cutting(task, message)
-                executed_tasks.append(executed_task)
-
-        # Format output
-        return self._format_orchestration_map(message, plan, executed_tasks)
+        return hits, self.l1.analyze_and_plan(message, hits)
+
+    def execute_plan(self, message: Dict, plan: List[Task], hits: KeywordHits) -> OrchestrationResult:
+        """L2/L3 stage: execute a plan produced by plan()"""
+
+        # L2/L3: Execute plan in dependency order
+        results = self.executor.run(plan, lambda task: self._execute_task(task, message, hits))
+        executed_tasks = [results[task.task_id] for task in plan if results[task.task_id] is not None]
+
+        return OrchestrationResult(message, plan, executed_tasks)
+
+    def _execute_task(self, task: Task, message: Dict, hits: KeywordHits,
+                      span: Optional[Span] = None) -> Optional[Task]:
+        """Run a single plan task through its L2 coordinator or cross-cutting L3 agent"""
+        if task.target.startswith("L2:"):
+            # L2 coordination
+            domain = L2_DOMAINS.get(task.target) or L2Domain[task.target[3:]]
+            return self._coordinator(domain).execute(task, message, hits, span)
+        elif task.target.startswith("L3:") and task.is_cross_cutting:
+            # Cross-cutting L3 agent
+            return L3Agent.execute_cross_cutting(task, message)
+        return None
+
+    def _coordinator(self, domain: L2Domain) -> L2Coordinator:
+        coordinators = getattr(self._local, "coordinators", None)
+        if coordinators is None:
+            coordinators = self._local.coordinators = {
+                d: L2Coordinator(d, self.tracking, self.instrumentation, self.delivery) for d in L2Domain
+            }
+        return coordinators[domain]
 
     def _format_orchestration_map(self, message: Dict, plan: List[Task], executed_tasks: List[Task]) -> str:
         """Format the orchestration map output"""
-        output = []
-
-        # Header
-        output.append("=" * 80)
-        output.append("NION ORCHESTRATION MAP")
-        output.append("=" * 80)
-        output.append(f"Message: {message.get('message_id', 'N/A')}")
-        output.append(
-            f"From: {message.get('sender', {}).get('name', 'Unknown')} ({message.get('sender', {}).get('role', 'Unknown')})")
-        output.append(f"Project: {message.get('project', 'N/A')}")
-        output.append("")
-
-        # L1 Plan
-        output.append("=" * 80)
-        output.append("L1 PLAN")
-        output.append("=" * 80)
+        return render_orchestration_map(message, plan, executed_tasks)
+
+    def write_orchestration_map(self, result: OrchestrationResult, stream: TextIO):
+        """Write the orchestration map and a newline, without building the whole text"""
+        result.write(stream)
+        stream.write("\n")
+
+
+AsyncAgentHandler = Callable[[Task, Dict], Awaitable[Optional[Task]]]
+
+
+class AsyncNionOrchestrator:
+    """
+    Asyncio-native orchestration engine.
+    Planning, L2 coordination and rendering are shared with NionOrchestrator.
+    Agents with an async handler (e.g. knowledge_retrieval, message_delivery)
+    are awaited instead of their sync agent, with bounded concurrency per
+    agent type; the handler fills the subtask it is given. Sync agents in
+    blocking_agents (knowledge retrieval, and tracking when a store is set)
+    run in a thread; the other sync agents are CPU-only and run inline.
+    """
+
+    BLOCKING_AGENTS = frozenset((AgentId.KNOWLEDGE_RETRIEVAL,))
+    TRACKING_AGENTS = frozenset((AgentId.ACTION_ITEM_TRACKING, AgentId.RISK_TRACKING, AgentId.ISSUE_TRACKING,
+                                 AgentId.DECISION_EXTRACTION))
+
+    def __init__(self, handlers: Optional[Dict[str, AsyncAgentHandler]] = None,
+                 concurrency: Optional[Dict[str, int]] = None, default_concurrency: int = 64,
+                 engine: Optional[NionOrchestrator] = None, blocking_agents: Optional[Iterable[str]] = None,
+                 **options):
+        # options are NionOrchestrator's (tracking, result_cache, delivery, instrumentation)
+        if engine is not None and options:
+            raise ValueError("Pass either an engine or NionOrchestrator options, not both")
+        self.engine = engine or NionOrchestrator(**options)
+        self.handlers = dict(handlers or {})
+        self.concurrency = dict(concurrency or {})
+        self.default_concurrency = default_concurrency
+        if blocking_agents is None:
+            blocking_agents = self.BLOCKING_AGENTS | (self.TRACKING_AGENTS if self.engine.tracking else frozenset())
+        self.blocking_agents = frozenset(blocking_agents)
+        self.executor = AsyncioPlanExecutor()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register_handler(self, agent: str, handler: AsyncAgentHandler, concurrency: Optional[int] = None):
+        """Run an L3 or cross-cutting agent as a coroutine, e.g. a database or network call"""
+        self.handlers[agent] = handler
+        if concurrency is not None:
+            self.concurrency[agent] = concurrency
+            self._semaphores.pop(agent, None)
+
+    async def process_message(self, message: Dict) -> str:
+        """Async entry point - processes a message and returns orchestration map"""
+        engine = self.engine
+        instrumentation = engine.instrumentation
+        if instrumentation is None:
+            return engine.render(await self._orchestrate(message))
+
+        root = instrumentation.start("message", message_id=message.get("message_id"))
+        try:
+            result = await self._orchestrate(message, root)
+            with engine._stage("format", root):
+                text = engine.render(result)
+        except BaseException as exc:
+            instrumentation.end(root, exc)
+            raise
+        instrumentation.end(root)
+        return text
+
+    def process_message_sync(self, message: Dict) -> str:
+        """Blocking wrapper for callers without an event loop"""
+        return asyncio.run(self.process_message(message))
+
+    async def process_batch(self, messages: Iterable[Dict], structured: bool = False,
+                            max_in_flight: int = 256) -> List[Union[str, OrchestrationResult]]:
+        """Process messages concurrently, at most max_in_flight at a time, preserving input order"""
+        in_flight = asyncio.Semaphore(max_in_flight)
+        process = self.orchestrate if structured else self.process_message
+
+        async def bounded(message: Dict):
+            async with in_flight:
+                return await process(message)
+
+        return await asyncio.gather(*(bounded(message) for message in messages))
+
+    async def orchestrate(self, message: Dict) -> OrchestrationResult:
+        """Plan and execute a message without formatting the output"""
+        instrumentation = self.engine.instrumentation
+        if instrumentation is None:
+            return await self._orchestrate(message)
+
+        root = instrumentation.start("message", message_id=message.get("message_id"))
+        try:
+            result = await self._orchestrate(message, root)
+        except BaseException as exc:
+            instrumentation.end(root, exc)
+            raise
+        instrumentation.end(root)
+        return result
+
+    async def _orchestrate(self, message: Dict, root: Optional[Span] = None) -> OrchestrationResult:
+        engine = self.engine
+        key = engine._cache_key(message)
+        cached = engine.result_cache.get(key) if key is not None else None
+        if cached is not None:
+            result = OrchestrationResult(message, *cached)
+        else:
+            result = await (self._run(message) if root is None else self._run_traced(message, root))
+            if key is not None:
+                engine.result_cache.put(key, result)
+
+        if engine.delivery is not None:
+            engine._deliver(result)
+        return result
+
+    async def _run(self, message: Dict) -> OrchestrationResult:
+        hits, plan = self.engine.plan(message)
+
+        async def run_task(task: Task) -> Optional[Task]:
+            return await self._execute_task(task, message, hits)
+
+        results = await self.executor.run_async(plan, run_task)
+        executed_tasks = [results[task.task_id] for task in plan if results[task.task_id] is not None]
+        return OrchestrationResult(message, plan, executed_tasks)
+
+    async def _run_traced(self, message: Dict, root: Span) -> OrchestrationResult:
+        """_run under the same plan, execute and task spans as NionOrchestrator"""
+        engine = self.engine
+        with engine._stage("plan", root):
+            hits, plan = engine.plan(message)
+
+        with engine._stage("execute", root) as stage:
+            async def run_task(task: Task) -> Optional[Task]:
+                return await self._execute_task_traced(task, message, hits, stage)
+
+            results = await self.executor.run_async(plan, run_task)
+        executed_tasks = [results[task.task_id] for task in plan if results[task.task_id] is not None]
+        return OrchestrationResult(message, plan, executed_tasks)
+
+    async def _execute_task_traced(self, task: Task, message: Dict, hits: KeywordHits,
+                                   parent: Span) -> Optional[Task]:
+        instrumentation = self.engine.instrumentation
+        span = instrumentation.start("task", parent, task_id=task.task_id, agent=task.target)
+        try:
+            result = await self._execute_task(task, message, hits, span)
+        except BaseException as exc:
+            instrumentation.end(span, exc)
+            raise
+        instrumentation.end(span)
+        return result
+
+    async def _execute_task(self, task: Task, message: Dict, hits: KeywordHits,
+                            span: Optional[Span] = None) -> Optional[Task]:
+        if task.target.startswith("L2:"):
+            domain = L2_DOMAINS.get(task.target) or L2Domain[task.target[3:]]
+            return await self._coordinate(domain, task, message, hits, span)
+        if not (task.target.startswith("L3:") and task.is_cross_cutting):
+            return None
+
+        agent = task.target[3:]
+        handler = self.handlers.get(agent)
+        if handler is not None:
+            async with self._semaphore(agent):
+                await handler(task, message)
+            return task
+        if agent in self.blocking_agents:
+            return await asyncio.to_thread(L3Agent.execute_cross_cutting, task, message)
+        return L3Agent.execute_cross_cutting(task, message)
+
+    async def _coordinate(self, domain: L2Domain, task: Task, message: Dict, hits: KeywordHits,
+                          span: Optional[Span] = None) -> Task:
+        """L2Coordinator.execute, with each L3 agent awaited, run in a thread or run inline"""
+        engine = self.engine
+        # A coordinator per task: other tasks run on this loop while one awaits
+        coordinator = L2Coordinator(domain, engine.tracking, engine.instrumentation, engine.delivery)
+        for handler in coordinator.route(task.purpose):
+            agent = ROUTING_TABLE.agent_of(handler)
+            async_handler = self.handlers.get(agent)
+            if async_handler is not None:
+                subtask = coordinator.new_subtask(task, agent, task.purpose)
+                await self._await_handler(agent, async_handler, subtask, message, span)
+            elif engine.instrumentation is not None:
+                run = functools.partial(coordinator.run_traced, handler, task, message, hits, span)
+                subtask = await asyncio.to_thread(run) if agent in self.blocking_agents else run()
+            elif agent in self.blocking_agents:
+                subtask = await asyncio.to_thread(handler, coordinator, task, message, hits)
+            else:
+                subtask = handler(coordinator, task, message, hits)
+            task.add_subtasks(subtask)
+        return task
 
-        for task in plan:
-            cross_cutting_label = " (Cross-Cutting)" if task.is_cross_cutting else ""
-            output.append(f"[{task.task_id}] → {task.target}{cross_cutting_label}")
-            output.append(f"Purpose: {task.purpose}")
-            if task.depends_on:
-                output.append(f"Depends On: {', '.join(task.depends_on)}")
-            output.append("")
-
-        # L2/L3 Execution
-        output.append("=" * 80)
-        output.append("L2/L3 EXECUTION")
-        output.append("=" * 80)
-        output.append("")
-
-        for task in executed_tasks:
-            if task.subtasks:
-                # L2 task with L3 subtasks
-                output.append(f"[{task.task_id}] {task.target}")
-                for subtask in task.subtasks:
-                    output.append(f"└─▶ [{subtask.task_id}] {subtask.target}")
-                    output.append(f"    Status: {subtask.status}")
-                    output.append(f"    Output:")
-                    for line in subtask.output:
-                        output.append(f"    • {line}")
-                output.append("")
+    async def _await_handler(self, agent: str, handler: AsyncAgentHandler, subtask: Task, message: Dict,
+                             span: Optional[Span]):
+        """Await an async L3 handler, under a subtask span like run_traced when traced"""
+        instrumentation = self.engine.instrumentation
+        if instrumentation is None:
+            async with self._semaphore(agent):
+                await handler(subtask, message)
+            return
+        subtask_span = instrumentation.start("subtask", span, task_id=subtask.task_id, agent=subtask.target)
+        try:
+            async with self._semaphore(agent):
+                await handler(subtask, message)
+        except BaseException as exc:
+            instrumentation.end(subtask_span, exc)
+            raise
+        instrumentation.end(subtask_span)
+
+    def _semaphore(self, agent: str) -> asyncio.Semaphore:
+        # Semaphores bind to the loop they first block on, so start fresh
+        # when called from a new loop (e.g. successive asyncio.run calls)
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._semaphores = {}
+
+        semaphore = self._semaphores.get(agent)
+        if semaphore is None:
+            limit = self.concurrency.get(agent, self.default_concurrency)
+            semaphore = self._semaphores[agent] = asyncio.Semaphore(limit)
+        return semaphore
+
+
+OUTPUT_FORMATS = ("jsonl", "text", "structured")
+
+
+def read_jsonl(stream: TextIO, on_error: Optional[Callable[[int, ValueError], None]] = None) -> Iterator[Dict]:
+    """
+    Lazily yield one message per non-blank JSONL line.
+    Malformed lines raise ValueError, unless on_error is given; it is then
+    called with the 1-based line number and the error, and the line skipped.
+    """
+    for line_number, line in enumerate(stream, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError as exc:
+            if on_error is None:
+                raise ValueError(f"Line {line_number}: invalid JSON: {exc}") from exc
+            on_error(line_number, exc)
+
+
+def write_jsonl(records: Iterable[Dict], stream: TextIO, flush_every: int = 1000) -> int:
+    """Write records one per line as they are produced; returns the number written"""
+    written = 0
+    for record in records:
+        stream.write(json.dumps(record, ensure_ascii=False))
+        stream.write("\n")
+        written += 1
+        if written % flush_every == 0:
+            stream.flush()
+    stream.flush()
+    return written
+
+
+def _result_record(message: Dict, orchestration_map: str) -> Dict:
+    return {"message_id": message.get("message_id"), "orchestration_map": orchestration_map}
+
+
+def _error_record(line_number: int, error: ValueError) -> Dict:
+    return {"line": line_number, "error": f"Invalid JSON: {error}"}
+
+
+def run_pipeline(input_stream: TextIO, output_stream: TextIO, orchestrator: Optional[NionOrchestrator] = None,
+                 output_format: str = "jsonl") -> int:
+    """
+    Streaming read JSONL -> plan -> execute -> serialize pipeline.
+    Each stage is a generator pulling one message at a time from the stage
+    before it, so memory stays constant whatever the input size and a slow
+    output stream throttles reading. output_format="jsonl" writes one record
+    per message; "text" writes the orchestration maps themselves, line by line;
+    "structured" writes OrchestrationResult.to_dict() records and never renders.
+    Returns the number of messages processed.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    orchestrator = orchestrator or NionOrchestrator()
+
+    def report(line_number: int, error: ValueError):
+        # Malformed lines stay in sequence with the records around them
+        if output_format != "text":
+            write_jsonl([_error_record(line_number, error)], output_stream)
+        else:
+            print(f"Line {line_number}: Invalid JSON: {error}", file=sys.stderr)
+
+    messages = read_jsonl(input_stream, report)
+    planned = ((message, *orchestrator.plan(message)) for message in messages)
+    results = (orchestrator.execute_plan(message, plan, hits) for message, hits, plan in planned)
+
+    if output_format == "text":
+        processed = 0
+        for result in results:
+            orchestrator.write_orchestration_map(result, output_stream)
+            output_stream.write("\n")
+            processed += 1
+        output_stream.flush()
+        return processed
+
+    if output_format == "structured":
+        return write_jsonl((result.to_dict() for result in results), output_stream)
+    records = (_result_record(result.message, orchestrator.render(result)) for result in results)
+    return write_jsonl(records, output_stream)
+
+
+def _orchestrate_chunk(lines: List[Tuple[int, str]], output_format: str = "jsonl") -> List[Dict]:
+    """Worker entry point: parse and orchestrate one chunk of JSONL lines"""
+    orchestrator = NionOrchestrator()
+    records = []
+    for line_number, line in lines:
+        try:
+            message = json.loads(line)
+        except json.JSONDecodeError as exc:
+            records.append(_error_record(line_number, exc))
+            continue
+        result = orchestrator.orchestrate(message)
+        if output_format == "structured":
+            records.append(result.to_dict())
+        else:
+            records.append(_result_record(message, orchestrator.render(result)))
+    return records
+
+
+def _read_chunks(stream: TextIO, chunk_size: int) -> Iterator[List[Tuple[int, str]]]:
+    """Stream non-blank JSONL lines in chunks, keeping their 1-based line numbers"""
+    chunk = []
+    for line_number, line in enumerate(stream, 1):
+        if line.strip():
+            chunk.append((line_number, line))
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+    if chunk:
+        yield chunk
+
+
+def run_jsonl(input_stream: TextIO, output_stream: TextIO, workers: int = 1,
+              chunk_size: int = 256, order: str = "input", output_format: str = "jsonl") -> int:
+    """
+    Orchestrate a JSONL stream of messages, writing one result per message.
+    With one worker this is run_pipeline; otherwise chunks are sharded across
+    a process pool with a bounded number in flight. order="input" writes
+    results in input order; order="message_id" writes each chunk as soon as
+    it completes, keyed by message_id.
+    Returns the number of messages processed.
+    """
+    if order not in ("input", "message_id"):
+        raise ValueError(f"Unknown output order: {order}")
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if workers <= 1:
+        return run_pipeline(input_stream, output_stream, output_format=output_format)
+
+    processed = 0
+
+    def write(records: List[Dict]):
+        nonlocal processed
+        if output_format != "text":
+            write_jsonl(records, output_stream)
+        for record in records:
+            if "error" in record:
+                if output_format == "text":
+                    print(f"Line {record['line']}: {record['error']}", file=sys.stderr)
+                continue
+            if output_format == "text":
+                output_stream.write(record["orchestration_map"])
+                output_stream.write("\n\n")
+            processed += 1
+
+    chunks = _read_chunks(input_stream, chunk_size)
+    max_in_flight = workers * 2
+    # Workers compile the same rule file, whatever the process start method
+    with ProcessPoolExecutor(max_workers=workers, initializer=load_extraction_rules,
+                             initargs=(EXTRACTION_RULES.source,)) as pool:
+        pending: Dict[Future, int] = {}
+        completed: Dict[int, List[Dict]] = {}  # out-of-order chunks awaiting their turn
+        next_index = 0
+
+        def drain(return_when: str):
+            nonlocal next_index
+            done, _ = wait(pending, return_when=return_when)
+            for future in done:
+                index = pending.pop(future)
+                if order == "message_id":
+                    write(future.result())
+                else:
+                    completed[index] = future.result()
+            while next_index in completed:
+                write(completed.pop(next_index))
+                next_index += 1
+
+        for index, chunk in enumerate(chunks):
+            pending[pool.submit(_orchestrate_chunk, chunk, output_format)] = index
+            # Buffered results count against the limit so a slow chunk
+            # cannot let memory grow without bound
+            while len(pending) + len(completed) >= max_in_flight:
+                drain(FIRST_COMPLETED)
+        while pending:
+            drain(ALL_COMPLETED)
+
+    return processed
+
+
+# Sharded execution: projects partitioned across workers that own their state
+class ShardRing:
+    """
+    Consistent hashing of projects onto shards. Each shard owns `replicas`
+    points on a 64-bit ring and a project belongs to the first point at or
+    after the hash of its name, so changing the shard count from N to N+1
+    moves only about 1/(N+1) of the projects. The hash is BLAKE2b rather
+    than hash() (salted per process) or crc32 (linear, so names like
+    PRJ-1..PRJ-40 cluster), which keeps placement stable across processes
+    and restarts.
+    """
+
+    def __init__(self, shards: int, replicas: int = 128):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        points = sorted((self._hash(f"shard-{shard}/{replica}"), shard)
+                        for shard in range(shards) for replica in range(replicas))
+        self.shards = shards
+        self.replicas = replicas
+        self._hashes = [point for point, _ in points]
+        self._owners = [shard for _, shard in points]
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode(), digest_size=8).digest(), "big")
+
+    def shard_for(self, project: str) -> int:
+        index = bisect.bisect_left(self._hashes, self._hash(project))
+        return self._owners[index % len(self._owners)]
+
+
+def _shard_orchestrator(index: int) -> NionOrchestrator:
+    """Default shard state: an in-memory tracking store of its own"""
+    return NionOrchestrator(tracking=TrackingStore())
+
+
+def _shard_loop(index: int, inbox, outbox, factory: Callable[[int], NionOrchestrator]):
+    """
+    One shard: commands are handled strictly in arrival order, so messages of
+    a project run sequentially and exports see every message queued before them.
+    """
+    orchestrator = factory(index)
+    while True:
+        command, sequence, payload = inbox.get()
+        if command == "stop":
+            break
+        try:
+            if command == "message":
+                value = orchestrator.orchestrate(payload)
+            elif command == "export":
+                value = {project: orchestrator.tracking.export_project(project, remove=True) for project in payload}
+            else:  # import
+                for project, rows in payload.items():
+                    orchestrator.tracking.import_project(project, rows)
+                value = None
+        except Exception as exc:
+            outbox.put((sequence, False, exc))
+        else:
+            outbox.put((sequence, True, value))
+    if orchestrator.tracking is not None:
+        orchestrator.tracking.close()
+
+
+class ShardedOrchestrator:
+    """
+    Partitioned execution. message["project"] is hashed (ShardRing) onto one
+    of `shards` workers; messages without a project go to a separate fallback
+    shard. Every shard has its own bounded queue and its own orchestrator,
+    built by shard_factory(index), so project state (tracking, result cache)
+    lives in exactly one shard and needs no cross-shard locking. Messages of a
+    project are processed in submission order; different projects run in
+    parallel, in threads or (processes=True) in worker processes.
+
+    rebalance(shards) changes the shard count: intake pauses, each moving
+    project's state is exported by its old shard after the messages already
+    queued there, imported by its new shard, and intake resumes.
+    """
+
+    FALLBACK = -1
+
+    def __init__(self, shards: int = 4, shard_factory: Callable[[int], NionOrchestrator] = _shard_orchestrator,
+                 queue_size: int = 1024, processes: bool = False, replicas: int = 128):
+        self.shard_factory = shard_factory
+        self.queue_size = queue_size
+        self.processes = processes
+        self.ring = ShardRing(shards, replicas)
+        self._context = multiprocessing.get_context() if processes else None
+        self._outbox = self._context.Queue() if processes else queue.Queue()
+        self._inboxes: Dict[int, Any] = {}
+        self._workers: Dict[int, Any] = {}
+        self._futures: Dict[int, Future] = {}
+        self._sequence = itertools.count()
+        self._projects: Dict[str, int] = {}
+        self._submitted: Dict[int, int] = {}
+        self._intake = threading.Lock()
+        for index in (self.FALLBACK, *range(shards)):
+            self._start(index)
+        self._collector = threading.Thread(target=self._collect, name="nion-shard-results", daemon=True)
+        self._collector.start()
+
+    def _start(self, index: int):
+        if self.processes:
+            inbox = self._context.Queue(self.queue_size)
+            worker = self._context.Process(target=_shard_loop, args=(index, inbox, self._outbox, self.shard_factory),
+                                           name=f"nion-shard-{index}", daemon=True)
+        else:
+            inbox = queue.Queue(self.queue_size)
+            worker = threading.Thread(target=_shard_loop, args=(index, inbox, self._outbox, self.shard_factory),
+                                      name=f"nion-shard-{index}", daemon=True)
+        self._inboxes[index] = inbox
+        self._workers[index] = worker
+        self._submitted.setdefault(index, 0)
+        worker.start()
+
+    def _collect(self):
+        while True:
+            sequence, ok, value = self._outbox.get()
+            if sequence is None:
+                return
+            future = self._futures.pop(sequence)
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def _send(self, index: int, command: str, payload: Any) -> Future:
+        future = Future()
+        sequence = next(self._sequence)
+        self._futures[sequence] = future
+        # Blocks while the shard's queue is full: backpressure per shard
+        self._inboxes[index].put((command, sequence, payload))
+        return future
+
+    def shard_for(self, message: Dict) -> int:
+        project = message.get("project")
+        return self.ring.shard_for(project) if project else self.FALLBACK
+
+    def submit(self, message: Dict) -> Future:
+        """Queue a message on its project's shard; the Future resolves to its OrchestrationResult"""
+        with self._intake:
+            index = self.shard_for(message)
+            project = message.get("project")
+            if project:
+                self._projects[project] = index
+            self._submitted[index] += 1
+            return self._send(index, "message", message)
+
+    def process_batch(self, messages: Iterable[Dict], structured: bool = False) -> List[Union[str, OrchestrationResult]]:
+        """Orchestrate messages across the shards; results come back in input order"""
+        futures = [self.submit(message) for message in messages]
+        results = [future.result() for future in futures]
+        return results if structured else [result.text for result in results]
+
+    def rebalance(self, shards: int) -> Dict[str, Tuple[int, int]]:
+        """
+        Move to a new shard count. Returns {project: (old shard, new shard)}
+        for every project whose state moved.
+        """
+        with self._intake:
+            ring = ShardRing(shards, self.ring.replicas)
+            moves = {project: (old, ring.shard_for(project)) for project, old in self._projects.items()
+                     if ring.shard_for(project) != old}
+            for index in range(self.ring.shards, shards):
+                self._start(index)
+            exports: Dict[int, List[str]] = {}
+            for project, (old, _) in moves.items():
+                exports.setdefault(old, []).append(project)
+            exported = [self._send(index, "export", projects) for index, projects in exports.items()]
+            imports: Dict[int, Dict] = {}
+            for future in exported:
+                for project, rows in future.result().items():
+                    imports.setdefault(moves[project][1], {})[project] = rows
+            for future in [self._send(index, "import", rows) for index, rows in imports.items()]:
+                future.result()
+            for index in range(shards, self.ring.shards):
+                self._stop(index)
+            for project, (_, new) in moves.items():
+                self._projects[project] = new
+            self.ring = ring
+            return moves
+
+    def _stop(self, index: int):
+        self._inboxes[index].put(("stop", None, None))
+        self._workers.pop(index).join()
+        del self._inboxes[index]
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per shard: messages submitted, projects owned, and queue depth where the platform reports it"""
+        owned: Dict[int, int] = {}
+        for index in self._projects.values():
+            owned[index] = owned.get(index, 0) + 1
+        stats = {}
+        for index, inbox in self._inboxes.items():
+            try:
+                depth = inbox.qsize()
+            except NotImplementedError:  # multiprocessing queues on macOS
+                depth = None
+            name = "fallback" if index == self.FALLBACK else str(index)
+            stats[name] = {"submitted": self._submitted.get(index, 0), "projects": owned.get(index, 0), "queued": depth}
+        return stats
+
+    def close(self):
+        """Finish every queued message, then stop the shards"""
+        with self._intake:
+            for index in list(self._workers):
+                self._stop(index)
+            self._outbox.put((None, True, None))
+            self._collector.join()
+
+    def __enter__(self) -> "ShardedOrchestrator":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def run_sharded(input_stream: TextIO, output_stream: TextIO, shards: int, output_format: str = "jsonl",
+                processes: bool = True, window: int = 4096) -> int:
+    """
+    Orchestrate a JSONL stream on a ShardedOrchestrator, each shard keeping
+    its projects' tracking state in memory. Results are written in input
+    order with at most `window` messages in flight. Returns the number processed.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    pending: deque = deque()
+    processed = 0
+
+    def write(item: Union[Future, Dict]):
+        nonlocal processed
+        if isinstance(item, dict):
+            if output_format != "text":
+                write_jsonl([item], output_stream)
             else:
-                # Cross-cutting L3 task
-                cross_cutting_label = " (Cross-Cutting)" if task.is_cross_cutting else ""
-                output.append(f"[{task.task_id}] {task.target}{cross_cutting_label}")
-                output.append(f"Status: {task.status}")
-                output.append(f"Output:")
-                for line in task.output:
-                    output.append(f"• {line}")
-                output.append("")
+                print(f"Line {item['line']}: {item['error']}", file=sys.stderr)
+            return
+        result = item.result()
+        if output_format == "text":
+            # Same layout as run_pipeline: the map's lines, then a blank line
+            result.write(output_stream)
+            output_stream.write("\n\n")
+        elif output_format == "structured":
+            write_jsonl([result.to_dict()], output_stream)
+        else:
+            write_jsonl([_result_record(result.message, result.text)], output_stream)
+        processed += 1
+
+    with ShardedOrchestrator(shards, processes=processes) as sharded:
+        for message in read_jsonl(input_stream, lambda line_number, error: pending.append(
+                _error_record(line_number, error))):
+            pending.append(sharded.submit(message))
+            # Write whatever is ready in order; wait only when the window is full
+            while pending and (len(pending) > window or not isinstance(pending[0], Future) or pending[0].done()):
+                write(pending.popleft())
+        while pending:
+            write(pending.popleft())
+    output_stream.flush()
+    return processed
+
+
+# Delivery: responses sent to the sender's channel in the background
+@dataclass(slots=True)
+class DeliveryRequest:
+    channel: str
+    recipient: str
+    text: str
+    message_id: Optional[str] = None
+    attempts: int = 0
+    future: Future = field(default_factory=Future, repr=False)
+
+
+class DeliveryError(Exception):
+    """A delivery failed; retryable errors are retried with backoff"""
+
+    def __init__(self, message: str, retryable: bool = True, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+def parse_retry_after(value: Optional[str], default: float = 1.0) -> float:
+    """Seconds to wait from a Retry-After header: delay-seconds or an HTTP-date"""
+    if not value:
+        return default
+    value = value.strip()
+    if value.isascii() and value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+
+class ConnectionPool:
+    """Keep-alive HTTP(S) connections to one host, reused across deliveries"""
+
+    def __init__(self, base_url: str, size: int = 4, timeout: float = 10.0):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._idle: "queue.LifoQueue[http.client.HTTPConnection]" = queue.LifoQueue(size)
+
+    def _connect(self) -> http.client.HTTPConnection:
+        connection_class = http.client.HTTPSConnection if self.scheme == "https" else http.client.HTTPConnection
+        return connection_class(self.host, self.port, timeout=self.timeout)
+
+    def post_json(self, path: str, payload: Any, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict, bytes]:
+        """POST JSON; returns (status, lowercased headers, body). Connection errors raise DeliveryError"""
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = self._connect()
+        body = json.dumps(payload).encode()
+        try:
+            connection.request("POST", (self.prefix + path) or "/", body,
+                               {"Content-Type": "application/json", **(headers or {})})
+            response = connection.getresponse()
+            data = response.read()
+        except (OSError, http.client.HTTPException) as exc:
+            connection.close()
+            raise DeliveryError(f"{type(exc).__name__}: {exc}") from exc
+        if response.will_close:
+            connection.close()
+        else:
+            try:
+                self._idle.put_nowait(connection)
+            except queue.Full:
+                connection.close()
+        return response.status, {k.lower(): v for k, v in response.getheaders()}, data
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class ChannelAdapter:
+    """
+    Sends batches of deliveries for one channel. send() receives requests
+    coalesced per recipient and raises DeliveryError on failure.
+    """
+    name = ""
+    path = "/"
+
+    def __init__(self, base_url: str, pool_size: int = 4, headers: Optional[Dict[str, str]] = None):
+        self.pool = ConnectionPool(base_url, pool_size)
+        self.headers = dict(headers or {})
+
+    def send(self, recipient: str, texts: List[str]):
+        status, headers, body = self.pool.post_json(self.path, self.payload(recipient, texts), self.headers)
+        if status == 429:
+            raise DeliveryError("Rate limited", retry_after=parse_retry_after(headers.get("retry-after")))
+        if status >= 500:
+            raise DeliveryError(f"HTTP {status}")
+        if status >= 400:
+            raise DeliveryError(f"HTTP {status}: {body[:200]!r}", retryable=False)
+        self.check(headers, body)
+
+    def payload(self, recipient: str, texts: List[str]) -> Dict:
+        raise NotImplementedError
+
+    def check(self, headers: Dict, body: bytes):
+        """Raise DeliveryError for a 2xx response that reports a failure; the status is enough by default"""
+
+    def close(self):
+        self.pool.close()
+
+
+class SlackAdapter(ChannelAdapter):
+    """Slack Web API chat.postMessage; base_url is normally https://slack.com/api"""
+    name = "slack"
+    path = "/chat.postMessage"
+    # Slack answers 200 with {"ok": false, "error": ...}; these errors are worth retrying
+    RETRYABLE_ERRORS = frozenset(("ratelimited", "internal_error", "fatal_error", "service_unavailable",
+                                  "request_timeout"))
+
+    def payload(self, recipient: str, texts: List[str]) -> Dict:
+        return {"channel": recipient, "text": "\n\n".join(texts)}
+
+    def check(self, headers: Dict, body: bytes):
+        try:
+            result = json.loads(body)
+        except ValueError:
+            raise DeliveryError(f"Slack: invalid response {body[:200]!r}", retryable=False) from None
+        if not isinstance(result, dict) or result.get("ok") is not True:
+            error = result.get("error", "unknown_error") if isinstance(result, dict) else "unknown_error"
+            retry_after = parse_retry_after(headers.get("retry-after")) if error == "ratelimited" else None
+            raise DeliveryError(f"Slack: {error}", retryable=error in self.RETRYABLE_ERRORS, retry_after=retry_after)
+
+
+class TeamsAdapter(ChannelAdapter):
+    """Microsoft Teams incoming webhook; base_url is the webhook URL"""
+    name = "teams"
+    path = ""
+
+    def payload(self, recipient: str, texts: List[str]) -> Dict:
+        return {"text": f"**{recipient}**\n\n" + "\n\n".join(texts)}
+
+
+class EmailAdapter(ChannelAdapter):
+    """Email through an HTTP mail API (SendGrid-style /mail/send)"""
+    name = "email"
+    path = "/mail/send"
+
+    def __init__(self, base_url: str, sender: str = "nion@localhost", **kwargs):
+        super().__init__(base_url, **kwargs)
+        self.sender = sender
+
+    def payload(self, recipient: str, texts: List[str]) -> Dict:
+        return {
+            "personalizations": [{"to": [{"email": recipient}]}],
+            "from": {"email": self.sender},
+            "subject": "Re: your message",
+            "content": [{"type": "text/plain", "value": "\n\n".join(texts)}]
+        }
+
 
-        output.append("=" * 80)
+DELIVERY_ADAPTERS: Dict[str, Callable[..., ChannelAdapter]] = {
+    adapter.name: adapter for adapter in (SlackAdapter, TeamsAdapter, EmailAdapter)
+}
 
-        return "\n".join(output)
 
+class DeliveryService:
+    """
+    Background delivery. submit() only enqueues and returns a Future; one
+    thread per channel drains its queue in batches of up to batch_size,
+    coalesces requests to the same recipient into one send (identical texts
+    are sent once), retries failures with exponential backoff and jitter,
+    and on HTTP 429 pauses the whole channel for Retry-After. rate_limit
+    caps sends per second per channel.
+    """
+
+    def __init__(self, adapters: Iterable[ChannelAdapter], batch_size: int = 50, max_attempts: int = 5,
+                 backoff: float = 0.2, max_backoff: float = 30.0, rate_limit: Optional[float] = None):
+        self.adapters = {adapter.name: adapter for adapter in adapters}
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.rate_limit = rate_limit
+        self._queues = {name: queue.Queue() for name in self.adapters}
+        self._retries: Dict[str, List[Tuple[float, int, DeliveryRequest]]] = {name: [] for name in self.adapters}
+        self._sequence = itertools.count()
+        self._closing = threading.Event()
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.retried = 0
+        self._threads = [threading.Thread(target=self._run, args=(name,), name=f"nion-delivery-{name}", daemon=True)
+                         for name in self.adapters]
+        for thread in self._threads:
+            thread.start()
+
+    def supports(self, channel: str) -> bool:
+        return channel in self.adapters
+
+    def submit(self, request: DeliveryRequest) -> Future:
+        """Queue a delivery; the Future resolves once it is sent or has failed for good"""
+        if self._closing.is_set():
+            raise RuntimeError("DeliveryService is closed")
+        self._queues[request.channel].put(request)
+        return request.future
+
+    def _run(self, channel: str):
+        adapter = self.adapters[channel]
+        pending = self._queues[channel]
+        retries = self._retries[channel]
+        interval = 1.0 / self.rate_limit if self.rate_limit else 0.0
+        next_send = 0.0
+        while True:
+            # Wait for new work, or for the earliest retry to come due
+            timeout = max(retries[0][0] - time.monotonic(), 0.0) if retries else 0.1
+            batch = []
+            try:
+                batch.append(pending.get(timeout=timeout))
+            except queue.Empty:
+                pass
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(pending.get_nowait())
+                except queue.Empty:
+                    break
+            now = time.monotonic()
+            while retries and retries[0][0] <= now and len(batch) < self.batch_size:
+                batch.append(heapq.heappop(retries)[2])
+            if not batch:
+                if self._closing.is_set() and not retries and pending.empty():
+                    return
+                continue
+
+            by_recipient: Dict[str, List[DeliveryRequest]] = {}
+            for request in batch:
+                by_recipient.setdefault(request.recipient, []).append(request)
+            for recipient, requests in by_recipient.items():
+                delay = next_send - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+                next_send = time.monotonic() + interval
+                texts = list(dict.fromkeys(request.text for request in requests))
+                try:
+                    adapter.send(recipient, texts)
+                except DeliveryError as exc:
+                    self._failed(channel, requests, exc)
+                    if exc.retry_after:
+                        # Rate limited: the whole channel waits
+                        next_send = max(next_send, time.monotonic() + exc.retry_after)
+                    continue
+                except Exception as exc:
+                    self._failed(channel, requests, DeliveryError(str(exc), retryable=False))
+                    continue
+                with self._lock:
+                    self.sent += len(requests)
+                for request in requests:
+                    request.future.set_result(request.attempts + 1)
+
+    def _failed(self, channel: str, requests: List[DeliveryRequest], error: DeliveryError):
+        for request in requests:
+            request.attempts += 1
+            if not error.retryable or request.attempts >= self.max_attempts:
+                with self._lock:
+                    self.failed += 1
+                request.future.set_exception(error)
+                continue
+            delay = error.retry_after or min(self.backoff * 2 ** (request.attempts - 1), self.max_backoff)
+            delay *= random.uniform(1.0, 1.25)
+            with self._lock:
+                self.retried += 1
+            heapq.heappush(self._retries[channel], (time.monotonic() + delay, next(self._sequence), request))
+
+    def close(self, timeout: Optional[float] = None):
+        """Deliver everything queued (including pending retries), then stop"""
+        self._closing.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        for adapter in self.adapters.values():
+            adapter.close()
+
+
+# Server mode: one warm process serving orchestration over HTTP/JSON
+HTTP_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+                413: "Payload Too Large", 431: "Request Header Fields Too Large", 500: "Internal Server Error",
+                503: "Service Unavailable"}
+
+
+@dataclass(slots=True)
+class _PendingRequest:
+    message: Dict
+    output_format: str
+    future: asyncio.Future
+    enqueued: float
+    lane: str = "normal"
+    deadline: float = 0.0
+
+
+@dataclass(frozen=True, slots=True)
+class Lane:
+    """An intake lane: queued messages should start within slo seconds"""
+    name: str
+    slo: float
+    concurrency: int  # workers that may hold batches from this lane at once
+    capacity: int     # queued messages before the server answers 503
+
+
+def default_lanes(workers: int, queue_size: int) -> Tuple[Lane, ...]:
+    """
+    urgent: escalations and blockers, with one worker kept free for them;
+    normal: everything else; bulk: meeting transcripts (report generation),
+    deferred behind the other lanes and limited to a quarter of the workers
+    """
+    return (
+        Lane("urgent", slo=0.05, concurrency=workers, capacity=queue_size),
+        Lane("normal", slo=1.0, concurrency=max(1, workers - 1), capacity=queue_size),
+        Lane("bulk", slo=30.0, concurrency=max(1, workers // 4), capacity=queue_size),
+    )
+
+
+# The planner's escalation and blocked keywords, as one case-insensitive scan
+URGENT_PATTERN = re.compile("|".join(map(re.escape, (*ESCALATION_KEYWORDS, "blocked"))), re.IGNORECASE)
+
+
+def classify_lane(message: Dict) -> str:
+    """
+    The intake lane for a message. Runs on the event loop for every request,
+    so it reads the source and makes one regex pass instead of building the
+    intent signature; transcripts are never scanned.
+    """
+    if message.get("source") == "meeting":
+        return "bulk"
+    if URGENT_PATTERN.search(message.get("content", "")):
+        return "urgent"
+    return "normal"
+
+
+class PriorityIntake:
+    """
+    Earliest-deadline-first intake across lanes, for one asyncio loop. Each
+    message's deadline is its arrival plus its lane's SLO; get() hands out
+    the queued message with the earliest deadline among the lanes a worker
+    may take from. Lane concurrency counts workers, not messages: a worker
+    holds one slot in each lane its current batch draws from (the held set
+    passed to get/get_nowait) and gives them back with release(). An urgent
+    arrival therefore goes ahead of routine work already queued, and deferred
+    bulk work still runs once its deadline is the nearest, so no lane
+    starves. Queue wait and SLO misses are recorded per lane.
+    """
+
+    def __init__(self, lanes: Iterable[Lane]):
+        self.lanes = {lane.name: lane for lane in lanes}
+        self._queued: Dict[str, deque] = {name: deque() for name in self.lanes}
+        self._running = dict.fromkeys(self.lanes, 0)
+        self._getters: deque = deque()
+        self._unfinished = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self.wait = {name: Histogram(LATENCY_BUCKETS) for name in self.lanes}
+        self.missed = dict.fromkeys(self.lanes, 0)
+        self.rejected = dict.fromkeys(self.lanes, 0)
+
+    def qsize(self, lane: Optional[str] = None) -> int:
+        if lane is not None:
+            return len(self._queued[lane])
+        return sum(len(queued) for queued in self._queued.values())
+
+    def put_nowait(self, request: _PendingRequest):
+        """Queue a request on request.lane; raises asyncio.QueueFull at the lane's capacity"""
+        lane = self.lanes[request.lane]
+        queued = self._queued[lane.name]
+        if len(queued) >= lane.capacity:
+            self.rejected[lane.name] += 1
+            raise asyncio.QueueFull
+        request.deadline = request.enqueued + lane.slo
+        queued.append(request)
+        self._unfinished += 1
+        self._idle.clear()
+        self._wake()
+
+    def _wake(self):
+        while self._getters:
+            getter = self._getters.popleft()
+            if not getter.done():
+                getter.set_result(None)
+                return
+
+    def get_nowait(self, held: Set[str]) -> Optional[_PendingRequest]:
+        """
+        The most urgent request from a lane in held or with a free worker
+        slot, or None. Taking from a new lane adds it to held.
+        """
+        best = None
+        for name, queued in self._queued.items():
+            # Lanes are FIFO with one SLO each, so the head has the lane's earliest deadline
+            if queued and (name in held or self._running[name] < self.lanes[name].concurrency):
+                if best is None or queued[0].deadline < self._queued[best][0].deadline:
+                    best = name
+        if best is None:
+            return None
+        request = self._queued[best].popleft()
+        if best not in held:
+            held.add(best)
+            self._running[best] += 1
+        now = time.perf_counter()
+        self.wait[best].observe(now - request.enqueued)
+        if now > request.deadline:
+            self.missed[best] += 1
+        return request
+
+    async def get(self, held: Set[str]) -> _PendingRequest:
+        while True:
+            request = self.get_nowait(held)
+            if request is not None:
+                return request
+            getter = asyncio.get_running_loop().create_future()
+            self._getters.append(getter)
+            try:
+                await getter
+            except asyncio.CancelledError:
+                # Pass the wake-up on if this getter was woken as it was cancelled
+                if getter.done() and not getter.cancelled():
+                    self._wake()
+                raise
+
+    def task_done(self):
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+    def release(self, held: Set[str]):
+        """Give back a worker's lane slots; a freed slot may make another lane runnable"""
+        for name in held:
+            self._running[name] -= 1
+        held.clear()
+        self._wake()
+
+    async def join(self):
+        await self._idle.wait()
+
+
+class OrchestrationServer:
+    """
+    asyncio HTTP/1.1 server (TCP, or a Unix socket) in front of a pool of
+    orchestrators.
+
+    POST /orchestrate takes one message, or a JSON list of messages, and
+    returns the result records (?format=structured for plan/tasks/records).
+    Messages wait in bounded priority lanes (see PriorityIntake and
+    default_lanes): escalations and blockers ahead of routine work, meeting
+    reports deferred. When a lane is full the server answers 503 immediately
+    instead of letting latency grow. Each of the workers pulls up to
+    batch_size queued messages at a time, most urgent first (waiting at most
+    batch_wait for the batch to fill), and runs them on its own orchestrator
+    in a thread.
+
+    GET /healthz reports queue depth and turns 503 while draining;
+    GET /metrics is Prometheus text. shutdown() (or SIGTERM/SIGINT under
+    serve_forever) stops accepting, finishes every queued message and exits.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, unix_socket: Optional[str] = None,
+                 workers: int = 4, queue_size: int = 1024, batch_size: int = 32, batch_wait: float = 0.0,
+                 orchestrator_factory: Callable[[], NionOrchestrator] = NionOrchestrator,
+                 max_body: int = 16 * 1024 * 1024, lanes: Optional[Sequence[Lane]] = None):
+        self.host = host
+        self.port = port
+        self.unix_socket = unix_socket
+        self.workers = workers
+        self.queue_size = queue_size
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self.orchestrator_factory = orchestrator_factory
+        self.max_body = max_body
+        self.lanes = tuple(lanes) if lanes is not None else default_lanes(workers, queue_size)
+        self.draining = False
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._queue = PriorityIntake(self.lanes)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._stopped: Optional[asyncio.Event] = None
+        self._requests: Dict[Tuple[str, int], int] = {}
+        self._processed = 0
+        self._latency = Histogram(LATENCY_BUCKETS)
+
+    async def start(self):
+        """Bind the socket and start the workers"""
+        self._stopped = asyncio.Event()
+        self._pool = ThreadPoolExecutor(self.workers, thread_name_prefix="nion-worker")
+        self._worker_tasks = [asyncio.create_task(self._worker(self.orchestrator_factory()))
+                              for _ in range(self.workers)]
+        if self.unix_socket:
+            self._server = await asyncio.start_unix_server(self._handle_connection, self.unix_socket)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+            self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        """Run until shutdown() or SIGTERM/SIGINT, then drain"""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(signum, lambda: asyncio.ensure_future(self.shutdown()))
+            except (NotImplementedError, RuntimeError):
+                pass  # not on the main thread, or unsupported platform
+        if hasattr(signal, "SIGHUP"):
+            try:
+                loop.add_signal_handler(signal.SIGHUP, self.reload_rules)
+            except (NotImplementedError, RuntimeError):
+                pass
+        await self._stopped.wait()
+
+    def reload_rules(self) -> bool:
+        """Recompile the extraction rule file; requests in flight keep their rules"""
+        try:
+            rules = load_extraction_rules()
+        except (OSError, ValueError) as exc:
+            print(f"Keeping current extraction rules: {exc}", file=sys.stderr)
+            return False
+        print(f"Reloaded extraction rules from {rules.source}", file=sys.stderr)
+        return True
+
+    async def shutdown(self):
+        """Stop accepting connections, finish queued work, stop the workers"""
+        if self.draining:
+            return
+        self.draining = True
+        self._server.close()
+        await self._server.wait_closed()
+        await self._queue.join()
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._pool.shutdown(wait=True)
+        self._stopped.set()
+
+    async def submit(self, message: Dict, output_format: str = "jsonl") -> Dict:
+        """Queue one message and wait for its result record"""
+        if self.draining:
+            raise _Unavailable("Server is draining")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(_PendingRequest(message, output_format, future, time.perf_counter(),
+                                                   classify_lane(message)))
+        except asyncio.QueueFull:
+            raise _Unavailable("Request queue is full")
+        return await future
+
+    async def _worker(self, orchestrator: NionOrchestrator):
+        queue = self._queue
+        loop = asyncio.get_running_loop()
+        # Lanes this worker's current batch holds a slot in
+        held: Set[str] = set()
+        while True:
+            batch = [await queue.get(held)]
+            deadline = loop.time() + self.batch_wait
+            while len(batch) < self.batch_size:
+                request = queue.get_nowait(held)
+                if request is None:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        request = await asyncio.wait_for(queue.get(held), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                batch.append(request)
+            try:
+                outcomes = await loop.run_in_executor(self._pool, _serve_batch, orchestrator, batch)
+                for request, (ok, payload) in zip(batch, outcomes):
+                    if request.future.done():
+                        continue
+                    if ok:
+                        request.future.set_result(payload)
+                    else:
+                        request.future.set_exception(payload)
+            except BaseException as exc:
+                for request in batch:
+                    if not request.future.done():
+                        request.future.set_exception(exc)
+                if isinstance(exc, asyncio.CancelledError):
+                    raise
+            finally:
+                finished = time.perf_counter()
+                for request in batch:
+                    self._latency.observe(finished - request.enqueued)
+                    queue.task_done()
+                queue.release(held)
+                self._processed += len(batch)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                request_line = await self._read_line(reader)
+                if request_line is None:
+                    await self._respond(writer, 431, {"error": "Request line too long"}, keep_alive=False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._respond(writer, 400, {"error": "Malformed request line"}, keep_alive=False)
+                    break
+                headers = {}
+                while True:
+                    line = await self._read_line(reader)
+                    if line is None or line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                if line is None:
+                    await self._respond(writer, 431, {"error": "Header line too long"}, keep_alive=False)
+                    break
+                raw_length = headers.get("content-length") or "0"
+                if not (raw_length.isascii() and raw_length.isdigit()):
+                    await self._respond(writer, 400, {"error": "Invalid Content-Length"}, keep_alive=False)
+                    break
+                length = int(raw_length)
+                if length > self.max_body:
+                    await self._respond(writer, 413, {"error": "Request body too large"}, keep_alive=False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = (headers.get("connection", "").lower() != "close"
+                              and version.upper() == "HTTP/1.1")
+                status, payload = await self._route(method.upper(), target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
 
-def main():
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader) -> Optional[bytes]:
+        """The next line, b"" at EOF, or None when it is longer than the reader's limit (64 KiB)"""
+        try:
+            return await reader.readline()
+        except (ValueError, asyncio.LimitOverrunError):
+            return None
+
+    async def _route(self, method: str, target: str, body: bytes) -> Tuple[int, Union[Dict, List, str]]:
+        path, _, query = target.partition("?")
+        if path == "/healthz":
+            status = 503 if self.draining else 200
+            payload = {"status": "draining" if self.draining else "ok", "queued": self._queue.qsize(),
+                       "lanes": {lane: self._queue.qsize(lane) for lane in self._queue.lanes},
+                       "workers": self.workers}
+        elif path == "/metrics":
+            status, payload = 200, self.prometheus_text()
+        elif path == "/orchestrate":
+            if method != "POST":
+                status, payload = 405, {"error": "Use POST"}
+            else:
+                status, payload = await self._orchestrate(body, "structured" if "format=structured" in query else "jsonl")
+        else:
+            status, payload = 404, {"error": f"No route for {path}"}
+        self._requests[(path, status)] = self._requests.get((path, status), 0) + 1
+        return status, payload
+
+    async def _orchestrate(self, body: bytes, output_format: str) -> Tuple[int, Union[Dict, List]]:
+        try:
+            document = json.loads(body)
+        except ValueError as exc:
+            return 400, {"error": f"Invalid JSON: {exc}"}
+        messages = document if isinstance(document, list) else [document]
+        if not all(isinstance(message, dict) for message in messages):
+            return 400, {"error": "Expected a message object or a list of message objects"}
+        try:
+            records = await asyncio.gather(*(self.submit(message, output_format) for message in messages))
+        except _Unavailable as exc:
+            return 503, {"error": str(exc)}
+        except Exception as exc:
+            return 500, {"error": f"{type(exc).__name__}: {exc}"}
+        return 200, records if isinstance(document, list) else records[0]
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, payload: Union[Dict, List, str],
+                       keep_alive: bool):
+        if isinstance(payload, str):
+            body, content_type = payload.encode(), "text/plain; version=0.0.4"
+        else:
+            body, content_type = json.dumps(payload).encode(), "application/json"
+        headers = [
+            f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}",
+            f"Content-Type: {content_type}",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}"
+        ]
+        if status == 503:
+            headers.append("Retry-After: 1")
+        writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+        await writer.drain()
+
+    def prometheus_text(self) -> str:
+        intake = self._queue
+        lines = [
+            "# TYPE nion_server_queue_depth gauge",
+            *(f'nion_server_queue_depth{{lane="{lane}"}} {intake.qsize(lane)}' for lane in intake.lanes),
+            "# TYPE nion_server_messages_total counter",
+            f"nion_server_messages_total {self._processed}",
+            "# TYPE nion_server_rejected_total counter",
+            *(f'nion_server_rejected_total{{lane="{lane}"}} {count}' for lane, count in intake.rejected.items()),
+            "# TYPE nion_server_slo_missed_total counter",
+            *(f'nion_server_slo_missed_total{{lane="{lane}"}} {count}' for lane, count in intake.missed.items()),
+            "# TYPE nion_server_requests_total counter"
+        ]
+        lines.extend(f'nion_server_requests_total{{path="{path}",status="{status}"}} {count}'
+                     for (path, status), count in sorted(self._requests.items()))
+        histograms = [("nion_server_queue_wait_seconds", f'lane="{lane}",', histogram)
+                      for lane, histogram in intake.wait.items()]
+        histograms.append(("nion_server_latency_seconds", "", self._latency))
+        for index, (name, labels, histogram) in enumerate(histograms):
+            if index == 0 or name != histograms[index - 1][0]:
+                lines.append(f"# TYPE {name} histogram")
+            cumulative = 0
+            for bound, count in zip((*histogram.bounds, "+Inf"), histogram.counts):
+                cumulative += count
+                lines.append(f'{name}_bucket{{{labels}le="{bound}"}} {cumulative}')
+            suffix = f"{{{labels.rstrip(',')}}}" if labels else ""
+            lines.append(f"{name}_sum{suffix} {histogram.total}")
+            lines.append(f"{name}_count{suffix} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+class _Unavailable(Exception):
+    """The server cannot take more work right now (queue full or draining)"""
+
+
+def _serve_batch(orchestrator: NionOrchestrator, batch: List[_PendingRequest]) -> List[Tuple[bool, Any]]:
+    """Worker-thread side of a batch: one outcome per request, so one bad message fails alone"""
+    outcomes = []
+    for request in batch:
+        try:
+            result = orchestrator.orchestrate(request.message)
+            if request.output_format == "structured":
+                outcomes.append((True, result.to_dict()))
+            else:
+                outcomes.append((True, _result_record(request.message, orchestrator.render(result))))
+        except Exception as exc:
+            outcomes.append((False, exc))
+    return outcomes
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Nion Orchestration Engine")
+    commands = parser.add_subparsers(dest="command")
+
+    run = commands.add_parser("run", help="Orchestrate a JSONL file of messages")
+    run.add_argument("--input", required=True, help="JSONL file of messages, or - for stdin")
+    run.add_argument("--output", default="-", help="File for results (default: stdout)")
+    run.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Worker processes")
+    run.add_argument("--chunk-size", type=int, default=256, help="Messages per submitted chunk")
+    run.add_argument("--order", choices=("input", "message_id"), default="input",
+                     help="Write results in input order, or as completed keyed by message_id")
+    run.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl",
+                     help="JSONL records with the orchestration map, the maps as text, "
+                          "or structured JSONL (plan, tasks, typed records) without rendering")
+    run.add_argument("--tracking-db", help="SQLite file to persist tracked items in (runs with one worker)")
+    run.add_argument("--shards", type=int,
+                     help="Partition messages by project across this many worker processes, "
+                          "each keeping its projects' tracking state in memory")
+    run.add_argument("--rules", help="Extraction rule file, JSON or YAML (default: extraction_rules.json)")
+
+    serve = commands.add_parser("serve", help="Serve orchestration over HTTP/JSON")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument("--unix-socket", help="Listen on this Unix socket instead of TCP")
+    serve.add_argument("--workers", type=int, default=4, help="Worker threads, each with its own orchestrator")
+    serve.add_argument("--queue-size", type=int, default=1024, help="Queued messages per lane before answering 503")
+    serve.add_argument("--batch-size", type=int, default=32, help="Messages a worker takes from the queue at once")
+    serve.add_argument("--batch-wait-ms", type=float, default=0.0,
+                       help="How long a worker waits for a batch to fill (default: take what is queued)")
+    serve.add_argument("--deliver", action="append", default=[], metavar="CHANNEL=URL",
+                       help="Send responses for a channel (slack, teams, email) to this API base URL; repeatable")
+    serve.add_argument("--deliver-header", action="append", default=[], metavar="CHANNEL=NAME:VALUE",
+                       help="Add an HTTP header (e.g. Authorization) to a channel's requests; repeatable. "
+                            "Without an Authorization header, NION_<CHANNEL>_TOKEN is sent as a bearer token")
+    serve.add_argument("--urgent-slo-ms", type=float, default=50.0,
+                       help="Queue-wait target for escalations and blockers (default: 50)")
+    serve.add_argument("--rules", help="Extraction rule file, JSON or YAML; SIGHUP reloads it")
+    return parser
+
+
+def _run_command(args: argparse.Namespace):
+    input_stream = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    output_stream = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    try:
+        start = time.perf_counter()
+        if args.shards:
+            count = run_sharded(input_stream, output_stream, args.shards, args.format)
+            args.workers = args.shards
+        elif args.tracking_db:
+            # Tracked IDs come from one store's sequences, so a single process owns it
+            with TrackingStore(args.tracking_db) as tracking:
+                count = run_pipeline(input_stream, output_stream, NionOrchestrator(tracking=tracking), args.format)
+            args.workers = 1
+        else:
+            count = run_jsonl(input_stream, output_stream, args.workers, args.chunk_size, args.order, args.format)
+        elapsed = time.perf_counter() - start
+        print(f"Processed {count} messages in {elapsed:.2f}s with {args.workers} worker(s)", file=sys.stderr)
+    finally:
+        if input_stream is not sys.stdin:
+            input_stream.close()
+        if output_stream is not sys.stdout:
+            output_stream.close()
+
+
+def _delivery_adapters(deliver: List[str], deliver_headers: List[str],
+                       environ: Optional[Dict[str, str]] = None) -> List[ChannelAdapter]:
+    """Adapters for serve's --deliver CHANNEL=URL and --deliver-header CHANNEL=NAME:VALUE options"""
+    environ = os.environ if environ is None else environ
+    channels = ", ".join(DELIVERY_ADAPTERS)
+    headers: Dict[str, Dict[str, str]] = {}
+    for spec in deliver_headers:
+        channel, _, header = spec.partition("=")
+        name, _, value = header.partition(":")
+        if channel not in DELIVERY_ADAPTERS or not name.strip() or not value.strip():
+            raise SystemExit(f"--deliver-header expects CHANNEL=NAME:VALUE with CHANNEL one of {channels}")
+        headers.setdefault(channel, {})[name.strip()] = value.strip()
+    adapters = []
+    for spec in deliver:
+        channel, _, url = spec.partition("=")
+        if channel not in DELIVERY_ADAPTERS or not url:
+            raise SystemExit(f"--deliver expects CHANNEL=URL with CHANNEL one of {channels}")
+        channel_headers = headers.get(channel, {})
+        token = environ.get(f"NION_{channel.upper()}_TOKEN")
+        if token and not any(name.lower() == "authorization" for name in channel_headers):
+            channel_headers = {**channel_headers, "Authorization": f"Bearer {token}"}
+        adapters.append(DELIVERY_ADAPTERS[channel](url, headers=channel_headers))
+    return adapters
+
+
+def main(argv: Optional[List[str]] = None):
     """Main execution function"""
+    args = _build_parser().parse_args(argv)
+    if getattr(args, "rules", None):
+        load_extraction_rules(args.rules)
+    if args.command == "run":
+        _run_command(args)
+        return
+    if args.command == "serve":
+        delivery = None
+        if args.deliver:
+            # One service shared by all workers; submit() only enqueues
+            delivery = DeliveryService(_delivery_adapters(args.deliver, args.deliver_header))
+        server = OrchestrationServer(args.host, args.port, args.unix_socket, args.workers, args.queue_size,
+                                     args.batch_size, args.batch_wait_ms / 1000,
+                                     orchestrator_factory=lambda: NionOrchestrator(delivery=delivery),
+                                     lanes=[replace(lane, slo=args.urgent_slo_ms / 1000)
+                                            if lane.name == "urgent" else lane
+                                            for lane in default_lanes(args.workers, args.queue_size)])
+        where = args.unix_socket or f"http://{args.host}:{args.port}"
+        print(f"Serving on {where} with {args.workers} worker(s)", file=sys.stderr)
+        try:
+            asyncio.run(server.serve_forever())
+        finally:
+            if delivery is not None:
+                delivery.close(timeout=30)
+        return
+
     # Test with sample input
     sample_message = {
   "message_id": "MSG-101",
@@ -0,0 +1,59 @@
+"""
+DedupIndex and cross-message deduplication in TrackingStore.
+"""
+
+import pytest
+
+from main import DedupIndex, Issue, TrackingStore
+
+NEAR_DUPLICATES = ("API integration is blocked, the staging env is down",
+                   "API integration blocked - staging environment down")
+
+
+def test_normalized_wordings_match_exactly():
+    index = DedupIndex(threshold=None)
+    index.add("ISSUE-001", "The API integration is BLOCKED!")
+    assert index.find("api integration blocked") == "ISSUE-001"
+    assert index.find("API integration unblocked") is None
+
+
+def test_near_duplicates_match():
+    index = DedupIndex()
+    index.add("ISSUE-001", NEAR_DUPLICATES[0])
+    index.add("ISSUE-002", "3 critical bugs in payment flow")
+    assert index.find(NEAR_DUPLICATES[1]) == "ISSUE-001"
+    assert index.find("Critical bugs in the payment flow (3)") == "ISSUE-002"
+    assert index.find("Vendor contract renewal overdue") is None
+
+
+def test_exact_only_index_ignores_near_duplicates():
+    index = DedupIndex(threshold=None)
+    index.add("ISSUE-001", NEAR_DUPLICATES[0])
+    assert index.find(NEAR_DUPLICATES[1]) is None
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        DedupIndex(num_perm=30, bands=8)
+
+
+def test_store_merges_near_duplicates_per_project():
+    with TrackingStore() as store:
+        first = [Issue("ISSUE-001", NEAR_DUPLICATES[0], "HIGH")]
+        again = [Issue("ISSUE-001", NEAR_DUPLICATES[1], "CRITICAL")]
+        elsewhere = [Issue("ISSUE-001", NEAR_DUPLICATES[1], "HIGH")]
+        store.track("PRJ-A", first, "MSG-1")
+        assert store.track("PRJ-A", again, "MSG-2") == 0
+        assert store.track("PRJ-B", elsewhere, "MSG-3") == 1
+
+        [item] = store.items("PRJ-A", "issue")
+        # The first wording is kept; the latest extraction updates the fields
+        assert (item["title"], item["severity"], item["mentions"]) == (NEAR_DUPLICATES[0], "CRITICAL", 2)
+        assert len(store.items("PRJ-B", "issue")) == 1
+
+
+def test_store_without_similarity_keeps_near_duplicates_apart():
+    with TrackingStore(similarity=None) as store:
+        records = [Issue("ISSUE-001", title, "HIGH") for title in NEAR_DUPLICATES]
+        assert store.track("PRJ-A", records) == 2
+        assert [record.item_id for record in records] == ["ISSUE-001", "ISSUE-002"]
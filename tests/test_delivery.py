@@ -0,0 +1,141 @@
+"""
+Delivery adapters against a local HTTP endpoint: Retry-After parsing,
+Slack's ok field, and serve's header options.
+"""
+
+import json
+import threading
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from main import (DeliveryError, DeliveryRequest, DeliveryService, EmailAdapter, SlackAdapter, TeamsAdapter,
+                  _delivery_adapters, parse_retry_after)
+
+
+class Endpoint:
+    """Answers each POST with the next (status, headers, body) in responses; records requests"""
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.requests = []
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = self.rfile.read(int(self.headers["Content-Length"]))
+                endpoint.requests.append((self.path, dict(self.headers), json.loads(body)))
+                status, headers, payload = endpoint.responses.pop(0)
+                data = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/api"
+        threading.Thread(target=self.server.serve_forever, args=(0.01,), daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@pytest.fixture
+def endpoint():
+    created = []
+
+    def make(*responses):
+        created.append(Endpoint(responses))
+        return created[-1]
+
+    yield make
+    for item in created:
+        item.close()
+
+
+def test_retry_after_seconds_and_http_date():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after(None) == 1.0
+    assert parse_retry_after("soon") == 1.0
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True)
+    assert 25 <= parse_retry_after(later) <= 30
+    earlier = format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True)
+    assert parse_retry_after(earlier) == 0.0
+
+
+def test_429_with_http_date_pauses_for_that_long(endpoint):
+    later = format_datetime(datetime.now(timezone.utc) + timedelta(seconds=20), usegmt=True)
+    server = endpoint((429, {"Retry-After": later}, {"ok": False, "error": "ratelimited"}))
+    adapter = SlackAdapter(server.url)
+    with pytest.raises(DeliveryError) as raised:
+        adapter.send("C1", ["hello"])
+    assert raised.value.retryable and 15 <= raised.value.retry_after <= 20
+    adapter.close()
+
+
+def test_slack_ok_false_is_a_failure(endpoint):
+    server = endpoint((200, {}, {"ok": False, "error": "channel_not_found"}),
+                      (200, {}, {"ok": False, "error": "internal_error"}),
+                      (200, {}, {"ok": True}))
+    adapter = SlackAdapter(server.url, headers={"Authorization": "Bearer xoxb-test"})
+    with pytest.raises(DeliveryError, match="channel_not_found") as raised:
+        adapter.send("C1", ["hello"])
+    assert not raised.value.retryable
+    with pytest.raises(DeliveryError, match="internal_error") as raised:
+        adapter.send("C1", ["hello"])
+    assert raised.value.retryable
+    adapter.send("C1", ["hello"])
+    path, headers, payload = server.requests[-1]
+    assert path == "/api/chat.postMessage" and headers["Authorization"] == "Bearer xoxb-test"
+    assert payload == {"channel": "C1", "text": "hello"}
+    adapter.close()
+
+
+def test_service_retries_slack_errors_until_ok(endpoint):
+    server = endpoint((200, {}, {"ok": False, "error": "service_unavailable"}), (200, {}, {"ok": True}))
+    service = DeliveryService([SlackAdapter(server.url)], backoff=0.01)
+    request = DeliveryRequest("slack", "C1", "hello")
+    assert service.submit(request).result(5) == 2
+    service.close(5)
+
+
+def test_service_fails_on_permanent_slack_error(endpoint):
+    server = endpoint((200, {}, {"ok": False, "error": "invalid_auth"}))
+    service = DeliveryService([SlackAdapter(server.url)], backoff=0.01)
+    with pytest.raises(DeliveryError, match="invalid_auth"):
+        service.submit(DeliveryRequest("slack", "C1", "hello")).result(5)
+    assert len(server.requests) == 1
+    service.close(5)
+
+
+def test_teams_2xx_needs_no_json_body(endpoint):
+    server = endpoint((200, {}, b"1"))
+    adapter = TeamsAdapter(server.url)
+    adapter.send("Alex", ["hello"])
+    adapter.close()
+
+
+def test_deliver_header_options():
+    adapters = _delivery_adapters(
+        ["slack=https://slack.com/api", "email=https://api.sendgrid.com/v3", "teams=https://example.com/hook"],
+        ["slack=Authorization: Bearer xoxb-1", "email=X-Trace: a=b"],
+        environ={"NION_EMAIL_TOKEN": "sg-1", "NION_SLACK_TOKEN": "ignored"})
+    slack, email, teams = adapters
+    assert slack.headers == {"Authorization": "Bearer xoxb-1"}
+    assert isinstance(email, EmailAdapter)
+    assert email.headers == {"X-Trace": "a=b", "Authorization": "Bearer sg-1"}
+    assert teams.headers == {}
+
+
+@pytest.mark.parametrize("header", ["slack=Authorization", "sms=Authorization: x", "slack=: x"])
+def test_bad_deliver_header_is_rejected(header):
+    with pytest.raises(SystemExit):
+        _delivery_adapters(["slack=https://slack.com/api"], [header], environ={})
@@ -0,0 +1,116 @@
+"""
+KnowledgeCache: coalesced fetches, failures and invalidation during a fetch.
+"""
+
+import threading
+import time
+
+import pytest
+
+from main import KnowledgeBackend, KnowledgeCache
+
+
+class GatedBackend(KnowledgeBackend):
+    """Each fetch waits for its gate; a fetch raises if fail is set at release"""
+
+    def __init__(self):
+        self.started = []
+        self.gates = []
+        self.fail = []
+
+    def fetch(self, project):
+        gate = threading.Event()
+        self.gates.append(gate)
+        self.started.append(project)
+        gate.wait(5)
+        if self.fail.pop(0):
+            raise RuntimeError(f"backend down for {project}")
+        return (f"Project: {project}",)
+
+
+def wait_for(condition):
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.001)
+
+
+def run(cache, project, outcomes):
+    try:
+        outcomes.append(cache.get(project))
+    except RuntimeError as exc:
+        outcomes.append(exc)
+
+
+def test_failed_fetch_is_raised_to_every_waiter():
+    backend = GatedBackend()
+    backend.fail.append(True)
+    cache = KnowledgeCache(backend)
+    outcomes = []
+    threads = [threading.Thread(target=run, args=(cache, "PRJ-A", outcomes)) for _ in range(3)]
+    threads[0].start()
+    wait_for(lambda: backend.gates)
+    for thread in threads[1:]:
+        thread.start()
+    wait_for(lambda: cache.stats().coalesced == 2)
+    backend.gates[0].set()
+    for thread in threads:
+        thread.join(5)
+    assert len(outcomes) == 3 and all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert cache.stats().size == 0
+
+
+def test_invalidate_during_failing_fetch_keeps_newer_fetch():
+    backend = GatedBackend()
+    backend.fail.extend([True, False])
+    cache = KnowledgeCache(backend)
+    first, waiter, second, late = [], [], [], []
+
+    threading.Thread(target=run, args=(cache, "PRJ-A", first)).start()
+    wait_for(lambda: len(backend.gates) == 1)
+    waiting = threading.Thread(target=run, args=(cache, "PRJ-A", waiter))
+    waiting.start()
+    wait_for(lambda: cache.stats().coalesced == 1)
+
+    # The invalidation drops the first fetch; the next miss starts a new one
+    cache.invalidate("PRJ-A")
+    threading.Thread(target=run, args=(cache, "PRJ-A", second)).start()
+    wait_for(lambda: len(backend.gates) == 2)
+
+    # The first fetch fails: its waiter is woken with the error, and the
+    # newer fetch stays pending for later callers
+    backend.gates[0].set()
+    waiting.join(5)
+    assert not waiting.is_alive()
+    wait_for(lambda: first)
+    assert isinstance(first[0], RuntimeError) and isinstance(waiter[0], RuntimeError)
+
+    late_thread = threading.Thread(target=run, args=(cache, "PRJ-A", late))
+    late_thread.start()
+    wait_for(lambda: cache.stats().coalesced == 2)
+    backend.gates[1].set()
+    late_thread.join(5)
+    wait_for(lambda: second)
+    assert second == late == [("Project: PRJ-A",)]
+    assert backend.started == ["PRJ-A", "PRJ-A"]
+    assert cache.get("PRJ-A") == ("Project: PRJ-A",)
+
+
+def test_value_fetched_before_invalidation_is_not_cached():
+    backend = GatedBackend()
+    backend.fail.extend([False, False])
+    cache = KnowledgeCache(backend)
+    result = []
+    thread = threading.Thread(target=run, args=(cache, "PRJ-A", result))
+    thread.start()
+    wait_for(lambda: backend.gates)
+    cache.invalidate("PRJ-A")
+    backend.gates[0].set()
+    thread.join(5)
+    assert result == [("Project: PRJ-A",)]
+    assert cache.stats().size == 0
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        KnowledgeCache(max_entries=0)
@@ -0,0 +1,42 @@
+"""
+classify_lane: the cheap intake check agrees with the planner's signature.
+"""
+
+import pytest
+
+from benchmarks.bench_plan import realistic_mix
+from benchmarks.generators import GENERATORS, generate
+from main import IntentSignature, KeywordHits, classify_lane
+
+
+def messages():
+    generated = [message for kind in GENERATORS for length in ("short", "medium")
+                 for message in generate(kind, length, 3)]
+    return generated + realistic_mix(50, seed=11)
+
+
+@pytest.mark.parametrize("message", messages(), ids=lambda message: message["message_id"])
+def test_lane_matches_signature(message):
+    signature = IntentSignature.of(message, KeywordHits(message.get("content", "")))
+    if message.get("source") == "meeting":
+        expected = "bulk"
+    elif signature.has_escalation or signature.is_blocked:
+        expected = "urgent"
+    else:
+        expected = "normal"
+    assert classify_lane(message) == expected
+
+
+def test_meeting_transcript_is_bulk_without_scanning():
+    transcript = "Dev: we are blocked\n" * 10_000 + "Client: this is URGENT"
+    assert classify_lane({"source": "meeting", "content": transcript}) == "bulk"
+
+
+@pytest.mark.parametrize("content, lane", [
+    ("This is CRITICAL, please escalate", "urgent"),
+    ("Deploy is Blocked on review", "urgent"),
+    ("What is the status of the release?", "normal"),
+    ("", "normal"),
+])
+def test_keywords_are_case_insensitive(content, lane):
+    assert classify_lane({"source": "slack", "content": content}) == lane
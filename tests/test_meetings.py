@@ -0,0 +1,81 @@
+"""
+Live meetings: a transcript fed in chunks plans and extracts exactly as the
+whole transcript processed as one message.
+"""
+
+import pytest
+
+from main import KeywordHits, LiveMeetings, MeetingSession, NionOrchestrator
+
+TRANSCRIPT = (
+    "PM: Can we add SSO to the dashboard export before launch?\n"
+    "Dev: The API integration is blocked, staging is down.\n"
+    "QA: Found a critical bug in the export, it is not delivered as promised.\n"
+    "Client: This is urgent, legal will escalate if the timeline slips.\n"
+    "PM: Should we prioritize the scope change or keep the same timeline?\n"
+    "Dev: I will follow up with infra; notifications are done and ready for review.\n"
+)
+
+
+def chunks(text: str, size: int):
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+def plan_steps(result):
+    return [(task.task_id, task.target, task.purpose, task.depends_on, task.is_cross_cutting) for task in result.plan]
+
+
+def whole_transcript_message():
+    return {
+        "message_id": "MTG-1",
+        "source": "meeting",
+        "sender": {"name": "Meeting Bot", "role": "System"},
+        "content": TRANSCRIPT,
+        "project": "PRJ-A"
+    }
+
+
+@pytest.mark.parametrize("size", [1, 7, 13, len(TRANSCRIPT)])
+def test_chunked_meeting_matches_whole_transcript(size):
+    session = MeetingSession("MTG-1", project="PRJ-A")
+    for chunk in chunks(TRANSCRIPT, size):
+        session.feed(chunk)
+    message = session.end()
+
+    streamed = NionOrchestrator().orchestrate(message)
+    whole = NionOrchestrator().orchestrate(whole_transcript_message())
+
+    assert message["content"].strip() == TRANSCRIPT.strip()
+    assert KeywordHits.of(message) is message["minutes"].hits
+    assert plan_steps(streamed) == plan_steps(whole)
+    assert streamed.records == whole.records
+    assert streamed.records
+
+
+def test_keywords_split_across_chunks_are_found():
+    session = MeetingSession("MTG-2", project="PRJ-A")
+    for chunk in ("Client: this is leg", "al territ", "ory now\nDev: time", "line is fine"):
+        session.feed(chunk)
+    hits = session.end()["minutes"].hits
+    assert "legal" in hits and "timeline" in hits and "sso" not in hits
+
+
+def test_turns_and_chunks_share_the_transcript():
+    live = LiveMeetings()
+    live.feed("MTG-3", "Dev: we are blocked on QA\n", project="PRJ-A")
+    live.add_turn("MTG-3", "QA", "Will escalate today")
+    message = live.end("MTG-3")
+    assert message["content"] == "Dev: we are blocked on QA\nQA: Will escalate today"
+    assert "escalate" in message["minutes"].hits
+
+
+def test_summary_counts_are_pluralized():
+    session = MeetingSession("MTG-4", project="PRJ-A")
+    session.feed("Dev: we are blocked\nQA: we are blocked too\nDev: I will fix it\n")
+    assert session.end()["minutes"].summary_lines() == [
+        "Meeting summary generated:",
+        "• 2 speakers identified",
+        "• 1 action item extracted",
+        "• 2 blockers identified",
+        "• 0 deliverables committed"
+    ]
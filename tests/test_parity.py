@@ -0,0 +1,50 @@
+"""
+Output parity with the baseline engine.
+
+tests/data/baseline_maps.json holds orchestration maps rendered by the
+baseline main.py (the repository's first commit), one fresh
+NionOrchestrator per message, for the README cases, every generator branch
+and a weighted mix. The baseline hard-coded extraction record IDs (two
+RISK-001 entries in one message, for example); records are now numbered in
+order per kind, so IDs are compared separately.
+"""
+
+import json
+import os
+import re
+
+import pytest
+
+from main import NionOrchestrator
+
+DATA = os.path.join(os.path.dirname(__file__), "data", "baseline_maps.json")
+
+with open(DATA, encoding="utf-8") as stream:
+    CASES = json.load(stream)
+
+RECORD_ID = re.compile(r"\b(AI|RISK|ISSUE|DEC)-\d+")
+
+
+def without_record_ids(text: str) -> str:
+    return RECORD_ID.sub(r"\1-N", text)
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["message"]["message_id"] for case in CASES])
+def test_fresh_engine_matches_baseline(case):
+    assert without_record_ids(NionOrchestrator().process_message(case["message"])) == without_record_ids(case["map"])
+
+
+def test_shared_engine_matches_fresh_engine():
+    messages = [case["message"] for case in CASES]
+    expected = [NionOrchestrator().process_message(message) for message in messages]
+    orchestrator = NionOrchestrator()
+    assert [orchestrator.process_message(message) for message in messages] == expected
+    assert NionOrchestrator().process_batch(messages) == expected
+
+
+@pytest.mark.parametrize("case", CASES, ids=[case["message"]["message_id"] for case in CASES])
+def test_record_ids_are_sequential_per_kind(case):
+    result = NionOrchestrator().orchestrate(case["message"])
+    for prefix, records in (("AI", result.action_items), ("RISK", result.risks),
+                            ("ISSUE", result.issues), ("DEC", result.decisions)):
+        assert [record.item_id for record in records] == [f"{prefix}-{n:03d}" for n in range(1, len(records) + 1)]
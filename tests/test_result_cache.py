@@ -0,0 +1,113 @@
+"""
+ResultCache: disk round trip, keys that follow the rules and format, TTL
+expiry and knowledge invalidation.
+"""
+
+import json
+
+import pytest
+
+import main
+from benchmarks.messages import SAMPLE_MESSAGES
+from main import (ExtractionRules, KnowledgeCache, NionOrchestrator, ResultCache, StaticKnowledgeBackend,
+                  set_knowledge_backend)
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def knowledge_cache(monkeypatch):
+    """A private knowledge cache (300 s TTL), restored after each test"""
+    cache = KnowledgeCache()
+    monkeypatch.setattr(main, "KNOWLEDGE_CACHE", cache)
+    return cache
+
+
+def test_disk_round_trip_renders_identically(tmp_path):
+    path = str(tmp_path / "results.db")
+    expected = [NionOrchestrator().process_message(message) for message in SAMPLE_MESSAGES]
+
+    writer = ResultCache(path=path)
+    assert NionOrchestrator(result_cache=writer).process_batch(SAMPLE_MESSAGES) == expected
+    writer.close()
+
+    reader = ResultCache(path=path)
+    orchestrator = NionOrchestrator(result_cache=reader)
+    assert orchestrator.process_batch(SAMPLE_MESSAGES) == expected
+    stats = reader.stats()
+    assert (stats.hits, stats.misses) == (len(SAMPLE_MESSAGES), 0)
+    results = orchestrator.process_batch(SAMPLE_MESSAGES, structured=True)
+    fresh = NionOrchestrator().process_batch(SAMPLE_MESSAGES, structured=True)
+    assert [result.records for result in results] == [result.records for result in fresh]
+    reader.close()
+
+
+def test_rule_reload_changes_the_key(monkeypatch):
+    message = SAMPLE_MESSAGES[0]
+    key = ResultCache.key(message)
+    with open(main.DEFAULT_RULES_PATH, encoding="utf-8") as stream:
+        spec = json.load(stream)
+    assert ResultCache.key(message) == key
+    spec["risk"] = spec["risk"][:1]
+    monkeypatch.setattr(main, "EXTRACTION_RULES", ExtractionRules(spec))
+    assert ResultCache.key(message) != key
+
+
+def test_format_version_changes_the_key(monkeypatch):
+    key = ResultCache.key(SAMPLE_MESSAGES[0])
+    monkeypatch.setattr(ResultCache, "FORMAT_VERSION", ResultCache.FORMAT_VERSION + 1)
+    assert ResultCache.key(SAMPLE_MESSAGES[0]) != key
+
+
+def test_results_expire_after_ttl(tmp_path):
+    clock = Clock()
+    cache = ResultCache(path=str(tmp_path / "results.db"), ttl=60, clock=clock)
+    orchestrator = NionOrchestrator(result_cache=cache)
+    orchestrator.process_message(SAMPLE_MESSAGES[0])
+    clock.now += 59
+    orchestrator.process_message(SAMPLE_MESSAGES[0])
+    assert cache.stats().hits == 1
+    clock.now += 1
+    orchestrator.process_message(SAMPLE_MESSAGES[0])
+    stats = cache.stats()
+    assert (stats.hits, stats.expirations) == (1, 1)
+    cache.close()
+
+    # Expired rows on disk are not served after a restart either
+    clock.now += 60
+    reopened = ResultCache(path=str(tmp_path / "results.db"), ttl=60, clock=clock)
+    assert reopened.get(ResultCache.key(SAMPLE_MESSAGES[0])) is None
+    reopened.close()
+
+
+def test_ttl_is_capped_at_knowledge_ttl(knowledge_cache):
+    assert ResultCache().max_age() == knowledge_cache.ttl
+    assert ResultCache(ttl=10).max_age() == 10
+    assert ResultCache(ttl=10_000).max_age() == knowledge_cache.ttl
+    knowledge_cache.ttl = None
+    assert ResultCache(ttl=10_000).max_age() == 10_000
+    assert ResultCache().max_age() is None
+
+
+def test_backend_swap_keeps_listeners_and_invalidates(knowledge_cache):
+    cache = ResultCache()
+    knowledge_cache.add_invalidation_listener(cache.invalidate_project)
+    orchestrator = NionOrchestrator(result_cache=cache)
+    orchestrator.process_message(SAMPLE_MESSAGES[0])
+    assert cache.stats().size == 1
+
+    # The old backend's context is gone, and so are results computed from it
+    swapped = set_knowledge_backend(StaticKnowledgeBackend())
+    assert main.KNOWLEDGE_CACHE is swapped
+    assert cache.stats().size == 0
+
+    orchestrator.process_message(SAMPLE_MESSAGES[0])
+    assert cache.stats().size == 1
+    swapped.invalidate(SAMPLE_MESSAGES[0]["project"])
+    assert cache.stats().size == 0
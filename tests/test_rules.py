@@ -0,0 +1,59 @@
+"""
+Extraction rule files: the shipped rules compile, and files that would
+produce incomplete or unformatted records are rejected at compile time.
+"""
+
+import json
+import re
+
+import pytest
+
+import main
+from main import DEFAULT_RULES_PATH, ExtractionRules, KeywordHits, RuleError, load_extraction_rules
+
+with open(DEFAULT_RULES_PATH, encoding="utf-8") as stream:
+    SHIPPED = json.load(stream)
+
+
+def test_shipped_rules_compile():
+    rules = ExtractionRules(SHIPPED)
+    records = rules.extract("action_item", KeywordHits("Can we add SSO integration?"))
+    assert [record.title for record in records] == ["Evaluate SSO integration feature"]
+
+
+@pytest.mark.parametrize("spec, message", [
+    ({"risk": [{"any": ["bug"], "title": "Quality", "likelihood": "HIGH"}]}, "required field(s) impact"),
+    ({"issue": [{"any": ["bug"], "severity": "HIGH"}]}, "required field(s) title"),
+    ({"action_item": [{"any": ["add"], "owner": "Sam"}]}, "required field(s) title"),
+    ({"features": [{"any": ["sso"]}]}, "required field(s) value"),
+    ({"features": [{"any": ["sso"], "value": "SSO", "title": "x"}]}, "unknown field(s) title"),
+    ({"risk": [{"any": ["bug"], "title": "Bug", "likelihood": "HIGH", "impact": "HIGH", "owner": "Sam"}]},
+     "unknown field(s) owner"),
+    ({"action_item": [{"any": ["add"], "title": "Evaluate {value}"}]}, "without for_each"),
+    ({"features": [{"any": ["sso"], "value": "SSO"}],
+      "action_item": [{"any": ["add"], "for_each": "features", "title": "Evaluate {feature}"}]}, "only use {value}"),
+    ({"features": [{"any": ["sso"], "value": "SSO"}],
+      "action_item": [{"any": ["add"], "for_each": "risk", "title": "Evaluate {value}"}],
+      "risk": []}, "names no value domain"),
+    ({"action_item": [{"any": ["Add"], "title": "Evaluate"}]}, "lowercase"),
+    ({"action_item": {"any": ["add"], "title": "Evaluate"}}, "list of rules"),
+    ({"action_item": ["add"]}, "rule object"),
+    ([], "object mapping"),
+])
+def test_invalid_rules_are_rejected(spec, message):
+    with pytest.raises(RuleError, match=re.escape(message)):
+        ExtractionRules(spec)
+
+
+def test_literal_braces_without_for_each_are_kept():
+    rules = ExtractionRules({"decision": [{"any": ["json"], "title": "Keep {} and { as written"}]})
+    assert rules.extract("decision", KeywordHits("json payload"))[0].title == "Keep {} and { as written"
+
+
+def test_rejected_file_leaves_current_rules(tmp_path):
+    current = main.EXTRACTION_RULES
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"risk": [{"any": ["bug"], "title": "Quality", "likelihood": "HIGH"}]}))
+    with pytest.raises(RuleError):
+        load_extraction_rules(str(path))
+    assert main.EXTRACTION_RULES is current
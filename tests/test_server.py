@@ -0,0 +1,101 @@
+"""
+OrchestrationServer error paths over a real socket: malformed requests
+are answered with a 4xx status and the connection is closed.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from benchmarks.messages import SAMPLE_MESSAGES
+from main import OrchestrationServer
+
+
+async def exchange(server: OrchestrationServer, request: bytes):
+    """Send raw bytes and read one response: (status, headers, body)"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    try:
+        writer.write(request)
+        await writer.drain()
+        status_line = await reader.readline()
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b""):
+                break
+            name, _, value = line.decode().partition(":")
+            headers[name.strip().lower()] = value.strip()
+        body = await reader.readexactly(int(headers.get("content-length", "0")))
+        # The server closes the connection after every error response
+        closed = headers.get("connection") == "close" and await reader.read() == b""
+        return int(status_line.split()[1]), closed, json.loads(body) if body.startswith(b"{") else body
+    finally:
+        writer.close()
+
+
+def run_against_server(request: bytes, **options):
+    async def main():
+        server = OrchestrationServer(port=0, workers=1, **options)
+        await server.start()
+        try:
+            return await exchange(server, request)
+        finally:
+            await server.shutdown()
+
+    return asyncio.run(main())
+
+
+def post(body: bytes, length=None, path="/orchestrate") -> bytes:
+    length = len(body) if length is None else length
+    return (f"POST {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n"
+            f"Connection: close\r\n\r\n").encode() + body
+
+
+@pytest.mark.parametrize("length", ["abc", "-1", "1e3", "٣"])
+def test_invalid_content_length_is_400(length):
+    status, closed, payload = run_against_server(post(b"{}", length=length))
+    assert (status, closed) == (400, True)
+    assert payload == {"error": "Invalid Content-Length"}
+
+
+def test_oversized_body_is_413():
+    status, closed, payload = run_against_server(post(b"x" * 2048), max_body=1024)
+    assert (status, closed) == (413, True)
+
+
+def test_oversized_request_line_is_431():
+    request = b"GET /" + b"a" * (70 * 1024) + b" HTTP/1.1\r\n\r\n"
+    status, closed, payload = run_against_server(request)
+    assert (status, closed) == (431, True)
+
+
+def test_oversized_header_is_431():
+    request = b"GET /healthz HTTP/1.1\r\nX-Big: " + b"a" * (70 * 1024) + b"\r\n\r\n"
+    status, closed, payload = run_against_server(request)
+    assert (status, closed) == (431, True)
+
+
+def test_malformed_request_line_is_400():
+    status, closed, payload = run_against_server(b"GARBAGE\r\n\r\n")
+    assert (status, closed) == (400, True)
+
+
+def test_malformed_json_is_400():
+    status, closed, payload = run_against_server(post(b"{not json"))
+    assert status == 400 and payload["error"].startswith("Invalid JSON")
+
+
+def test_non_object_message_is_400():
+    status, closed, payload = run_against_server(post(b"[1, 2]"))
+    assert status == 400
+
+
+def test_unknown_path_is_404_and_wrong_method_is_405():
+    assert run_against_server(b"GET /nowhere HTTP/1.1\r\nConnection: close\r\n\r\n")[0] == 404
+    assert run_against_server(b"GET /orchestrate HTTP/1.1\r\nConnection: close\r\n\r\n")[0] == 405
+
+
+def test_valid_message_is_200():
+    status, closed, payload = run_against_server(post(json.dumps(SAMPLE_MESSAGES[0]).encode()))
+    assert status == 200 and payload["message_id"] == SAMPLE_MESSAGES[0]["message_id"]
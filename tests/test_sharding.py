@@ -0,0 +1,58 @@
+"""
+ShardedOrchestrator: output identical to one orchestrator with one tracking
+store, before and after rebalancing.
+"""
+
+import pytest
+
+from benchmarks.bench_plan import realistic_mix
+from main import NionOrchestrator, ShardedOrchestrator, ShardRing, TrackingStore
+
+
+def messages(count: int = 160):
+    mixed = realistic_mix(count, seed=3)
+    return [message if message.get("project") is None else {**message, "project": f"PRJ-{index % 13}"}
+            for index, message in enumerate(mixed)]
+
+
+def single_store_maps(batch):
+    orchestrator = NionOrchestrator(tracking=TrackingStore())
+    return [orchestrator.orchestrate(message).text for message in batch]
+
+
+@pytest.mark.parametrize("before, after", [(2, 5), (4, 1), (3, 3)])
+def test_rebalance_keeps_output_of_single_store(before, after):
+    batch = messages()
+    half = len(batch) // 2
+    expected = single_store_maps(batch)
+
+    with ShardedOrchestrator(shards=before) as sharded:
+        first = sharded.process_batch(batch[:half])
+        moves = sharded.rebalance(after)
+        second = sharded.process_batch(batch[half:])
+        owned = sum(shard["projects"] for shard in sharded.stats().values())
+
+    assert first + second == expected
+    assert owned == 13
+    if before == after:
+        assert moves == {}
+    assert all(old != new for old, new in moves.values())
+
+
+def test_rebalance_with_processes_keeps_output():
+    batch = messages(60)
+    expected = single_store_maps(batch)
+    with ShardedOrchestrator(shards=2, processes=True) as sharded:
+        first = sharded.process_batch(batch[:30])
+        sharded.rebalance(3)
+        second = sharded.process_batch(batch[30:])
+    assert first + second == expected
+
+
+def test_ring_moves_few_projects():
+    projects = [f"PRJ-{index}" for index in range(2000)]
+    four, five = ShardRing(4), ShardRing(5)
+    moved = sum(four.shard_for(project) != five.shard_for(project) for project in projects)
+    # About 1/5 of the projects move; a modulo hash would move about 4/5
+    assert moved < len(projects) * 0.3
+    assert {five.shard_for(project) for project in projects} == set(range(5))
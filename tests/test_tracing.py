@@ -0,0 +1,66 @@
+"""
+Tracing: the async engine emits the same span tree as the sync engine.
+"""
+
+import asyncio
+
+import pytest
+
+from benchmarks.messages import SAMPLE_MESSAGES
+from main import (AgentId, AsyncNionOrchestrator, Instrumentation, NionOrchestrator, SpanExporter,
+                  StaticKnowledgeBackend)
+
+
+class ListExporter(SpanExporter):
+    def __init__(self):
+        self.spans = []
+
+    def export(self, span):
+        self.spans.append(span)
+
+
+def span_tree(spans):
+    """Each trace as nested (name, task_id, agent, children), children sorted"""
+    children = {}
+    for span in spans:
+        children.setdefault(span.parent_id, []).append(span)
+
+    def node(span):
+        return (span.name, span.attributes.get("task_id", ""), span.attributes.get("agent", ""),
+                sorted(node(child) for child in children.get(span.span_id, ())))
+
+    return sorted(node(span) for span in children.get(None, ()))
+
+
+def sync_spans(message):
+    exporter = ListExporter()
+    NionOrchestrator(instrumentation=Instrumentation([exporter])).process_message(message)
+    return exporter.spans
+
+
+async def fetch_project(task, message):
+    task.output = tuple(StaticKnowledgeBackend().fetch(message.get("project", "N/A")))
+
+
+@pytest.mark.parametrize("handlers", [{}, {AgentId.KNOWLEDGE_RETRIEVAL.value: fetch_project}],
+                         ids=["sync agents", "async knowledge handler"])
+@pytest.mark.parametrize("message", SAMPLE_MESSAGES, ids=[m["message_id"] for m in SAMPLE_MESSAGES])
+def test_async_span_tree_matches_sync(message, handlers):
+    exporter = ListExporter()
+    orchestrator = AsyncNionOrchestrator(handlers, instrumentation=Instrumentation([exporter]))
+    asyncio.run(orchestrator.process_message(message))
+
+    expected = sync_spans(message)
+    assert span_tree(exporter.spans) == span_tree(expected)
+    assert len({span.trace_id for span in exporter.spans}) == 1
+    names = {span.name for span in exporter.spans}
+    assert {"message", "plan", "execute", "task", "subtask", "format"} <= names
+
+
+def test_async_orchestrate_traces_without_format():
+    exporter = ListExporter()
+    orchestrator = AsyncNionOrchestrator(instrumentation=Instrumentation([exporter]))
+    asyncio.run(orchestrator.orchestrate(SAMPLE_MESSAGES[0]))
+    roots = [span for span in exporter.spans if span.parent_id is None]
+    assert [root.name for root in roots] == ["message"]
+    assert "format" not in {span.name for span in exporter.spans}
@@ -0,0 +1,82 @@
+"""
+TrackingStore: upserts, per-project ID sequences that continue across
+restarts, batched writes and snapshots.
+"""
+
+from benchmarks.messages import SAMPLE_MESSAGES
+from main import ActionItem, Issue, NionOrchestrator, Risk, TrackingStore
+
+
+def risk(title, impact="HIGH"):
+    return Risk("RISK-001", title, "HIGH", impact)
+
+
+def test_new_items_get_the_next_id_per_project_and_kind():
+    with TrackingStore() as store:
+        records = [risk("Timeline compression"), risk("Scope creep"), Issue("ISSUE-001", "Staging down", "HIGH")]
+        assert store.track("PRJ-A", records, "MSG-1") == 3
+        assert [record.item_id for record in records] == ["RISK-001", "RISK-002", "ISSUE-001"]
+
+        other = [risk("Vendor delay")]
+        store.track("PRJ-B", other, "MSG-2")
+        assert other[0].item_id == "RISK-001"
+
+
+def test_repeated_record_updates_the_tracked_item():
+    with TrackingStore() as store:
+        store.track("PRJ-A", [risk("Timeline compression", impact="MEDIUM")], "MSG-1")
+        again = [risk("Timeline compression", impact="CRITICAL")]
+        assert store.track("PRJ-A", again, "MSG-2") == 0
+        assert again[0].item_id == "RISK-001"
+
+        [item] = store.items("PRJ-A", "risk")
+        assert (item["id"], item["impact"], item["mentions"]) == ("RISK-001", "CRITICAL", 2)
+        assert (item["first_message"], item["last_message"]) == ("MSG-1", "MSG-2")
+        assert store.snapshot("PRJ-A", "risk") == {"total": 1, "open": 1, "by_status": {"OPEN": 1},
+                                                   "by_priority": {"CRITICAL": 1}}
+
+
+def test_sequences_continue_after_reopening(tmp_path):
+    path = str(tmp_path / "tracking.db")
+    with TrackingStore(path, batch_size=1000) as store:
+        store.track("PRJ-A", [risk("Timeline compression"), risk("Scope creep")], "MSG-1")
+        # Buffered writes are committed on close
+
+    with TrackingStore(path) as store:
+        records = [risk("Scope creep"), risk("Vendor delay")]
+        assert store.track("PRJ-A", records, "MSG-2") == 1
+        assert [record.item_id for record in records] == ["RISK-002", "RISK-003"]
+        assert [item["id"] for item in store.items("PRJ-A", "risk")] == ["RISK-001", "RISK-002", "RISK-003"]
+
+
+def test_writes_are_batched(tmp_path):
+    path = str(tmp_path / "tracking.db")
+    store = TrackingStore(path, batch_size=3)
+    reader = TrackingStore(path)
+    store.track("PRJ-A", [ActionItem("AI-001", "Write tests"), ActionItem("AI-001", "Fix build")])
+    assert reader.items("PRJ-A") == []
+    store.track("PRJ-A", [ActionItem("AI-001", "Ship release")])
+    assert [item["title"] for item in reader.items("PRJ-A")] == ["Write tests", "Fix build", "Ship release"]
+    store.close()
+    reader.close()
+
+
+def test_export_import_moves_a_project():
+    with TrackingStore() as source, TrackingStore() as target:
+        source.track("PRJ-A", [risk("Timeline compression"), risk("Scope creep")])
+        target.import_project("PRJ-A", source.export_project("PRJ-A", remove=True))
+        assert source.items("PRJ-A") == []
+        records = [risk("Vendor delay")]
+        target.track("PRJ-A", records)
+        assert records[0].item_id == "RISK-003"
+
+
+def test_orchestrator_reuses_tracked_ids_across_messages():
+    message = next(message for message in SAMPLE_MESSAGES if "blocked" in message["content"].lower())
+    with TrackingStore() as store:
+        orchestrator = NionOrchestrator(tracking=store)
+        first = orchestrator.orchestrate(message)
+        second = orchestrator.orchestrate(dict(message, message_id="MSG-REPEAT"))
+        assert first.records
+        assert [record.item_id for record in second.records] == [record.item_id for record in first.records]
+        assert all(item["mentions"] == 2 for item in store.items(message["project"]))